@@ -12,9 +12,15 @@ Note: AWS credentials are managed via Teleport. Make sure you have exported
 the required environment variables before running this script.
 """
 
+import os
+import sys
+
 from strands import Agent
 from strands.models import BedrockModel
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.stub_model import model_from_env
+
 
 def initialize_agent():
     """
@@ -31,7 +37,7 @@ def initialize_agent():
 
     # Create and configure the agent with the BedrockModel
     agent = Agent(
-        model=bedrock_model,
+        model=model_from_env(bedrock_model),
         system_prompt="You are a helpful AI assistant participating in a Strands Agents workshop. "
         "You help users understand agent concepts and answer their questions clearly.",
     )
@@ -4,25 +4,56 @@ advanced memory capabilities with intelligent retrieval for Strands Agents.
 It supports both short-term memory (STM) for conversation persistence and long-term memory (LTM)
 with multiple strategies for learning user preferences, facts, and session summaries.
 
+A service that builds an Agent per request reloads the conversation from AgentCore Memory every
+time. With SESSION_CACHE=1 the session manager is put behind the in-process SessionCache
+(shared/session_cache.py), so requests of an active conversation restore it from memory and only
+write through to AgentCore. Only short-term memory goes through the cache: long-term memory
+retrieval hooks of AgentCoreMemorySessionManager are not installed on the cached manager.
+
+Every message is written to AgentCore Memory with a create_event call the turn waits for. With
+AGENTCORE_ASYNC_WRITES=1 the writes go through the AsyncEventWriter (shared/async_memory_writer.py):
+they are queued and sent in batches by a background thread, with retries and a bounded queue, so
+the memory latency is no longer part of the turn. Queued writes are lost if the process is killed
+before they are sent; see the module for the exact guarantees.
+
+With STUB_MEMORY=1 the events are kept in process by StubMemoryClient (shared/stub_memory.py)
+instead of AgentCore Memory, so the agent runs offline; STUB_MEMORY_LATENCY simulates the service.
+
 https://strandsagents.com/latest/documentation/docs/community/session-managers/agentcore-memory/
+
+Environment variables:
+    SESSION_CACHE=1             Restore hot sessions from the in-process session cache
+    AGENTCORE_ASYNC_WRITES=1    Send memory events asynchronously, in batches
+    STUB_MEMORY=1               Keep memory events in process instead of AgentCore Memory
 """
 
 import os
 import sys
 import uuid
 
+import boto3
 from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig
 from bedrock_agentcore.memory.integrations.strands.session_manager import AgentCoreMemorySessionManager
 from strands import Agent
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.async_memory_writer import AsyncEventWriter, DataPlaneSession
+from shared.session_cache import SessionCache
+from shared.stub_memory import memory_client_from_env
+from shared.stub_model import model_from_env
 from shared.terminal_loop import terminal_loop
 
+# Shared by all requests of this process
+session_cache = SessionCache(max_sessions=1000, idle_ttl=1800)
+# In-process AgentCore Memory when STUB_MEMORY is set, otherwise None
+stub_memory = memory_client_from_env()
+# One background writer for all sessions, created with the first session manager
+memory_writer = None
 
-def initialize_agent():
+
+def create_session_manager(session_id):
     memory_id = "your-existing-memory-id" # Need to create an instance of AgentCore Memory and set the id here.
     actor_id = "some-fixed-user-id"
-    session_id = str(uuid.uuid4())
 
     agentcore_memory_config = AgentCoreMemoryConfig(
         memory_id=memory_id,
@@ -30,14 +61,32 @@ def initialize_agent():
         actor_id=actor_id
     )
 
+    # Send memory events to the stub and/or through the background writer instead of straight to AgentCore
+    data_plane_client = stub_memory
+    if os.getenv("AGENTCORE_ASYNC_WRITES") == "1":
+        global memory_writer
+        if memory_writer is None:
+            memory_writer = AsyncEventWriter(stub_memory or boto3.client("bedrock-agentcore", region_name="eu-central-1"))
+        data_plane_client = memory_writer
+
     # Create session manager
-    session_manager = AgentCoreMemorySessionManager(
+    return AgentCoreMemorySessionManager(
         agentcore_memory_config=agentcore_memory_config,
-        region_name="eu-central-1"
+        region_name="eu-central-1",
+        boto_session=DataPlaneSession(data_plane_client) if data_plane_client is not None else None
     )
 
+
+def initialize_agent(session_id=None):
+    session_id = session_id or str(uuid.uuid4())
+    if os.getenv("SESSION_CACHE") == "1":
+        session_manager = session_cache.session_manager(session_id, create_session_manager)
+    else:
+        session_manager = create_session_manager(session_id)
+
     return Agent(
-        # model= we're using the model by default.
+        # model_from_env() is None (the default model) unless STUB_MODEL is set.
+        model=model_from_env(),
         session_manager=session_manager,
         system_prompt="You are a helpful AI assistant participating in a Strands Agents workshop. "
                       "You help users understand agent concepts and answer their questions clearly."
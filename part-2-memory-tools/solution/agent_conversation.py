@@ -7,6 +7,13 @@ The SDK provides a flexible system for context management through the Conversati
 - SlidingWindowConversationManager: Maintains a fixed number of recent messages (default manager)
 - SummarizingConversationManager: Intelligently summarizes older messages to preserve context
 
+or write your own:
+
+- shared/token_budget.py keeps the history under a token budget instead of a message count.
+  Set CONVERSATION_TOKEN_BUDGET (e.g. 200) to use it here.
+- shared/hierarchical_summary.py keeps recent turns verbatim and older ones as rolling summaries written in the
+  background. Set CONVERSATION_SUMMARY=1 to use it here.
+
 https://strandsagents.com/latest/documentation/docs/user-guide/concepts/agents/conversation-management/
 """
 import os
@@ -16,17 +23,30 @@ from strands import Agent
 from strands.agent import SlidingWindowConversationManager
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.hierarchical_summary import HierarchicalSummaryConversationManager
+from shared.stub_model import model_from_env
 from shared.terminal_loop import terminal_loop
+from shared.token_budget import TokenBudgetConversationManager
 
 
 def initialize_agent():
     # Let's create the Conversation Manager.
     conversation_manager = SlidingWindowConversationManager(window_size=2)
 
+    # A token budget bounds prompt size (and cost) per turn, however long the individual messages are.
+    token_budget = os.getenv("CONVERSATION_TOKEN_BUDGET")
+    if token_budget:
+        conversation_manager = TokenBudgetConversationManager(max_tokens=int(token_budget))
+
+    # Rolling summaries remember the name from the start of a long conversation without resending all of it.
+    if os.getenv("CONVERSATION_SUMMARY"):
+        conversation_manager = HierarchicalSummaryConversationManager(model=model_from_env(), recent_turns=1, chunk_turns=2)
+
 
     # Create and configure the agent with the BedrockModel
     return Agent(
-        # model= we're using the model by default.
+        # model_from_env() is None (the default model) unless STUB_MODEL is set.
+        model=model_from_env(),
         conversation_manager=conversation_manager,
         system_prompt="You are a helpful AI assistant participating in a Strands Agents workshop. "
                       "You help users understand agent concepts and answer their questions clearly.",
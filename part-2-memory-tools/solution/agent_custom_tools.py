@@ -4,6 +4,7 @@ import sys
 from strands import Agent, tool
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.stub_model import model_from_env
 from shared.terminal_loop import terminal_loop
 
 # Here is the custom tool calculator.
@@ -14,7 +15,8 @@ def calculate_sum(a: int, b: int) -> int:
 def initialize_agent():
     # Create and configure the agent with the BedrockModel
     return Agent(
-        # model= we're using the model by default.
+        # model_from_env() is None (the default model) unless STUB_MODEL is set.
+        model=model_from_env(),
         tools=[calculate_sum],
         system_prompt="You are a helpful AI assistant participating in a Strands Agents workshop. "
                       "You help users understand agent concepts and answer their questions clearly.",
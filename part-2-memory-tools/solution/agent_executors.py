@@ -11,6 +11,7 @@ from strands import Agent, tool
 from strands.tools.executors import ConcurrentToolExecutor
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.stub_model import model_from_env
 from shared.terminal_loop import terminal_loop
 
 from strands_tools import current_time
@@ -24,7 +25,8 @@ def weather_in(place: str) -> str:
 def initialize_agent():
     # Create and configure the agent with the BedrockModel
     return Agent(
-        # model= we're using the model by default.
+        # model_from_env() is None (the default model) unless STUB_MODEL is set.
+        model=model_from_env(),
         tool_executor=ConcurrentToolExecutor(),
         tools=[current_time, weather_in],
     )
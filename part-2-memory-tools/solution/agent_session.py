@@ -8,29 +8,74 @@ Strands offers two built-in session managers for persisting agent sessions:
 - FileSessionManager: Stores sessions in the local filesystem
 - S3SessionManager: Stores sessions in Amazon S3 buckets
 
+FileSessionManager writes a file for every message while the agent runs, and
+restores a session by reading all of them. The session managers in shared/
+trade that simplicity for speed:
+
+- WriteBehindSessionManager (write_behind_session.py) queues the writes and
+  appends them in batches to a per-session log from a background thread, so
+  turn latency does not depend on the disk.
+- BinarySessionManager (binary_session.py) keeps messages in one indexed
+  binary file and restores only the messages the conversation manager keeps.
+  Convert ./agent-session with `python shared/binary_session.py ./agent-session`;
+  an unconverted session fails to restore with a pointer to that command.
+- SQLiteSessionManager (sqlite_session.py) keeps many sessions as rows in
+  (sharded) SQLite files, with per-session locks for several worker processes.
+  session_benchmark.py compares the backends at 10k and 100k sessions.
+- SessionCache (session_cache.py) keeps hot sessions in memory in front of any
+  of them, for services that build an Agent per request.
+
 https://strandsagents.com/latest/documentation/docs/user-guide/concepts/agents/session-management/
+
+Environment variables:
+    SESSION_WRITE_BEHIND=1          Use the WriteBehindSessionManager (stored in ./agent-session-log)
+    SESSION_FSYNC_INTERVAL=1.0      Seconds between fsyncs of the session log (0 fsyncs every batch)
+    SESSION_BINARY=1                Use the BinarySessionManager (stored in ./agent-session)
+    SESSION_SQLITE=./sessions.db    Use the SQLiteSessionManager with this database file (session locked while in use)
 """
 
 import os
 import sys
+from contextlib import nullcontext
 
 from strands import Agent
 from strands.session import FileSessionManager
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.binary_session import BinarySessionManager
+from shared.sqlite_session import SQLiteSessionManager
+from shared.stub_model import model_from_env
 from shared.terminal_loop import terminal_loop
-
-
-def initialize_agent():
-    # Create session manager.
-    session_manager = FileSessionManager(session_id="current_user_session_id", storage_dir="./agent-session")
+from shared.write_behind_session import WriteBehindSessionManager
+
+
+def create_session_manager():
+    if os.getenv("SESSION_WRITE_BEHIND") == "1":
+        session_manager = WriteBehindSessionManager(
+            session_id="current_user_session_id",
+            storage_dir="./agent-session-log",
+            fsync_interval=float(os.getenv("SESSION_FSYNC_INTERVAL", "1.0")),
+        )
+    elif os.getenv("SESSION_SQLITE"):
+        session_manager = SQLiteSessionManager(session_id="current_user_session_id", db_path=os.getenv("SESSION_SQLITE"))
+    elif os.getenv("SESSION_BINARY") == "1":
+        session_manager = BinarySessionManager(session_id="current_user_session_id", storage_dir="./agent-session")
+    else:
+        session_manager = FileSessionManager(session_id="current_user_session_id", storage_dir="./agent-session")
 
     # Use the following session manager with random UUID to see what happens every time you run the agent.
     # session_manager = FileSessionManager(session_id=uuid.uuid4(), storage_dir="./agent-session")
+    return session_manager
+
+
+def initialize_agent(session_manager=None):
+    # Create session manager.
+    session_manager = session_manager or create_session_manager()
 
     # Create and configure the agent with the BedrockModel
     return Agent(
-        # model= we're using the model by default.
+        # model_from_env() is None (the default model) unless STUB_MODEL is set.
+        model=model_from_env(),
         session_manager=session_manager,
         system_prompt="You are a helpful AI assistant participating in a Strands Agents workshop. "
                       "You help users understand agent concepts and answer their questions clearly."
@@ -48,14 +93,20 @@ def main():
     print()
 
     try:
-        # Initialize the agent
-        print("Initializing agent...")
-        agent = initialize_agent()
-        print("Agent ready!\n")
-        print("Tell your name, restart the agent and ask your name!\n")
-
-        # Start the terminal loop
-        terminal_loop(agent)
+        session_manager = create_session_manager()
+        # Several processes can share a SQLite session store: hold the session's lock while this one
+        # restores and uses it, so turns of two processes never interleave. The lease is renewed in the
+        # background for as long as the loop runs, and expires `ttl` seconds after a crash
+        session_lock = session_manager.lock() if isinstance(session_manager, SQLiteSessionManager) else nullcontext()
+        with session_lock:
+            # Initialize the agent
+            print("Initializing agent...")
+            agent = initialize_agent(session_manager)
+            print("Agent ready!\n")
+            print("Tell your name, restart the agent and ask your name!\n")
+
+            # Start the terminal loop
+            terminal_loop(agent)
 
     except KeyboardInterrupt:
         print("\n\nExiting gracefully...")
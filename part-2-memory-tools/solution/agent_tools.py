@@ -4,6 +4,7 @@ import sys
 from strands import Agent
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.stub_model import model_from_env
 from shared.terminal_loop import terminal_loop
 from strands_tools import calculator
 
@@ -11,7 +12,8 @@ from strands_tools import calculator
 def initialize_agent():
     # Create and configure the agent with the BedrockModel
     return Agent(
-        # model= we're using the model by default.
+        # model_from_env() is None (the default model) unless STUB_MODEL is set.
+        model=model_from_env(),
         tools=[calculator],
         system_prompt="You are a helpful AI assistant participating in a Strands Agents workshop. "
                       "You help users understand agent concepts and answer their questions clearly.",
@@ -0,0 +1,119 @@
+"""
+Benchmark of what AgentCore Memory writes add to a turn, offline.
+
+Runs the same conversation with the stub model against StubMemoryClient
+(shared/stub_memory.py), which simulates the AgentCore Memory API with a
+fixed latency per call, in three modes:
+
+    sync        AgentCoreMemorySessionManager as configured in agent_agentcore_memory.py:
+                one create_event per message, on the request path
+    batched     the session manager's own batch_size buffer, sent at the end of each invocation
+    async       AsyncEventWriter (shared/async_memory_writer.py): queued, merged and sent
+                by a background thread
+
+and reports per-turn latency, the create_event calls the service received,
+the time the final flush took, whether a new session manager restores
+every message, and with --failure-rate the turns that failed because a write
+was throttled and the events the async writer gave up on.
+
+Usage:
+    python memory_write_benchmark.py
+    python memory_write_benchmark.py --latency 0.1 --turns 50 --failure-rate 0.2
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig
+from bedrock_agentcore.memory.integrations.strands.session_manager import AgentCoreMemorySessionManager
+from strands import Agent
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.async_memory_writer import AsyncEventWriter, DataPlaneSession
+from shared.stub_memory import StubMemoryClient
+from shared.stub_model import StubModel
+
+MODES = ("sync", "batched", "async")
+
+
+def create_session_manager(mode, client, session_id, batch_size):
+    config = AgentCoreMemoryConfig(
+        memory_id="benchmark-memory",
+        session_id=session_id,
+        actor_id="benchmark-user",
+        batch_size=batch_size if mode == "batched" else 1,
+    )
+    return AgentCoreMemorySessionManager(
+        agentcore_memory_config=config, region_name="eu-central-1", boto_session=DataPlaneSession(client)
+    )
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)), 1) - 1]
+
+
+def run(mode, args):
+    stub = StubMemoryClient(latency=args.latency, seed=0)
+    client = AsyncEventWriter(stub, backoff=args.latency) if mode == "async" else stub
+    session_id = f"benchmark-{mode}"
+    session_manager = create_session_manager(mode, client, session_id, args.batch_size)
+    agent = Agent(model=StubModel([]), session_manager=session_manager, callback_handler=None)
+
+    # Failures start after the session is created; the session manager does not retry, so a failed write fails the turn
+    stub.failure_rate = args.failure_rate
+    turns, failed_turns = [], 0
+    for turn in range(args.turns):
+        started = time.perf_counter()
+        try:
+            agent(f"Question {turn}: what is a good name for a cat?")
+        except Exception:
+            failed_turns += 1
+        turns.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    try:
+        client.flush() if mode == "async" else session_manager.close()
+    except Exception:
+        failed_turns += 1
+    flush_s = time.perf_counter() - started
+
+    stub.failure_rate = 0
+    restored = Agent(model=StubModel([]), callback_handler=None,
+                     session_manager=create_session_manager(mode, stub, session_id, args.batch_size))
+    return {
+        "mode": mode,
+        "turn_p50_ms": percentile(turns, 50) * 1000,
+        "turn_p95_ms": percentile(turns, 95) * 1000,
+        "create_event_calls": stub.stats["calls"].get("CreateEvent", 0),
+        "flush_ms": flush_s * 1000,
+        "restored": f"{len(restored.messages)}/{len(agent.messages)}",
+        "failed_turns": failed_turns,
+        "dropped_events": client.stats["failed"] if mode == "async" else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AgentCore Memory write modes against the stub memory")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per simulated AgentCore Memory call")
+    parser.add_argument("--turns", type=int, default=20, help="Turns per mode")
+    parser.add_argument("--batch-size", type=int, default=10, help="batch_size of the batched mode")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of calls throttled by the stub")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma separated: " + ", ".join(MODES))
+    args = parser.parse_args()
+
+    results = [run(mode, args) for mode in args.modes.split(",")]
+
+    print(f"\n{'mode':<10}{'turn p50':>11}{'turn p95':>11}{'create_event':>14}{'flush':>11}{'restored':>10}{'failed turns':>14}{'dropped':>9}")
+    for result in results:
+        print(f"{result['mode']:<10}{result['turn_p50_ms']:>9.1f}ms{result['turn_p95_ms']:>9.1f}ms"
+              f"{result['create_event_calls']:>14}{result['flush_ms']:>9.1f}ms{result['restored']:>10}"
+              f"{result['failed_turns']:>14}{result['dropped_events']:>9}")
+
+
+if __name__ == "__main__":
+    main()
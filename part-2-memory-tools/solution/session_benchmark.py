@@ -0,0 +1,253 @@
+"""
+Benchmark of session restore and append latency with many sessions on one host.
+
+Fills a session store with N sessions of a few turns each, then measures on
+a random sample of sessions:
+
+- restore: building an Agent with the session manager (what every API
+  request does), p50/p95
+- append: adding one message to a restored session, p50/p95
+- hot restore: restoring the same session again right after, which is
+  served from memory by the backends with the session cache
+- concurrent: worker processes each restoring a random session and adding
+  a turn to it, for a few seconds; SQLite workers hold the session lock
+
+Backends:
+    file        FileSessionManager, one directory per session in a flat directory
+    sqlite      SQLiteSessionManager, one SQLite file
+    sharded     SQLiteSessionManager, sessions spread over 16 SQLite files
+    <backend>+cache   the backend behind a SessionCache (shared/session_cache.py), e.g. file+cache
+
+--storage-latency adds a delay to every storage call, to model a remote store
+such as AgentCore Memory or S3, where the round trips dominate.
+
+Usage:
+    python session_benchmark.py --sessions 10000 100000 --backends sqlite,sharded,file
+    python session_benchmark.py --sessions 1000 --workers 4 --output session-benchmark.json
+    python session_benchmark.py --sessions 1000 --backends sqlite,sqlite+cache --storage-latency 0.02
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from strands import Agent
+from strands.session import FileSessionManager
+from strands.session.repository_session_manager import RepositorySessionManager
+from strands.types.session import Session, SessionAgent, SessionMessage, SessionType
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.session_cache import FileInvalidator, SessionCache
+from shared.sqlite_session import SQLiteSessionManager, shard_path
+from shared.stub_model import StubModel
+
+SHARDS = 16
+
+# One session cache per store and process; worker processes share the versions directory
+_caches = {}
+# Seconds added to every storage call (--storage-latency)
+storage_latency = 0.0
+
+
+class RemoteLatency:
+    """
+    Session repository adding a fixed delay to every call of another one.
+    """
+
+    def __init__(self, repository, latency):
+        self.repository = repository
+        self.latency = latency
+
+    def __getattr__(self, name):
+        method = getattr(self.repository, name)
+
+        def delayed(*args, **kwargs):
+            time.sleep(self.latency)
+            return method(*args, **kwargs)
+        return delayed
+
+
+def session_manager(backend, root, session_id):
+    if backend.endswith("+cache"):
+        if root not in _caches:
+            _caches[root] = SessionCache(invalidator=FileInvalidator(os.path.join(root, "versions")))
+        base = backend[:-len("+cache")]
+        return _caches[root].session_manager(session_id, lambda sid: repository(base, root, sid))
+    if storage_latency:
+        return RepositorySessionManager(session_id=session_id, session_repository=repository(backend, root, session_id))
+    return open_store(backend, root, session_id)
+
+
+def repository(backend, root, session_id):
+    store = open_store(backend, root, session_id)
+    return RemoteLatency(store, storage_latency) if storage_latency else store
+
+
+def open_store(backend, root, session_id):
+    if backend == "file":
+        return FileSessionManager(session_id=session_id, storage_dir=root)
+    if backend == "sharded":
+        return SQLiteSessionManager(session_id=session_id, db_path=root, shards=SHARDS)
+    return SQLiteSessionManager(session_id=session_id, db_path=os.path.join(root, "sessions.db"))
+
+
+def restore(backend, root, session_id):
+    manager = session_manager(backend, root, session_id)
+    return manager, Agent(model=StubModel([]), session_manager=manager, callback_handler=None)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)), 1) - 1]
+
+
+def populate(backend, root, count, turns):
+    """Create `count` sessions with `turns` user/assistant turns each, through the repository API."""
+    template = SessionAgent.from_agent(Agent(model=StubModel([]), callback_handler=None))
+    messages = []
+    for turn in range(turns):
+        messages.append({"role": "user", "content": [{"text": f"Question {turn}: what is a good name for a cat?"}]})
+        messages.append({"role": "assistant", "content": [{"text": f"Answer {turn}: Miso, Pixel or Biscuit."}]})
+
+    repository = open_store(backend.removesuffix("+cache"), root, "bench-template")
+    session_ids = [f"user-{index:06d}" for index in range(count)]
+
+    def write(session_id):
+        repository.create_session(Session(session_id=session_id, session_type=SessionType.AGENT))
+        repository.create_agent(session_id, template)
+        for index, message in enumerate(messages):
+            repository.create_message(session_id, template.agent_id, SessionMessage.from_message(message, index))
+
+    for start in range(0, count, 1000):
+        chunk = session_ids[start:start + 1000]
+        if repository.__class__ is FileSessionManager:
+            for session_id in chunk:
+                write(session_id)
+        else:
+            # One transaction per shard file and chunk: the import is not what is measured
+            shards = {}
+            for session_id in chunk:
+                shards.setdefault(shard_path(repository.db_path, repository.shards, session_id), []).append(session_id)
+            for group in shards.values():
+                with repository.batch(group[0]):
+                    for session_id in group:
+                        write(session_id)
+        print(f"\r  populated {min(start + 1000, count)}/{count}", end="", flush=True)
+    print()
+    return session_ids
+
+
+def measure(backend, root, session_ids, samples):
+    restores, appends, hot_restores = [], [], []
+    for session_id in random.sample(session_ids, min(samples, len(session_ids))):
+        started = time.perf_counter()
+        manager, agent = restore(backend, root, session_id)
+        restores.append(time.perf_counter() - started)
+
+        message = {"role": "user", "content": [{"text": "One more question."}]}
+        agent.messages.append(message)
+        started = time.perf_counter()
+        manager.append_message(message, agent)
+        appends.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        restore(backend, root, session_id)
+        hot_restores.append(time.perf_counter() - started)
+    return restores, appends, hot_restores
+
+
+def concurrent_worker(backend, root, session_ids, duration, seed, latency):
+    global storage_latency
+    storage_latency = latency
+    rng = random.Random(seed)
+    requests = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        session_id = rng.choice(session_ids)
+        if not backend.startswith(("sqlite", "sharded")):
+            manager, agent = restore(backend, root, session_id)
+            agent("One more question.")
+        else:
+            # The lock comes from the SQLite store, the agent may restore through the cache
+            with open_store(backend.removesuffix("+cache"), root, session_id).lock():
+                manager, agent = restore(backend, root, session_id)
+                agent("One more question.")
+        requests += 1
+    return requests
+
+
+def run_backend(backend, count, args):
+    root = tempfile.mkdtemp(prefix=f"sessions-{backend}-", dir=args.dir)
+    try:
+        print(f"{backend}: {count} sessions")
+        started = time.perf_counter()
+        session_ids = populate(backend, root, count, args.turns)
+        populate_s = time.perf_counter() - started
+
+        restores, appends, hot_restores = measure(backend, root, session_ids, args.samples)
+
+        throughput = None
+        if args.workers:
+            with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+                requests = pool.starmap(concurrent_worker, [
+                    (backend, root, session_ids, args.duration, seed, storage_latency) for seed in range(args.workers)
+                ])
+            throughput = sum(requests) / args.duration
+
+        return {
+            "backend": backend,
+            "sessions": count,
+            "populate_s": round(populate_s, 2),
+            "restore_ms": {"p50": percentile(restores, 50) * 1000, "p95": percentile(restores, 95) * 1000},
+            "append_ms": {"p50": percentile(appends, 50) * 1000, "p95": percentile(appends, 95) * 1000},
+            "hot_restore_ms": {"p50": percentile(hot_restores, 50) * 1000, "p95": percentile(hot_restores, 95) * 1000},
+            "concurrent_requests_per_s": throughput,
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark session restore and append latency")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10000, 100000], help="Session counts to test")
+    parser.add_argument("--backends", default="sqlite,sharded,file", help="Comma separated: file, sqlite, sharded, <backend>+cache")
+    parser.add_argument("--turns", type=int, default=5, help="Turns stored per session")
+    parser.add_argument("--samples", type=int, default=200, help="Sessions restored and appended to")
+    parser.add_argument("--workers", type=int, default=4, help="Processes in the concurrent test (0 skips it)")
+    parser.add_argument("--duration", type=float, default=5, help="Seconds of the concurrent test")
+    parser.add_argument("--dir", default=None, help="Directory for the session stores (default: system temp)")
+    parser.add_argument("--storage-latency", type=float, default=0.0, help="Seconds added to every storage call")
+    parser.add_argument("--output", default=None, help="JSON results file")
+    args = parser.parse_args()
+
+    global storage_latency
+    storage_latency = args.storage_latency
+
+    results = [run_backend(backend, count, args) for count in args.sessions for backend in args.backends.split(",")]
+
+    print(f"\n{'backend':<15}{'sessions':>10}{'restore p50':>13}{'restore p95':>13}{'append p50':>12}{'append p95':>12}"
+          f"{'hot p50':>10}{'req/s':>9}")
+    for result in results:
+        throughput = result["concurrent_requests_per_s"]
+        print(f"{result['backend']:<15}{result['sessions']:>10}"
+              f"{result['restore_ms']['p50']:>11.2f}ms{result['restore_ms']['p95']:>11.2f}ms"
+              f"{result['append_ms']['p50']:>10.2f}ms{result['append_ms']['p95']:>10.2f}ms"
+              f"{result['hot_restore_ms']['p50']:>8.2f}ms"
+              f"{throughput if throughput is not None else float('nan'):>9.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,9 +18,19 @@ What Strands Evaluation Provides:
 
 """
 
+import os
+import sys
+
 from strands import Agent
 
-agent = Agent(system_prompt="You are the helpful N26 assistant.", callback_handler=None)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.semantic_cache import semantic_cache_from_env
+from shared.stub_model import model_from_env
+
+# SEMANTIC_CACHE=1 answers repeated FAQ questions from an in-memory cache instead of calling the model
+agent = semantic_cache_from_env(
+    Agent(model=model_from_env(), system_prompt="You are the helpful N26 assistant.", callback_handler=None)
+)
 
 result = agent("What are the benefits of the metal account?")
 
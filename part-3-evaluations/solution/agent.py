@@ -18,15 +18,23 @@ What Strands Evaluation Provides:
 
 """
 
+import os
+import sys
+
 from strands import Agent, tool
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.response_cache import cache_from_env
+from shared.stub_model import model_from_env
+
 
 @tool
 def sum_calculator(a: int, b: int) -> int:
     return a + b
 
 
-agent = Agent(tools=[sum_calculator])
+# RESPONSE_CACHE=record|replay serves repeated evaluation runs from disk
+agent = Agent(model=cache_from_env(model_from_env()), tools=[sum_calculator])
 
 result = agent("What is the sum of 10 + 5?")
 
@@ -5,12 +5,19 @@ https://strandsagents.com/latest/documentation/docs/user-guide/evals-sdk/quickst
 Your task: Define test cases and create an evaluator with a custom rubric.
 The experiment setup and execution is already implemented for you.
 """
+import os
+import sys
+
 from strands_evals import Case, Experiment
 from strands_evals.evaluators import OutputEvaluator
 
 # Import the production agent directly
 from agent import agent
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.response_cache import cache_from_env
+from shared.stub_model import model_from_env
+
 # Define your task function
 def get_response(case: Case) -> str:
     response = agent(case.input)
@@ -51,7 +58,9 @@ test_cases = [
 ]
 
 # Create evaluator with custom rubric for sum_calculator
+# The judge model is cached (RESPONSE_CACHE) or stubbed (STUB_MODEL) like the agent
 evaluator = OutputEvaluator(
+    model=cache_from_env(model_from_env()),
     rubric="""
     Evaluate the mathematical response based on:
     1. Accuracy - Is the calculation result correct?
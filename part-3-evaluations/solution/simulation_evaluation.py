@@ -9,11 +9,17 @@ goals and personas, allowing you to test how your agent handles extended
 conversations without manual intervention.
 """
 
+import os
+import sys
+
 from strands import Agent
 from strands_evals import Case, Experiment, ActorSimulator
 from strands_evals.evaluators import OutputEvaluator
 from strands_evals.types.simulation import ActorProfile
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.stub_model import model_from_env
+
 
 # Custom actor profiles for different N26 customer personas
 CUSTOMER_PROFILES = {
@@ -97,6 +103,7 @@ Guidelines:
 
         # Create the N26 agent (without callback handler for evaluation)
         agent = Agent(
+            model=model_from_env(),
             system_prompt="You are the helpful N26 assistant. You help customers with questions about N26 bank accounts, cards, and services.",
             callback_handler=None,
         )
@@ -5,6 +5,9 @@ https://strandsagents.com/latest/documentation/docs/user-guide/evals-sdk/quickst
 Your task: Implement get_response to return both output AND trajectory.
 This verifies the agent uses the correct tools.
 """
+import os
+import sys
+
 from strands_evals import Case, Experiment
 from strands_evals.evaluators import TrajectoryEvaluator
 from strands_evals.extractors import tools_use_extractor
@@ -12,6 +15,10 @@ from strands_evals.extractors import tools_use_extractor
 # Import the production agent directly
 from agent import agent
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.response_cache import cache_from_env
+from shared.stub_model import model_from_env
+
 
 # Define your task function
 def get_response(case: Case) -> str:
@@ -55,7 +62,9 @@ test_cases = [
 ]
 
 # Create evaluator with custom rubric for sum_calculator
+# The judge model is cached (RESPONSE_CACHE) or stubbed (STUB_MODEL) like the agent
 evaluator = TrajectoryEvaluator(
+    model=cache_from_env(model_from_env()),
     rubric="""
     Evaluate the tool usage trajectory:
     1. Correct tool selection - Were the right tools chosen for the task?
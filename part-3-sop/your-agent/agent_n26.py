@@ -5,14 +5,31 @@ N26 Banking Assistant for simulation exercises.
 This agent is already implemented - you'll use it in simulation_evaluation.py.
 """
 
+import os
+import sys
+
 from strands import Agent
 
-agent = Agent(
-    system_prompt="You are the helpful N26 assistant. You help customers with questions about N26 bank accounts, cards, and services.",
-    callback_handler=None,
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.semantic_cache import semantic_cache_from_env
+from shared.stub_model import model_from_env
+
+# SEMANTIC_CACHE=1 answers repeated FAQ questions from an in-memory cache instead of calling the model.
+# Every call is an independent customer question, so the cache resets the conversation before each one.
+agent = semantic_cache_from_env(
+    Agent(
+        model=model_from_env(),
+        system_prompt="You are the helpful N26 assistant. You help customers with questions about N26 bank accounts, cards, and services.",
+        callback_handler=None,
+    ),
+    stateless=True,
 )
 
 # Quick test
 if __name__ == "__main__":
     result = agent("What are the benefits of the metal account?")
     print(result.message)
+
+    if hasattr(agent, "cache"):
+        agent("What benefits does the Metal account have?")
+        print(agent.cache.stats())
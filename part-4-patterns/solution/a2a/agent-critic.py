@@ -1,22 +1,50 @@
+"""
+Critic agent served over A2A.
+
+Requests run on a pool of Critic agents behind admission control: at most
+A2A_MAX_IN_FLIGHT reviews run at once, up to A2A_MAX_QUEUE more wait, and
+further requests get HTTP 429. Metrics are served at
+http://127.0.0.1:9001/metrics.
+
+Environment variables:
+    A2A_MAX_IN_FLIGHT     Reviews executed at the same time (default 8)
+    A2A_MAX_QUEUE         Requests waiting for a slot before 429 (default 32)
+    A2A_QUEUE_TIMEOUT     Seconds a request may wait for a slot (default 30)
+"""
+
+import os
+import sys
+
 from strands import Agent
-from strands.multiagent.a2a import A2AServer
-
-critic = Agent(
-    name="Critic",
-    description="Reviews plans and suggests improvements.",
-    system_prompt=(
-        "You are a strict but helpful critic.\n"
-        "Given a plan, respond with:\n"
-        "1) Risks\n2) Missing steps\n3) Improvements\n"
-        "Be concise."
-    ),
-)
 
-server = A2AServer(
-    agent=critic,
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from shared.a2a_server import PooledA2AServer
+from shared.stub_model import model_from_env
+
+
+def build_critic(context_id):
+    return Agent(
+        model=model_from_env(),
+        name="Critic",
+        description="Reviews plans and suggests improvements.",
+        system_prompt=(
+            "You are a strict but helpful critic.\n"
+            "Given a plan, respond with:\n"
+            "1) Risks\n2) Missing steps\n3) Improvements\n"
+            "Be concise."
+        ),
+        callback_handler=None,
+    )
+
+
+server = PooledA2AServer(
+    agent_factory=build_critic,
+    max_in_flight=int(os.getenv("A2A_MAX_IN_FLIGHT", "8")),
+    max_queue=int(os.getenv("A2A_MAX_QUEUE", "32")),
+    queue_timeout=float(os.getenv("A2A_QUEUE_TIMEOUT", "30")),
     host="127.0.0.1",
     port=9001,
-    http_url="http://127.0.0.1:9001"
+    http_url="http://127.0.0.1:9001",
 )
-print("Critic running on http://127.0.0.1:9001")
+print("Critic running on http://127.0.0.1:9001 (metrics at /metrics)")
 server.serve()
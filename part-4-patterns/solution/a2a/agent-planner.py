@@ -1,12 +1,30 @@
+import os
+import sys
+
 from strands import Agent
 from strands.multiagent.a2a import A2AServer
-from strands_tools.a2a_client import A2AClientToolProvider
 
-provider = A2AClientToolProvider(
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from shared.a2a_client import A2AClientPool, PooledA2AClientToolProvider
+from shared.stub_model import model_from_env
+
+
+def print_hop(timing):
+    ttfb = f"{timing['ttfb_s']:.2f}s" if timing["ttfb_s"] is not None else "-"
+    print(f"[a2a] Planner -> Critic: ttfb {ttfb}, total {timing['total_s']:.2f}s, {timing['chunks']} chunks")
+
+
+# Reuse connections to the Critic across tool calls and revalidate its card after A2A_CARD_TTL seconds.
+# With A2A_STREAMING the Critic's review is consumed as it is generated.
+provider = PooledA2AClientToolProvider(
     known_agent_urls=["http://127.0.0.1:9001"],
+    pool=A2AClientPool(card_ttl=float(os.getenv("A2A_CARD_TTL", "300"))),
+    streaming=os.getenv("A2A_STREAMING", "1") != "0",
+    on_hop=print_hop,
 )
 
 planner = Agent(
+    model=model_from_env(),
     name="Planner",
     description="Creates plans and asks Critic to review them.",
     tools=provider.tools,
@@ -23,7 +41,9 @@ server = A2AServer(
     agent=planner,
     host="127.0.0.1",
     port=9002,
-    http_url="http://127.0.0.1:9002"
+    http_url="http://127.0.0.1:9002",
+    # Send the reply as artifact chunks while it is generated, for streaming A2A clients
+    enable_a2a_compliant_streaming=True,
 )
 print("Planner running on http://127.0.0.1:9002")
 server.serve()
@@ -0,0 +1,307 @@
+"""
+Load test for the Planner and Critic A2A servers.
+
+Workers send requests in a closed loop for a fixed duration, each picking its
+target agent from a weighted request mix, over the pooled A2A client. The
+report has the latency percentiles (p50/p95/p99), time to first byte when
+streaming, throughput and error rates per target, and is saved as JSON so
+runs can be compared with --compare.
+
+With --start-servers the Critic and Planner are started with the stub model,
+so no Bedrock access is needed. The stub Planner drafts a plan and calls the
+Critic over A2A, so Planner requests exercise both hops.
+
+Usage:
+    python load-test.py --start-servers --concurrency 16 --duration 30 --mix critic=0.7,planner=0.3
+    python load-test.py --start-servers --output results/after.json --compare results/before.json
+
+Environment variables passed to started servers:
+    STUB_MODEL_LATENCY, STUB_MODEL_TOKENS_PER_SECOND, A2A_MAX_IN_FLIGHT, A2A_MAX_QUEUE, ...
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from shared.a2a_client import A2AClientPool
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+TARGETS = {
+    "critic": {"url": "http://127.0.0.1:9001", "script": "agent-critic.py"},
+    "planner": {"url": "http://127.0.0.1:9002", "script": "agent-planner.py"},
+}
+
+PROMPTS = {
+    "critic": "Review this plan: 1) Pick a date 2) Form teams 3) Define judging 4) Order pizza 5) Demo day",
+    "planner": "Create a 5-step plan to launch a small internal hackathon at a fintech.",
+}
+
+# Stub script for the Planner: draft a plan and send it to the Critic, then answer with the review
+PLANNER_STUB = {
+    "text": "Draft: 1) Pick a date 2) Form teams 3) Define judging 4) Prizes 5) Demo day. Asking the Critic.",
+    "tool_calls": [{
+        "name": "a2a_send_message",
+        "input": {"message_text": PROMPTS["critic"], "target_agent_url": TARGETS["critic"]["url"]},
+    }],
+}
+
+
+def parse_mix(text):
+    """Parse "critic=0.7,planner=0.3" into normalized weights."""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in TARGETS:
+            raise argparse.ArgumentTypeError(f"Unknown target {name!r}, expected one of {', '.join(TARGETS)}")
+        mix[name] = float(weight or 1)
+    total = sum(mix.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError("The request mix needs a positive weight")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list, or None when it is empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def error_kind(error):
+    """Classify a failed request: http_<status> for HTTP errors, else the exception type."""
+    status = getattr(error, "status_code", None)
+    if status is None and isinstance(getattr(error, "__cause__", None), httpx.HTTPStatusError):
+        status = error.__cause__.response.status_code
+    return f"http_{status}" if status else type(error).__name__
+
+
+async def worker(pool, mix, deadline, streaming, samples, rng):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    while time.perf_counter() < deadline:
+        target = rng.choices(names, weights)[0]
+        url = TARGETS[target]["url"]
+        sample = {"target": target, "start": time.perf_counter(), "ttfb_s": None, "error": None}
+        try:
+            if streaming:
+                timing = {}
+                async for _ in pool.stream_message(url, PROMPTS[target], timing=timing):
+                    pass
+                sample["ttfb_s"] = timing["ttfb_s"]
+            else:
+                await pool.send_message(url, PROMPTS[target])
+        except Exception as e:
+            sample["error"] = error_kind(e)
+        sample["latency_s"] = time.perf_counter() - sample["start"]
+        samples.append(sample)
+
+
+async def run_load(mix, concurrency, duration, streaming, warmup, seed):
+    """
+    Drive the servers with `concurrency` closed-loop workers for `duration` seconds.
+
+    Returns:
+        tuple: (samples recorded after the warmup, measured seconds)
+    """
+    pool = A2AClientPool(max_connections=concurrency * 2)
+    samples = []
+    try:
+        # Resolve the agent cards before the clock starts
+        for target in mix:
+            await pool.get_agent_card(TARGETS[target]["url"])
+
+        start = time.perf_counter()
+        deadline = start + warmup + duration
+        await asyncio.gather(*(
+            worker(pool, mix, deadline, streaming, samples, random.Random(seed + index))
+            for index in range(concurrency)
+        ))
+    finally:
+        await pool.aclose()
+
+    measured_from = start + warmup
+    return [sample for sample in samples if sample["start"] >= measured_from], duration
+
+
+def summarize(samples, seconds):
+    """Latency percentiles, throughput and error rates of a list of samples."""
+    ok = [sample for sample in samples if sample["error"] is None]
+    latencies = [sample["latency_s"] for sample in ok]
+    ttfbs = [sample["ttfb_s"] for sample in ok if sample["ttfb_s"] is not None]
+    errors = {}
+    for sample in samples:
+        if sample["error"] is not None:
+            errors[sample["error"]] = errors.get(sample["error"], 0) + 1
+
+    return {
+        "requests": len(samples),
+        "succeeded": len(ok),
+        "error_rate": (len(samples) - len(ok)) / len(samples) if samples else 0.0,
+        "errors": errors,
+        "throughput_rps": len(ok) / seconds if seconds else 0.0,
+        "latency_s": {
+            "mean": sum(latencies) / len(latencies) if latencies else None,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies, default=None),
+        },
+        "ttfb_s": {"p50": percentile(ttfbs, 50), "p95": percentile(ttfbs, 95), "p99": percentile(ttfbs, 99)},
+    }
+
+
+def print_summary(results, baseline=None):
+    def seconds(value):
+        return f"{value:.3f}s" if value is not None else "-"
+
+    print(f"\n{'target':<10}{'requests':>10}{'rps':>9}{'errors':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'ttfb p50':>10}")
+    for name, summary in results.items():
+        latency = summary["latency_s"]
+        print(f"{name:<10}{summary['requests']:>10}{summary['throughput_rps']:>9.2f}{summary['error_rate']:>8.1%} "
+              f"{seconds(latency['p50']):>10}{seconds(latency['p95']):>10}{seconds(latency['p99']):>10}"
+              f"{seconds(summary['ttfb_s']['p50']):>10}")
+        if summary["errors"]:
+            print(f"{'':<10}errors: {summary['errors']}")
+
+    if baseline is None:
+        return
+    print("\nchange vs baseline:")
+    for name, summary in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        changes = []
+        for label, now, then in (
+            ("rps", summary["throughput_rps"], before["throughput_rps"]),
+            ("p50", summary["latency_s"]["p50"], before["latency_s"]["p50"]),
+            ("p95", summary["latency_s"]["p95"], before["latency_s"]["p95"]),
+            ("p99", summary["latency_s"]["p99"], before["latency_s"]["p99"]),
+        ):
+            if now is not None and then:
+                changes.append(f"{label} {(now - then) / then:+.1%}")
+        print(f"  {name:<10}" + ", ".join(changes) + f", error rate {summary['error_rate'] - before['error_rate']:+.1%}")
+
+
+def start_servers(targets, processes, temp_files):
+    """
+    Start the Critic (and the Planner when it is targeted) with the stub model and wait for their agent cards.
+
+    Started processes and temporary stub scripts are appended to `processes` and `temp_files` as they
+    are created, so the caller can clean them up with stop_servers() even when a server fails to start.
+    """
+    env = dict(os.environ)
+    env.setdefault("STUB_MODEL", "1")
+
+    names = ["critic", "planner"] if "planner" in targets else ["critic"]
+    for name in names:
+        server_env = dict(env)
+        if name == "planner" and env["STUB_MODEL"] == "1":
+            script = tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False)
+            script.write(json.dumps(PLANNER_STUB) + "\n")
+            script.close()
+            temp_files.append(script.name)
+            server_env["STUB_MODEL"] = script.name
+        processes.append(subprocess.Popen(
+            [sys.executable, os.path.join(SCRIPT_DIR, TARGETS[name]["script"])],
+            env=server_env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        ))
+        wait_for_agent(TARGETS[name]["url"])
+
+
+def stop_servers(processes, temp_files):
+    for process in processes:
+        process.terminate()
+        process.wait()
+    for path in temp_files:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def wait_for_agent(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/.well-known/agent-card.json", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"A2A server at {url} did not start within {timeout}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Planner and Critic A2A servers")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent closed-loop workers")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=2, help="Seconds of load before measuring")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("critic=0.7,planner=0.3"), help="Weighted targets, e.g. critic=0.7,planner=0.3")
+    parser.add_argument("--streaming", action="store_true", help="Stream replies and record time to first byte")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the request mix")
+    parser.add_argument("--start-servers", action="store_true", help="Start the servers with the stub model")
+    parser.add_argument("--output", default=None, help="JSON results file (default: load-test-<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    started_at = datetime.now(timezone.utc)
+    processes, temp_files = [], []
+    try:
+        if args.start_servers:
+            start_servers(args.mix, processes, temp_files)
+        print(f"Running {args.concurrency} workers for {args.duration:g}s (+{args.warmup:g}s warmup), mix {args.mix}")
+        samples, seconds = asyncio.run(run_load(args.mix, args.concurrency, args.duration, args.streaming, args.warmup, args.seed))
+    finally:
+        stop_servers(processes, temp_files)
+
+    results = {"all": summarize(samples, seconds)}
+    for target in args.mix:
+        results[target] = summarize([sample for sample in samples if sample["target"] == target], seconds)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_summary(results, baseline)
+
+    output = args.output or f"load-test-{started_at:%Y%m%d-%H%M%S}.json"
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "timestamp": started_at.isoformat(),
+            "config": {
+                "concurrency": args.concurrency,
+                "duration_s": args.duration,
+                "warmup_s": args.warmup,
+                "mix": args.mix,
+                "streaming": args.streaming,
+                "seed": args.seed,
+                "stub_model": bool(args.start_servers),
+                "stub_latency": os.getenv("STUB_MODEL_LATENCY"),
+                "stub_tokens_per_second": os.getenv("STUB_MODEL_TOKENS_PER_SECOND"),
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,80 @@
+"""
+A2A client for the Planner agent.
+
+Card resolution, HTTP connections and the A2A client come from the shared
+A2AClientPool, so repeated and concurrent requests reuse one keep-alive
+connection pool (HTTP/2 when h2 is installed) and the agent card is only
+fetched again after A2A_CARD_TTL seconds.
+
+A single request is streamed: the Planner's reply is printed as it is
+generated and the time to first byte of the hop is reported. The Planner
+itself streams the Critic's review and logs the TTFB of that hop.
+
+Usage:
+    python agent-to-agent-a2a.py [--requests 1] [--concurrency 4]
+
+Environment variables:
+    A2A_STREAMING         Set to 0 to wait for the complete reply instead of streaming (default 1)
+    A2A_CARD_TTL          Seconds an agent card is cached (default 300)
+    A2A_MAX_CONNECTIONS   Maximum pooled connections (default 100)
+"""
+
+import argparse
 import asyncio
 import logging
-import httpx
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from a2a.client import A2ACardResolver, ClientConfig, ClientFactory
-from a2a.types import Message, Part, Role, TextPart
-from uuid import uuid4
+from shared.a2a_client import A2AClientPool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 300
 PLANNER_BASE_URL = "http://127.0.0.1:9002"
+PROMPT = "Create a 5-step plan to launch a small internal hackathon at a fintech."
+
+pool = A2AClientPool(
+    card_ttl=float(os.getenv("A2A_CARD_TTL", "300")),
+    timeout=DEFAULT_TIMEOUT,
+    max_connections=int(os.getenv("A2A_MAX_CONNECTIONS", "100")),
+)
+
+
+async def main(requests, concurrency):
+    try:
+        if requests == 1 and os.getenv("A2A_STREAMING", "1") != "0":
+            timing = {}
+            async for chunk in pool.stream_message(PLANNER_BASE_URL, PROMPT, timing=timing):
+                print(chunk, end="", flush=True)
+            ttfb = f"{timing['ttfb_s']:.2f}s" if timing["ttfb_s"] is not None else "-"
+            print(f"\n\n[a2a] client -> Planner: ttfb {ttfb}, total {timing['total_s']:.2f}s, {timing['chunks']} chunks")
+            return
+
+        if requests == 1:
+            print(await pool.send_message(PLANNER_BASE_URL, PROMPT))
+            return
+
+        # Concurrent requests share the cached card, the A2A client and the pooled connections
+        start = time.perf_counter()
+        replies = await pool.send_messages(PLANNER_BASE_URL, [PROMPT] * requests, concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+
+        for index, reply in enumerate(replies, 1):
+            print(f"--- response {index} ---")
+            print(f"error: {reply}" if isinstance(reply, Exception) else reply)
+        print(f"\n{requests} requests in {elapsed:.2f}s with concurrency {concurrency} | pool: {pool.stats()}")
+    finally:
+        await pool.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send plan requests to the Planner agent over A2A")
+    parser.add_argument("--requests", type=int, default=1, help="Number of requests to send")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum requests in flight")
+    args = parser.parse_args()
 
-def create_message(*, text: str, role: Role = Role.user) -> Message:
-    return Message(
-        kind="message",
-        role=role,
-        parts=[Part(TextPart(kind="text", text=text))],
-        message_id=uuid4().hex,
-    )
-
-async def main():
-    async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as httpx_client:
-        # 1) Discover agent card
-        resolver = A2ACardResolver(httpx_client=httpx_client, base_url=PLANNER_BASE_URL)
-        agent_card = await resolver.get_agent_card()
-
-        # 2) Create client via factory (recommended)
-        config = ClientConfig(httpx_client=httpx_client, streaming=False)
-        client = ClientFactory(config).create(agent_card)
-
-        # 3) Send message
-        msg = create_message(text="Create a 5-step plan to launch a small internal hackathon at a fintech.")
-        async for event in client.send_message(msg):
-            # With streaming=False, you'll typically get one response
-            if isinstance(event, Message):
-                # Extract returned text
-                out = ""
-                for part in event.parts:
-                    if hasattr(part, "text"):
-                        out += part.text
-                print(out)
-                return
-            else:
-                # Sometimes you may get Task tuples etc.
-                print(event)
-                return
-
-asyncio.run(main())
+    asyncio.run(main(args.requests, args.concurrency))
@@ -5,31 +5,68 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 
 from strands import Agent, tool
 
+from shared.agent_pool import AgentPool
+from shared.model_pool import get_bedrock_model
+from shared.stub_model import model_from_env
 from shared.terminal_loop import terminal_loop
 
 import logging
 
 logging.basicConfig(level=logging.INFO)
 
+# Each specialist is built once and reused; concurrent calls scale out up to SPECIALIST_POOL_SIZE instances
+SPECIALIST_POOL_SIZE = int(os.getenv("SPECIALIST_POOL_SIZE", "4"))
+
+debit_cards_pool = AgentPool(
+    lambda: Agent(
+        model=get_bedrock_model(),
+        system_prompt="You are an expert in Debit Cards, in the context of a Bank.",
+        callback_handler=None,
+    ),
+    max_size=SPECIALIST_POOL_SIZE,
+)
+
+credit_cards_pool = AgentPool(
+    lambda: Agent(
+        model=get_bedrock_model(),
+        system_prompt="You are an expert in Credit Cards, in the context of a Bank.",
+        callback_handler=None,
+    ),
+    max_size=SPECIALIST_POOL_SIZE,
+)
+
+
 @tool
-def debit_cards_specialised_agent():
-    """Use this tool ONLY when the user's query is specifically about debit cards."""
+def debit_cards_specialised_agent(query: str) -> str:
+    """Use this tool ONLY when the user's query is specifically about debit cards.
+
+    Args:
+        query: The user's question about debit cards
+    """
     logging.info("Calling debit_cards_specialised_agent")
-    agent = Agent(system_prompt="You are an expert in Debit Cards, in the context of a Bank.")
-    return agent
+    with debit_cards_pool.acquire() as agent:
+        return str(agent(query))
 
 
 @tool
-def credit_cards_specialised_agent():
-    """Use this tool ONLY when the user's query is specifically about credit cards."""
+def credit_cards_specialised_agent(query: str) -> str:
+    """Use this tool ONLY when the user's query is specifically about credit cards.
+
+    Args:
+        query: The user's question about credit cards
+    """
     logging.info("Calling credit_cards_specialised_agent")
-    agent = Agent(system_prompt="You are an expert in Credit Cards, in the context of a Bank.")
-    return agent
+    with credit_cards_pool.acquire() as agent:
+        return str(agent(query))
 
 
 def initialize_agent():
+    debit_cards_pool.prewarm(1)
+    credit_cards_pool.prewarm(1)
+
     orchestrator = Agent(
-        # model= we're using the model by default.
+        # model_from_env() is None (the default model) unless STUB_MODEL is set.
+        model=model_from_env(),
         tools=[debit_cards_specialised_agent, credit_cards_specialised_agent],
         system_prompt="You are a routing agent. Route each query to exactly one specialized agent. If the query is about debit cards, use the debit card agent. If it is about credit cards, use the credit card agent. If the topic is ambiguous, ask the user to clarify. Never call both agents for the same query.",
     )
@@ -5,17 +5,19 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 
 from strands import Agent, tool
 
+from shared.stub_model import model_from_env
 from shared.terminal_loop import terminal_loop
 
 
 @tool
 def cards_specialised_agent():
-    return Agent(system_prompt="You are an expert in Cards, in the context of a Bank.")
+    return Agent(model=model_from_env(), system_prompt="You are an expert in Cards, in the context of a Bank.")
 
 
 def initialize_agent():
     orchestrator = Agent(
-        # model= we're using the model by default.
+        # model_from_env() is None (the default model) unless STUB_MODEL is set.
+        model=model_from_env(),
         tools=[cards_specialised_agent],
         system_prompt="Route queries to specialized agents:"
                       "- cards questions -> cards_specialised_agent",
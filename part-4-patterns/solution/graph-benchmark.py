@@ -0,0 +1,63 @@
+"""
+Benchmark of parallel vs sequential node execution on the diamond graph from graph.py.
+
+Runs research -> (analysis, fact_check) -> report against the offline stub
+model, once with one node at a time and once with the independent branches in
+parallel, and compares wall time, summed node time and critical path.
+
+Usage:
+    python graph-benchmark.py [--runs 3] [--latency 0.5] [--tokens-per-second 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from strands.handlers.callback_handler import null_callback_handler
+
+from shared.stub_model import StubModel
+
+from graph import initialize_agent
+
+
+def benchmark(max_parallelism, runs, latency, tokens_per_second):
+    reports = []
+    for _ in range(runs):
+        model = StubModel(latency=latency, tokens_per_second=tokens_per_second)
+        graph = initialize_agent(model=model, max_parallelism=max_parallelism, on_report=reports.append)
+        for node in graph.nodes.values():
+            node.executor.callback_handler = null_callback_handler
+        graph("Research the impact of AI on healthcare and create a report")
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and parallel execution of the diamond graph")
+    parser.add_argument("--runs", type=int, default=3, help="Invocations per configuration")
+    parser.add_argument("--latency", type=float, default=0.5, help="Stub time to first token in seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=200, help="Stub output token rate")
+    args = parser.parse_args()
+
+    results = {}
+    for label, max_parallelism in (("sequential", 1), ("parallel", None)):
+        reports = benchmark(max_parallelism, args.runs, args.latency, args.tokens_per_second)
+        results[label] = {
+            "wall_time": statistics.median(r["wall_time"] for r in reports),
+            "summed_node_time": statistics.median(r["summed_node_time"] for r in reports),
+            "critical_path_time": statistics.median(r["critical_path_time"] for r in reports),
+            "critical_path": reports[-1]["critical_path"],
+        }
+
+    print(f"{'mode':<12}{'wall':>10}{'summed':>10}{'critical':>10}")
+    for label, result in results.items():
+        print(f"{label:<12}{result['wall_time']:>9.2f}s{result['summed_node_time']:>9.2f}s{result['critical_path_time']:>9.2f}s")
+
+    print(f"\ncritical path: {' -> '.join(results['parallel']['critical_path'])}")
+    print(f"speedup: x{results['sequential']['wall_time'] / results['parallel']['wall_time']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 
@@ -6,14 +7,22 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 from strands import Agent
 from strands.multiagent import GraphBuilder
 
-from shared.terminal_loop import terminal_loop
+from shared.graph_parallelism import GraphParallelism, print_report
+from shared.model_pool import get_bedrock_model
+from shared.terminal_loop import async_terminal_loop
 
+# Maximum number of graph nodes running at the same time (0 means no limit)
+GRAPH_MAX_PARALLELISM = int(os.getenv("GRAPH_MAX_PARALLELISM", "0"))
 
-def initialize_agent():
-    researcher = Agent(name="researcher", system_prompt="You research...")
-    analyst = Agent(name="analyst", system_prompt="You analyze...")
-    fact_checker = Agent(name="fact_checker", system_prompt="You verify claims...")
-    writer = Agent(name="writer", system_prompt="You write a report...")
+
+def initialize_agent(model=None, max_parallelism=GRAPH_MAX_PARALLELISM, on_report=print_report):
+    # All nodes share one model, so they share one boto client and its connection pool
+    model = model or get_bedrock_model()
+
+    researcher = Agent(name="researcher", model=model, system_prompt="You research...")
+    analyst = Agent(name="analyst", model=model, system_prompt="You analyze...")
+    fact_checker = Agent(name="fact_checker", model=model, system_prompt="You verify claims...")
+    writer = Agent(name="writer", model=model, system_prompt="You write a report...")
 
     builder = GraphBuilder()
 
@@ -30,6 +39,9 @@ def initialize_agent():
     builder.set_entry_point("research")
     builder.set_execution_timeout(600)  # seconds
 
+    # analysis and fact_check only depend on research, so they run concurrently
+    builder.set_hook_providers([GraphParallelism(max_parallelism or None, on_report=on_report)])
+
     return builder.build()
 
 
@@ -48,8 +60,8 @@ def main():
         agent = initialize_agent()
         print("Agent ready! Try to ask \"Research the impact of AI on healthcare and create a report\"\n")
 
-        # Start the terminal loop
-        terminal_loop(agent)
+        # Start the terminal loop (Ctrl-C cancels the running turn only)
+        asyncio.run(async_terminal_loop(agent))
 
     except KeyboardInterrupt:
         print("\n\nExiting gracefully...")
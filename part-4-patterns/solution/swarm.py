@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 
@@ -6,14 +7,49 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 from strands import Agent
 from strands.multiagent import Swarm
 
-from shared.terminal_loop import terminal_loop
+from shared.model_pool import get_bedrock_model
+from shared.swarm_compaction import ContextCompactor, strategy_from_name
+from shared.swarm_profiler import SwarmProfiler, print_handoff_report
+from shared.terminal_loop import async_terminal_loop
 
+# Stop the swarm once the same cycle of agents (e.g. coder <-> reviewer) repeats this often (0 only reports it)
+SWARM_MAX_CYCLES = int(os.getenv("SWARM_MAX_CYCLES", "0"))
+# Write a Chrome trace (chrome://tracing, ui.perfetto.dev, speedscope) of every run to this file
+SWARM_TIMELINE = os.getenv("SWARM_TIMELINE")
+# Compact the shared context before every handoff: truncate, keep_last or summary (unset keeps everything)
+SWARM_COMPACTION = os.getenv("SWARM_COMPACTION")
+# max_chars for truncate/summary, number of contributions per agent for keep_last
+SWARM_COMPACTION_LIMIT = int(os.getenv("SWARM_COMPACTION_LIMIT", "0"))
 
-def initialize_agent():
-    researcher = Agent(name="researcher", system_prompt="You research and gather facts...")
-    coder = Agent(name="coder", system_prompt="You write code...")
-    reviewer = Agent(name="reviewer", system_prompt="You review and improve code...")
-    architect = Agent(name="architect", system_prompt="You design the system...")
+
+def initialize_agent(model=None):
+    # All nodes share one model, so they share one boto client and its connection pool
+    model = model or get_bedrock_model()
+
+    profiler = SwarmProfiler(max_cycles=SWARM_MAX_CYCLES or None)
+    hooks = [profiler]
+
+    compactor = None
+    if SWARM_COMPACTION:
+        compactor = ContextCompactor(strategy_from_name(SWARM_COMPACTION, SWARM_COMPACTION_LIMIT or None, model))
+        # Registered first so the profiler sees the compacted context size
+        hooks.insert(0, compactor)
+
+    def report(handoff_report):
+        print_handoff_report(handoff_report)
+        if compactor is not None:
+            saved = compactor.report()
+            per_handoff = ", ".join(f"{h['node']} -{h['tokens_saved']}" for h in saved["handoffs"])
+            print(f"  compaction ({saved['strategy']}): ~{saved['tokens_saved']} tokens saved [{per_handoff}]")
+        if SWARM_TIMELINE:
+            profiler.export_timeline(SWARM_TIMELINE)
+
+    profiler.on_report = report
+
+    researcher = Agent(name="researcher", model=model, system_prompt="You research and gather facts...")
+    coder = Agent(name="coder", model=model, system_prompt="You write code...")
+    reviewer = Agent(name="reviewer", model=model, system_prompt="You review and improve code...")
+    architect = Agent(name="architect", model=model, system_prompt="You design the system...")
 
     return Swarm(
         [coder, researcher, reviewer, architect],
@@ -22,6 +58,7 @@ def initialize_agent():
         max_iterations=20,
         execution_timeout=900.0,
         node_timeout=300.0,
+        hooks=hooks,
     )
 
 
@@ -40,8 +77,8 @@ def main():
         agent = initialize_agent()
         print("Agent ready! Try to ask Design and implement a simple REST API for a todo app\n")
 
-        # Start the terminal loop
-        terminal_loop(agent)
+        # Start the terminal loop (Ctrl-C cancels the running turn only)
+        asyncio.run(async_terminal_loop(agent))
 
     except KeyboardInterrupt:
         print("\n\nExiting gracefully...")
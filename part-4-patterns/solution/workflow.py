@@ -1,28 +1,192 @@
+import argparse
+import asyncio
 import os
 import sys
+import time
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 from strands import Agent
 
+from shared.agent_pool import AgentPool
+from shared.model_pool import get_bedrock_model
+from shared.streaming_pipeline import Stage, format_timings, run_pipeline, stream_pipeline
+
+# Upstream characters the analyst waits for before it starts (0 waits for the whole research)
+ANALYST_SEGMENT_CHARS = int(os.getenv("ANALYST_SEGMENT_CHARS", "0"))
+
+# Stage agents are built once and reused; this also caps how many topics run_workflows() runs at once
+WORKFLOW_POOL_SIZE = int(os.getenv("WORKFLOW_POOL_SIZE", "16"))
+# Seconds a stage waits for a free agent when overlapping run_workflows() calls use up the pools
+WORKFLOW_ACQUIRE_TIMEOUT = float(os.getenv("WORKFLOW_ACQUIRE_TIMEOUT", "120"))
+
+researcher_pool = AgentPool(
+    lambda: Agent(model=get_bedrock_model(), system_prompt="Find key info.", callback_handler=None),
+    max_size=WORKFLOW_POOL_SIZE,
+)
+analyst_pool = AgentPool(
+    lambda: Agent(model=get_bedrock_model(), system_prompt="Extract insights from research.", callback_handler=None),
+    max_size=WORKFLOW_POOL_SIZE,
+)
+writer_pool = AgentPool(
+    lambda: Agent(model=get_bedrock_model(), system_prompt="Write a polished report.", callback_handler=None),
+    max_size=WORKFLOW_POOL_SIZE,
+)
+
 
 def run_workflow(topic: str):
-    researcher = Agent(system_prompt="Find key info.")
-    analyst = Agent(system_prompt="Extract insights from research.")
-    writer = Agent(system_prompt="Write a polished report.")
+    with researcher_pool.acquire() as researcher:
+        researcher_output = researcher(f"Research: {topic}")
+    with analyst_pool.acquire() as analyst:
+        analyst_output = analyst(f"Analyze: {researcher_output}")
+    with writer_pool.acquire() as writer:
+        return writer(f"Write report from: {analyst_output}")
+
+
+async def run_workflows(topics, concurrency=4):
+    """
+    Run the workflow for many topics, up to `concurrency` topics at the same time.
+
+    Stage agents come from the shared pools and are reset after every stage, so no
+    conversation leaks from one topic into another.
+
+    Args:
+        topics: List of topics
+        concurrency: Topics in flight at the same time (at most WORKFLOW_POOL_SIZE)
+
+    Returns:
+        list[dict]: Per topic, in input order: topic, report, latency_s, stage latencies, token usage and error
+    """
+    if concurrency > WORKFLOW_POOL_SIZE:
+        raise ValueError(f"concurrency {concurrency} exceeds WORKFLOW_POOL_SIZE {WORKFLOW_POOL_SIZE}")
+
+    # Build the agents up front (off the event loop) so no topic pays for construction
+    count = min(concurrency, len(topics))
+    await asyncio.gather(*(asyncio.to_thread(pool.prewarm, count) for pool in (researcher_pool, analyst_pool, writer_pool)))
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_topic(topic):
+        async with semaphore:
+            return await _run_topic(topic)
+
+    return await asyncio.gather(*(run_topic(topic) for topic in topics))
+
+
+async def _run_topic(topic):
+    record = {"topic": topic, "report": None, "latency_s": 0.0, "stages": {}, "usage": {}, "error": None}
+    start = time.perf_counter()
+
+    text = topic
+    try:
+        for name, pool, prompt in (
+            ("researcher", researcher_pool, "Research: {}"),
+            ("analyst", analyst_pool, "Analyze: {}"),
+            ("writer", writer_pool, "Write report from: {}"),
+        ):
+            stage_start = time.perf_counter()
+            # The pools are shared by every run_workflows() call, so a stage may have to wait for an agent
+            async with pool.acquire_async(timeout=WORKFLOW_ACQUIRE_TIMEOUT) as agent:
+                result = await agent.invoke_async(prompt.format(text))
+            record["stages"][name] = time.perf_counter() - stage_start
+            for key, value in result.metrics.accumulated_usage.items():
+                record["usage"][key] = record["usage"].get(key, 0) + value
+            text = str(result)
+        record["report"] = text
+    except Exception as e:
+        record["error"] = str(e)
 
-    researcher_output = researcher(f"Research: {topic}")
-    analyst_output = analyst(f"Analyze: {researcher_output}")
-    return writer(f"Write report from: {analyst_output}")
+    record["latency_s"] = time.perf_counter() - start
+    return record
+
+
+def workflow_stages(concurrency=1):
+    """
+    The researcher -> analyst -> writer workflow as streaming pipeline stages.
+
+    Args:
+        concurrency: Topics each stage works on at the same time
+    """
+    return [
+        Stage(
+            "researcher",
+            lambda: Agent(model=get_bedrock_model(), system_prompt="Find key info."),
+            prompt="Research: {input}",
+            concurrency=concurrency,
+        ),
+        Stage(
+            "analyst",
+            lambda: Agent(model=get_bedrock_model(), system_prompt="Extract insights from research."),
+            prompt="Analyze: {input}",
+            segment_chars=ANALYST_SEGMENT_CHARS or None,
+            concurrency=concurrency,
+        ),
+        Stage(
+            "writer",
+            lambda: Agent(model=get_bedrock_model(), system_prompt="Write a polished report."),
+            prompt="Write report from: {input}",
+            concurrency=concurrency,
+        ),
+    ]
+
+
+def run_workflow_streaming(topic: str):
+    """
+    Run one topic with every stage streaming into the next, printing the report as it is written.
+    """
+    result = asyncio.run(stream_pipeline(workflow_stages(), topic, on_token=lambda _, text: print(text, end="", flush=True)))
+    print()
+    return result
+
+
+def run_workflow_batch(topics, concurrency=1):
+    """
+    Run many topics through the pipeline; each stage works on a different topic at the same time.
+
+    Args:
+        topics: List of topics
+        concurrency: Topics each stage works on at the same time
+    """
+    return asyncio.run(run_pipeline(workflow_stages(concurrency), topics))
 
 
 def main():
     """
     Main entry point for the agent application.
     """
+    parser = argparse.ArgumentParser(description="Researcher -> analyst -> writer workflow")
+    parser.add_argument("--mode", choices=["sequential", "streaming"], default="sequential")
+    parser.add_argument("--topics", help="File with one topic per line, run in parallel (pipelined by stage with --mode streaming)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Topics in flight at the same time (batch only)")
+    args = parser.parse_args()
+
+    if args.topics:
+        with open(args.topics, encoding="utf-8") as f:
+            topics = [line.strip() for line in f if line.strip()]
+
+        start = time.perf_counter()
+        if args.mode == "streaming":
+            results = run_workflow_batch(topics, concurrency=args.concurrency)
+            for result in results:
+                print(format_timings(result))
+        else:
+            results = asyncio.run(run_workflows(topics, concurrency=args.concurrency))
+            for record in results:
+                stages = " | ".join(f"{name} {latency:.2f}s" for name, latency in record["stages"].items())
+                status = f"error: {record['error']}" if record["error"] else f"{record['usage'].get('totalTokens', 0)} tokens"
+                print(f"[{record['topic']}] {record['latency_s']:.2f}s ({stages}) {status}")
+        elapsed = time.perf_counter() - start
+
+        print(f"\n{len(results)} topics in {elapsed:.2f}s ({len(results) / elapsed:.2f} topics/s)")
+        return
+
     print("Running the workflow with a predefined topic...")
-    result = run_workflow("Instant payments regulation in Europe.")
-    print(result)
+    if args.mode == "streaming":
+        result = run_workflow_streaming("Instant payments regulation in Europe.")
+        print(format_timings(result))
+    else:
+        result = run_workflow("Instant payments regulation in Europe.")
+        print(result)
 
 
 if __name__ == "__main__":
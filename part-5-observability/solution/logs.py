@@ -1,10 +1,14 @@
 import logging
 import os
+import sys
 
 from strands import Agent
 from strands.models import BedrockModel
 from strands_tools import calculator
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.stub_model import model_from_env
+
 # Configure the root strands logger
 logging.getLogger("strands").setLevel(logging.DEBUG)
 
@@ -15,9 +19,9 @@ logging.basicConfig(
 )
 
 # Create an agent with the calculator tool
-model = BedrockModel(
+model = model_from_env(BedrockModel(
     model_id=os.getenv("MODEL_ID"),
-)
+))
 
 
 agent = Agent(
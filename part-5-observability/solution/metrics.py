@@ -1,12 +1,16 @@
 import os
+import sys
 
 from strands import Agent
 from strands.models import BedrockModel
 from strands_tools import calculator
 
-model = BedrockModel(
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.stub_model import model_from_env
+
+model = model_from_env(BedrockModel(
     model_id=os.getenv("MODEL_ID"),
-)
+))
 
 agent = Agent(
     model=model,
@@ -13,13 +13,16 @@ To run with a local Langfuse instance:
 """
 
 import os
+import sys
 import base64
 
 from strands import Agent
 from strands.models import BedrockModel
 from strands.multiagent import GraphBuilder
 from strands.telemetry import StrandsTelemetry
-from strands_tools import calculator
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.stub_model import model_from_env
 
 # --- Telemetry Setup ---
 
@@ -50,9 +53,9 @@ else:
 
 # --- Agent Setup ---
 
-model = BedrockModel(
+model = model_from_env(BedrockModel(
     model_id=os.getenv("MODEL_ID", "us.anthropic.claude-sonnet-4-20250514"),
-)
+))
 
 researcher = Agent(name="researcher", model=model, system_prompt="You research...", trace_attributes={
     "session.id": "workshop-traces-demo",
@@ -13,12 +13,22 @@ To run with a local Langfuse instance:
 """
 
 import os
+import sys
 import base64
 
 from strands import Agent
 from strands.models import BedrockModel
 from strands.telemetry import StrandsTelemetry
-from strands_tools import calculator
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.lazy import LazyTool
+from shared.stub_model import model_from_env
+
+# The calculator tool pulls in sympy (~30% of this script's import time). LazyTool starts that
+# import on a background thread right here and builds the agent from a cached tool spec, so
+# the rest of startup and the first model call no longer wait for it. The first run has no
+# cached spec yet and still imports the calculator before the agent is created.
+calculator = LazyTool("strands_tools.calculator")
 
 # --- Telemetry Setup ---
 
@@ -49,9 +59,9 @@ else:
 
 # --- Agent Setup ---
 
-model = BedrockModel(
+model = model_from_env(BedrockModel(
     model_id=os.getenv("MODEL_ID", "us.anthropic.claude-sonnet-4-20250514"),
-)
+))
 
 agent = Agent(
     model=model,
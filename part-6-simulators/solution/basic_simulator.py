@@ -8,6 +8,7 @@ to automatically generate a user persona from a test case and run a multi-turn
 conversation with an agent.
 """
 import os
+import sys
 
 from strands import Agent
 from strands.models.bedrock import BedrockModel
@@ -18,13 +19,16 @@ from strands_evals.simulation.prompt_templates.actor_profile_extraction import A
 from strands_evals.simulation.prompt_templates.actor_system_prompt import DEFAULT_USER_SIMULATOR_PROMPT_TEMPLATE
 from strands_evals.types.simulation import ActorProfile
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.stub_model import model_from_env
+
 MODEL_ID = os.getenv("MODEL_ID", "")
 
-model = BedrockModel(
+model = model_from_env(BedrockModel(
     model_id=MODEL_ID,
     region_name="eu-central-1",
     streaming=False,
-)
+))
 
 
 def run_simulation(case: Case) -> str:
@@ -8,6 +8,7 @@ specific user personas. Each profile has traits, context, and a goal that
 shape how the simulated user interacts with the agent.
 """
 import os
+import sys
 
 from strands import Agent
 from strands.models.bedrock import BedrockModel
@@ -15,13 +16,16 @@ from strands_evals import Case, Experiment, ActorSimulator
 from strands_evals.evaluators import OutputEvaluator
 from strands_evals.types.simulation import ActorProfile
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.stub_model import model_from_env
+
 MODEL_ID = os.getenv("MODEL_ID", "")
 
-model = BedrockModel(
+model = model_from_env(BedrockModel(
     model_id=MODEL_ID,
     region_name="eu-central-1",
     streaming=False,
-)
+))
 
 
 # Define distinct user personas with different traits and goals
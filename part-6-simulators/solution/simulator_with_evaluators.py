@@ -9,6 +9,7 @@ during the conversation and uses session-level evaluators (HelpfulnessEvaluator,
 GoalSuccessRateEvaluator) alongside output-level evaluators.
 """
 import os
+import sys
 
 from strands import Agent
 from strands.models.bedrock import BedrockModel
@@ -21,13 +22,16 @@ from strands_evals.simulation.prompt_templates.actor_profile_extraction import A
 from strands_evals.simulation.prompt_templates.actor_system_prompt import DEFAULT_USER_SIMULATOR_PROMPT_TEMPLATE
 from strands_evals.types.simulation import ActorProfile
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from shared.stub_model import model_from_env
+
 MODEL_ID = os.getenv("MODEL_ID", "")
 
-model = BedrockModel(
+model = model_from_env(BedrockModel(
     model_id=MODEL_ID,
     region_name="eu-central-1",
     streaming=False,
-)
+))
 
 # Setup in-memory telemetry to capture spans for trace-based evaluation
 telemetry = StrandsEvalsTelemetry().setup_in_memory_exporter()
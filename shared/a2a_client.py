@@ -0,0 +1,345 @@
+"""
+Shared A2A client layer with connection pooling and agent card caching.
+
+The A2A examples resolve the agent card and open a new httpx client (a new
+TCP connection) for every request, and `A2AClientToolProvider` does the same
+for every tool call. `A2AClientPool` keeps, per event loop:
+
+- one pooled keep-alive `httpx.AsyncClient`, using HTTP/2 when the `h2`
+  package is installed (`pip install httpx[http2]`) so concurrent requests
+  to the same agent share one connection
+- one A2A client per (agent URL, streaming) pair
+
+Agent cards are cached for `card_ttl` seconds. After that the next request
+re-fetches the card; if the agent cannot be reached, the stale card is used.
+Concurrent lookups of the same card share a single HTTP request.
+
+With `stream_message` the reply is consumed as the agent generates it: the
+server has to be started with `enable_a2a_compliant_streaming=True` (artifact
+chunk updates); legacy status-update streaming is understood as well. The
+time to the first byte of the reply is recorded per hop.
+
+Usage:
+    pool = A2AClientPool()
+    text = await pool.send_message("http://127.0.0.1:9002", "Create a plan...")
+    texts = await pool.send_messages("http://127.0.0.1:9001", ["Review A", "Review B"], concurrency=8)
+
+    timing = {}
+    async for chunk in pool.stream_message("http://127.0.0.1:9002", "Create a plan...", timing=timing):
+        print(chunk, end="", flush=True)
+    print(timing["ttfb_s"])
+
+    provider = PooledA2AClientToolProvider(known_agent_urls=["http://127.0.0.1:9001"], streaming=True)
+    planner = Agent(tools=provider.tools)
+"""
+
+import asyncio
+import importlib.util
+import logging
+import time
+import weakref
+from uuid import uuid4
+
+import httpx
+from a2a.client import A2ACardResolver, ClientConfig, ClientFactory
+from a2a.types import Message, Part, Role, TaskArtifactUpdateEvent, TaskState, TaskStatusUpdateEvent, TextPart
+from strands_tools.a2a_client import A2AClientToolProvider
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 300
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class A2AClientPool:
+    """
+    Pooled httpx connections, cached agent cards and reusable A2A clients.
+    """
+
+    def __init__(self, card_ttl=300, timeout=DEFAULT_TIMEOUT, max_connections=100, keepalive_expiry=60, http2=None):
+        """
+        Args:
+            card_ttl: Seconds an agent card is used before it is fetched again
+            timeout: HTTP timeout in seconds
+            max_connections: Maximum open connections per event loop
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Use HTTP/2 (None enables it when the h2 package is installed)
+        """
+        self.card_ttl = card_ttl
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+
+        self._cards = {}
+        # httpx clients are bound to the event loop they were created on
+        self._loops = weakref.WeakKeyDictionary()
+        self._stats = {"card_hits": 0, "card_fetches": 0, "card_stale": 0, "http_clients": 0, "a2a_clients": 0}
+
+    def httpx_client(self):
+        """
+        Return the pooled httpx client of the running event loop.
+        """
+        state = self._loop_state()
+        if state["httpx"] is None or state["httpx"].is_closed:
+            state["httpx"] = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=self.http2)
+            self._stats["http_clients"] += 1
+        return state["httpx"]
+
+    async def get_agent_card(self, url):
+        """
+        Return the agent card for `url`, from the cache while it is fresh.
+        """
+        cached = self._cards.get(url)
+        if cached is not None and time.monotonic() - cached[1] < self.card_ttl:
+            self._stats["card_hits"] += 1
+            return cached[0]
+
+        # Concurrent callers wait for the same fetch instead of each resolving the card
+        inflight = self._loop_state()["card_fetches"]
+        fetch = inflight.get(url)
+        if fetch is None:
+            fetch = inflight[url] = asyncio.ensure_future(self._fetch_card(url))
+            # Removed when the fetch ends, even if every waiter was cancelled before that
+            fetch.add_done_callback(lambda done: _forget_fetch(inflight, url, done))
+        return await asyncio.shield(fetch)
+
+    async def client(self, url, streaming=False):
+        """
+        Return a reusable A2A client for the agent at `url`.
+        """
+        card = await self.get_agent_card(url)
+        clients = self._loop_state()["clients"]
+        key = (url, streaming)
+
+        cached = clients.get(key)
+        if cached is not None and cached[1] is card:
+            return cached[0]
+
+        config = ClientConfig(httpx_client=self.httpx_client(), streaming=streaming)
+        client = ClientFactory(config).create(card)
+        clients[key] = (client, card)
+        self._stats["a2a_clients"] += 1
+        return client
+
+    async def send_message(self, url, text):
+        """
+        Send one text message and return the agent's text reply.
+        """
+        client = await self.client(url)
+        async for event in client.send_message(create_message(text=text)):
+            return response_text(event)
+        return ""
+
+    async def send_messages(self, url, texts, concurrency=8):
+        """
+        Send many messages concurrently over the pooled connections.
+
+        Args:
+            url: Agent base URL
+            texts: Message texts
+            concurrency: Maximum requests in flight
+
+        Returns:
+            list: Reply text, or the raised exception, per message in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send(text):
+            async with semaphore:
+                return await self.send_message(url, text)
+
+        return await asyncio.gather(*(send(text) for text in texts), return_exceptions=True)
+
+    async def stream_message(self, url, text, timing=None):
+        """
+        Send one text message and yield the reply text as it arrives.
+
+        Args:
+            url: Agent base URL
+            text: Message text
+            timing: Optional dict filled with ttfb_s (time to the first reply text), total_s and chunks
+
+        Yields:
+            str: Reply text deltas
+        """
+        timing = {} if timing is None else timing
+        timing.update({"url": url, "ttfb_s": None, "total_s": None, "chunks": 0})
+        start = time.perf_counter()
+        client = await self.client(url, streaming=True)
+
+        streamed = None
+        try:
+            async for event in client.send_message(create_message(text=text)):
+                delta = stream_delta(event)
+                if delta is None:
+                    # A complete Message or Task: only use it when nothing was streamed
+                    delta = "" if streamed else response_text(event)
+                elif delta:
+                    kind = type(event[1])
+                    # Legacy streaming repeats the whole reply as an artifact after the status chunks
+                    if streamed is not None and kind is not streamed:
+                        continue
+                    streamed = kind
+                if not delta:
+                    continue
+                if timing["ttfb_s"] is None:
+                    timing["ttfb_s"] = time.perf_counter() - start
+                timing["chunks"] += 1
+                yield delta
+        finally:
+            timing["total_s"] = time.perf_counter() - start
+
+    def stats(self):
+        return dict(self._stats)
+
+    async def aclose(self):
+        """
+        Close the pooled connections of the running event loop.
+        """
+        state = self._loop_state()
+        if state["httpx"] is not None:
+            await state["httpx"].aclose()
+        state["httpx"] = None
+        state["clients"].clear()
+
+    def _loop_state(self):
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = {"httpx": None, "clients": {}, "card_fetches": {}}
+            self._loops[loop] = state
+        return state
+
+    async def _fetch_card(self, url):
+        cached = self._cards.get(url)
+        try:
+            card = await A2ACardResolver(httpx_client=self.httpx_client(), base_url=url).get_agent_card()
+        except Exception as e:
+            if cached is None:
+                raise
+            logger.warning("url=<%s>, error=<%s> | agent card refresh failed, using the cached card", url, e)
+            self._stats["card_stale"] += 1
+            self._cards[url] = (cached[0], time.monotonic())
+            return cached[0]
+
+        self._stats["card_fetches"] += 1
+        # Keep the old card object when nothing changed, so clients built from it stay valid
+        if cached is not None and cached[0] == card:
+            card = cached[0]
+        self._cards[url] = (card, time.monotonic())
+        return card
+
+
+class PooledA2AClientToolProvider(A2AClientToolProvider):
+    """
+    `A2AClientToolProvider` backed by an A2AClientPool.
+
+    The tools are the same; HTTP connections are reused between tool calls and
+    agent cards are revalidated after the pool's TTL instead of being cached forever.
+    With `streaming=True`, `a2a_send_message` consumes the remote agent's reply as
+    it is generated and returns its text with the hop's timing, which is also kept
+    in `hop_timings` and passed to `on_hop`.
+    """
+
+    def __init__(self, *args, pool=None, streaming=False, on_hop=None, **kwargs):
+        """
+        Args:
+            pool: A2AClientPool to use (a new one by default)
+            streaming: Consume replies as a stream instead of waiting for the complete task
+            on_hop: Callable receiving the timing dict of every streamed message
+        """
+        super().__init__(*args, **kwargs)
+        self.pool = pool or A2AClientPool(timeout=self.timeout)
+        self.streaming = streaming
+        self.on_hop = on_hop
+        self.hop_timings = []
+
+    def _get_httpx_client(self):
+        return self.pool.httpx_client()
+
+    async def _discover_agent_card(self, url):
+        card = await self.pool.get_agent_card(url)
+        self._discovered_agents[url] = card
+        return card
+
+    async def _send_message(self, message_text, target_agent_url, message_id=None):
+        if not self.streaming:
+            return await super()._send_message(message_text, target_agent_url, message_id)
+
+        timing = {}
+        try:
+            await self._ensure_discovered_known_agents()
+            chunks = [chunk async for chunk in self.pool.stream_message(target_agent_url, message_text, timing=timing)]
+        except Exception as e:
+            logger.exception("url=<%s> | streamed A2A message failed", target_agent_url)
+            return {"status": "error", "error": str(e), "message_id": message_id, "target_agent_url": target_agent_url}
+
+        self.hop_timings.append(timing)
+        if self.on_hop is not None:
+            self.on_hop(timing)
+        return {
+            "status": "success",
+            "response": {"text": "".join(chunks)},
+            "timing": {key: round(timing[key], 3) if timing[key] is not None else None for key in ("ttfb_s", "total_s")},
+            "message_id": message_id,
+            "target_agent_url": target_agent_url,
+        }
+
+
+def create_message(*, text, role=Role.user):
+    return Message(
+        kind="message",
+        role=role,
+        parts=[Part(TextPart(kind="text", text=text))],
+        message_id=uuid4().hex,
+    )
+
+
+def stream_delta(event):
+    """
+    Return the new text carried by a streaming update, or None if the event is not an incremental update.
+    """
+    if not (isinstance(event, tuple) and len(event) == 2):
+        return None
+
+    update = event[1]
+    if isinstance(update, TaskArtifactUpdateEvent):
+        return "".join(part.root.text for part in update.artifact.parts if hasattr(part.root, "text"))
+    if isinstance(update, TaskStatusUpdateEvent):
+        # Legacy streaming sends every chunk as a "working" status message
+        if update.status.state == TaskState.working and update.status.message:
+            return response_text(update.status.message)
+        return ""
+    return None
+
+
+def response_text(event):
+    """
+    Extract the text of an A2A response: a Message, or a (Task, update) tuple whose artifacts hold the reply.
+    """
+    if isinstance(event, Message):
+        return "".join(part.root.text for part in event.parts if hasattr(part.root, "text"))
+
+    if isinstance(event, tuple) and event:
+        task = event[0]
+        texts = []
+        for artifact in task.artifacts or []:
+            texts.extend(part.root.text for part in artifact.parts if hasattr(part.root, "text"))
+        if texts:
+            return "".join(texts)
+        if task.status and task.status.message:
+            return response_text(task.status.message)
+    return ""
+
+
+def _forget_fetch(inflight, url, fetch):
+    # A newer fetch may already have replaced this one
+    if inflight.get(url) is fetch:
+        del inflight[url]
+    if not fetch.cancelled():
+        # Mark the error as retrieved, it was (or will be) raised to the waiters
+        fetch.exception()
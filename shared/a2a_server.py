@@ -0,0 +1,335 @@
+"""
+A2A server mode with a pool of agents, admission control and metrics.
+
+`A2AServer(agent=...)` runs every request on one shared Agent, so concurrent
+requests are serialized behind a lock. `PooledA2AServer` instead:
+
+- runs each request on an agent borrowed from a pool of `pool_size` agents
+  built by `agent_factory`. A context's conversation is kept as a snapshot
+  between requests and loaded into whichever agent serves it, so contexts
+  run in parallel without sharing state and without one agent per context
+- admits at most `max_in_flight` requests at once and queues up to
+  `max_queue` more. Beyond that, or after waiting `queue_timeout` seconds,
+  requests are rejected with HTTP 429 and a Retry-After header, so a
+  saturated server sheds load instead of building an unbounded backlog
+- serves Prometheus metrics at /metrics: in-flight requests, queue depth,
+  responses and rejections, and latency and queue wait histograms
+
+Usage:
+    server = PooledA2AServer(
+        agent_factory=lambda context_id: Agent(name="Critic", ...),
+        port=9001,
+        max_in_flight=8,
+        max_queue=32,
+    )
+    server.serve()
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+from strands.multiagent.a2a import A2AServer
+from strands.multiagent.a2a.executor import StrandsA2AExecutor
+
+from shared.agent_pool import reset_agent
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class _PooledContext:
+    """
+    Per-context state of a PooledA2AExecutor.
+
+    `agent` is the pooled agent serving the context's running request (None between requests):
+    StrandsA2AExecutor.cancel() stops `entry.agent`, so cancelling a task reaches that agent.
+    """
+
+    def __init__(self):
+        self.snapshot = None
+        self.lock = asyncio.Lock()
+        self.agent = None
+
+
+class PooledA2AExecutor(StrandsA2AExecutor):
+    """
+    Executor running each request on a pooled agent with the request context's conversation loaded.
+    """
+
+    def __init__(self, agent_factory, pool_size=8, **kwargs):
+        """
+        Args:
+            agent_factory: Callable (context_id) -> Agent building one pooled agent
+            pool_size: Maximum number of agents, i.e. requests executed at the same time
+            **kwargs: enable_a2a_compliant_streaming and max_contexts, as for StrandsA2AExecutor
+        """
+        super().__init__(agent_factory=agent_factory, **kwargs)
+        self.pool_size = pool_size
+        self._idle = []
+        self._created = 0
+        self._available = None
+        self._template_snapshot = None
+
+    def prewarm(self, count):
+        """Build `count` agents up front so the first requests do not pay for construction."""
+        while self._created < min(count, self.pool_size):
+            self._created += 1
+            self._idle.append(self._new_agent())
+
+    async def _run_with_context_agent(self, context_id, prompt, invocation_state, updater, stream_state):
+        entry = await self._context_entry(context_id)
+        async with entry.lock:
+            agent = await self._acquire()
+            entry.agent = agent
+            try:
+                self._restore_state(agent, entry.snapshot or self._template_snapshot)
+                try:
+                    await self._stream_agent(agent, prompt, invocation_state, updater, stream_state)
+                finally:
+                    # Keep the conversation (even after an error) for the next request of this context
+                    entry.snapshot = self._capture_state(agent)
+            finally:
+                entry.agent = None
+                reset_agent(agent)
+                await self._release(agent)
+
+    async def _context_entry(self, context_id):
+        async with self._contexts_lock:
+            entry = self._contexts.get(context_id)
+            if entry is None:
+                entry = _PooledContext()
+                self._contexts[context_id] = entry
+                self._evict_excess_contexts()
+            else:
+                self._contexts.move_to_end(context_id)
+            return entry
+
+    async def _acquire(self):
+        if self._available is None:
+            self._available = asyncio.Condition()
+
+        async with self._available:
+            while not self._idle and self._created >= self.pool_size:
+                await self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+
+        try:
+            # Agent construction is synchronous, keep it off the event loop
+            return await asyncio.to_thread(self._new_agent)
+        except Exception:
+            async with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+
+    async def _release(self, agent):
+        async with self._available:
+            self._idle.append(agent)
+            self._available.notify()
+
+    def _new_agent(self):
+        agent = self._agent_factory(f"pool-{self._created}")
+        if self._template_snapshot is None:
+            self._template_snapshot = self._capture_state(agent)
+        return agent
+
+
+class Histogram:
+    """
+    Cumulative Prometheus-style histogram.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+    def render(self, name, help_text):
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for bound, count in zip(self.buckets, self.counts):
+            lines.append(f'{name}_bucket{{le="{bound}"}} {count}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum {self.sum:.6f}")
+        lines.append(f"{name}_count {self.count}")
+        return lines
+
+
+class ServerMetrics:
+    """
+    Counters and histograms of a PooledA2AServer, rendered in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.responses = {}
+        self.rejected = 0
+        self.latency = Histogram()
+        self.queue_wait = Histogram()
+
+    def render(self):
+        lines = [
+            "# HELP a2a_in_flight_requests Requests currently executing",
+            "# TYPE a2a_in_flight_requests gauge",
+            f"a2a_in_flight_requests {self.in_flight}",
+            "# HELP a2a_queue_depth Requests waiting for an execution slot",
+            "# TYPE a2a_queue_depth gauge",
+            f"a2a_queue_depth {self.queue_depth}",
+            "# HELP a2a_queue_depth_max Highest queue depth since start",
+            "# TYPE a2a_queue_depth_max gauge",
+            f"a2a_queue_depth_max {self.max_queue_depth}",
+            "# HELP a2a_rejected_total Requests rejected because the server was saturated",
+            "# TYPE a2a_rejected_total counter",
+            f"a2a_rejected_total {self.rejected}",
+            "# HELP a2a_responses_total Responses by HTTP status",
+            "# TYPE a2a_responses_total counter",
+        ]
+        for status, count in sorted(self.responses.items()):
+            lines.append(f'a2a_responses_total{{status="{status}"}} {count}')
+        lines += self.latency.render("a2a_request_latency_seconds", "Time from admission to the end of the response")
+        lines += self.queue_wait.render("a2a_queue_wait_seconds", "Time admitted requests waited for a slot")
+        return "\n".join(lines) + "\n"
+
+
+class AdmissionControl:
+    """
+    ASGI middleware limiting concurrent A2A requests and rejecting them with 429 when saturated.
+
+    Only POST requests (the A2A JSON-RPC calls) are limited; the agent card and /metrics are always served.
+    """
+
+    def __init__(self, app, metrics, max_in_flight=8, max_queue=32, queue_timeout=30.0, retry_after=1):
+        self.app = app
+        self.metrics = metrics
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._slots = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+
+        metrics = self.metrics
+        if self._slots.locked() and metrics.queue_depth >= self.max_queue:
+            await self._reject(send, "queue full")
+            return
+
+        queued = time.perf_counter()
+        metrics.queue_depth += 1
+        metrics.max_queue_depth = max(metrics.max_queue_depth, metrics.queue_depth)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            await self._reject(send, "timed out waiting for a slot")
+            return
+        finally:
+            metrics.queue_depth -= 1
+
+        started = time.perf_counter()
+        metrics.queue_wait.observe(started - queued)
+        metrics.in_flight += 1
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            self._slots.release()
+            metrics.latency.observe(time.perf_counter() - started)
+            metrics.responses[status] = metrics.responses.get(status, 0) + 1
+
+    async def _reject(self, send, reason):
+        self.metrics.rejected += 1
+        self.metrics.responses[429] = self.metrics.responses.get(429, 0) + 1
+        body = json.dumps({"error": f"Server saturated: {reason}", "retry_after": self.retry_after}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class PooledA2AServer(A2AServer):
+    """
+    A2AServer executing requests on a pool of agents, behind admission control, with /metrics.
+    """
+
+    def __init__(self, agent_factory, *, pool_size=None, max_in_flight=8, max_queue=32, queue_timeout=30.0,
+                 prewarm=1, enable_a2a_compliant_streaming=True, max_contexts=StrandsA2AExecutor.DEFAULT_MAX_CONTEXTS,
+                 **kwargs):
+        """
+        Args:
+            agent_factory: Callable (context_id) -> Agent building one pooled agent
+            pool_size: Number of agents (defaults to max_in_flight, so admitted requests never wait for one)
+            max_in_flight: Requests executed at the same time
+            max_queue: Requests allowed to wait for a slot before new ones are rejected with 429
+            queue_timeout: Seconds a request waits for a slot before it is rejected with 429
+            prewarm: Agents built before the server starts
+            enable_a2a_compliant_streaming: Stream replies as artifact chunks
+            max_contexts: Conversations kept for follow-up requests (least recently used are dropped)
+            **kwargs: host, port, http_url and the other A2AServer arguments
+        """
+        super().__init__(
+            agent_factory=agent_factory,
+            enable_a2a_compliant_streaming=enable_a2a_compliant_streaming,
+            max_contexts=max_contexts,
+            **kwargs,
+        )
+        self.executor = PooledA2AExecutor(
+            agent_factory,
+            pool_size=pool_size or max_in_flight,
+            enable_a2a_compliant_streaming=enable_a2a_compliant_streaming,
+            max_contexts=max_contexts,
+        )
+        self.executor.prewarm(prewarm)
+        self.request_handler.agent_executor = self.executor
+
+        self.metrics = ServerMetrics()
+        self.admission = {"max_in_flight": max_in_flight, "max_queue": max_queue, "queue_timeout": queue_timeout}
+
+    def to_starlette_app(self, *, app_kwargs=None):
+        return self._with_admission(super().to_starlette_app(app_kwargs=app_kwargs))
+
+    def to_fastapi_app(self, *, app_kwargs=None):
+        return self._with_admission(super().to_fastapi_app(app_kwargs=app_kwargs))
+
+    def _with_admission(self, app):
+        from starlette.responses import PlainTextResponse
+
+        async def metrics(request):
+            return PlainTextResponse(self.metrics.render(), media_type="text/plain; version=0.0.4")
+
+        app.add_route("/metrics", metrics, methods=["GET"])
+        app.add_middleware(AdmissionControl, metrics=self.metrics, **self.admission)
+        return app
@@ -0,0 +1,232 @@
+"""
+Pool of pre-built agents for the agents-as-tools pattern.
+
+Building an `Agent` registers its tools, sets up the conversation manager and
+(without a shared model) creates a model client, which is wasted work when a
+specialist is rebuilt on every tool call. `AgentPool` builds each agent once,
+hands it out for one request and resets its conversation before it goes
+back to the pool. Concurrent callers get extra instances up to `max_size`,
+further callers wait for one to be released.
+
+Usage:
+    pool = AgentPool(lambda: Agent(model=get_bedrock_model(), system_prompt="..."), max_size=4)
+    pool.prewarm(1)
+
+    with pool.acquire() as agent:
+        result = agent("What is a debit card?")
+
+    async with pool.acquire_async(timeout=30) as agent:     # waits without blocking the event loop
+        result = await agent.invoke_async("What is a debit card?")
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from strands.telemetry.metrics import EventLoopMetrics
+
+
+class AgentPool:
+    """
+    A bounded, thread-safe pool of reusable agents.
+    """
+
+    def __init__(self, factory, max_size=4, reset=None):
+        """
+        Args:
+            factory: Zero-argument callable returning a new Agent
+            max_size: Maximum number of agents built by this pool
+            reset: Callable that clears an agent before it is reused (defaults to reset_agent)
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.factory = factory
+        self.max_size = max_size
+        self.reset = reset or reset_agent
+
+        self._idle = []
+        self._size = 0
+        self._condition = threading.Condition()
+        # asyncio waiters of acquire_async: (event loop, asyncio.Event) pairs woken when an agent or slot frees up
+        self._async_waiters = []
+        self._stats = {"created": 0, "acquired": 0, "waited": 0, "wait_seconds": 0.0}
+
+    def prewarm(self, count=1):
+        """
+        Build agents up front so the first requests do not pay for it.
+
+        Slots are reserved one agent at a time, so a failing factory does not leave slots counted
+        for agents that were never built.
+        """
+        while True:
+            with self._condition:
+                if self._size >= min(count, self.max_size):
+                    return
+                self._size += 1
+
+            try:
+                agent = self._create()
+            except BaseException:
+                with self._condition:
+                    self._size -= 1
+                    self._notify()
+                raise
+
+            with self._condition:
+                self._idle.append(agent)
+                self._notify()
+
+    @contextmanager
+    def acquire(self, timeout=None):
+        """
+        Check out an agent for the duration of the `with` block.
+
+        Args:
+            timeout: Seconds to wait for a free agent when the pool is exhausted (None waits forever)
+
+        Raises:
+            TimeoutError: If no agent became free within `timeout`
+        """
+        agent = self._checkout(timeout)
+        try:
+            yield agent
+        finally:
+            self._checkin(agent)
+
+    @asynccontextmanager
+    async def acquire_async(self, timeout=None):
+        """
+        Like `acquire`, for coroutines.
+
+        Waiting for a free agent happens on the event loop, so waiters do not hold executor threads
+        that the running agents need (model streams and sync tools run in `asyncio.to_thread`). Only
+        building a new agent runs in a worker thread.
+
+        Args:
+            timeout: Seconds to wait for a free agent when the pool is exhausted (None waits forever)
+
+        Raises:
+            TimeoutError: If no agent became free within `timeout`
+        """
+        agent = await self._checkout_async(timeout)
+        try:
+            yield agent
+        finally:
+            self._checkin(agent)
+
+    def stats(self):
+        """
+        Return pool size and usage counters.
+        """
+        with self._condition:
+            return {**self._stats, "size": self._size, "idle": len(self._idle), "in_use": self._size - len(self._idle)}
+
+    async def _checkout_async(self, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        start = None
+
+        while True:
+            with self._condition:
+                if start is None:
+                    self._stats["acquired"] += 1
+                if self._idle or self._size < self.max_size:
+                    if start is not None:
+                        self._stats["wait_seconds"] += time.perf_counter() - start
+                    if self._idle:
+                        return self._idle.pop()
+                    # Reserve the slot before building, so concurrent callers do not overshoot max_size
+                    self._size += 1
+                    break
+                if start is None:
+                    self._stats["waited"] += 1
+                    start = time.perf_counter()
+                waiter = (loop, asyncio.Event())
+                self._async_waiters.append(waiter)
+
+            try:
+                remaining = None if deadline is None else max(deadline - loop.time(), 0)
+                await asyncio.wait_for(waiter[1].wait(), remaining)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"No agent became available within {timeout}s (pool size {self.max_size})") from None
+            finally:
+                with self._condition:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+
+        try:
+            # Agent construction is synchronous, keep it off the event loop
+            return await asyncio.to_thread(self._create)
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._notify()
+            raise
+
+    def _checkout(self, timeout):
+        with self._condition:
+            self._stats["acquired"] += 1
+
+            if not self._idle and self._size >= self.max_size:
+                self._stats["waited"] += 1
+                start = time.perf_counter()
+                if not self._condition.wait_for(lambda: self._idle or self._size < self.max_size, timeout):
+                    raise TimeoutError(f"No agent became available within {timeout}s (pool size {self.max_size})")
+                self._stats["wait_seconds"] += time.perf_counter() - start
+
+            if self._idle:
+                return self._idle.pop()
+
+            # Reserve the slot before building outside the lock, so concurrent callers do not overshoot max_size
+            self._size += 1
+
+        try:
+            return self._create()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._notify()
+            raise
+
+    def _checkin(self, agent):
+        try:
+            self.reset(agent)
+        except Exception:
+            # A broken agent is dropped and rebuilt on demand rather than handed out again
+            with self._condition:
+                self._size -= 1
+                self._notify()
+            raise
+
+        with self._condition:
+            self._idle.append(agent)
+            self._notify()
+
+    def _notify(self):
+        """Wake one thread and every coroutine waiting for an agent; call with the condition held."""
+        self._condition.notify()
+        for loop, event in self._async_waiters:
+            if loop.is_closed():
+                continue
+            loop.call_soon_threadsafe(event.set)
+        self._async_waiters.clear()
+
+    def _create(self):
+        agent = self.factory()
+        with self._condition:
+            self._stats["created"] += 1
+        return agent
+
+
+def reset_agent(agent):
+    """
+    Clear an agent's conversation, state and metrics so it can serve an unrelated request.
+    """
+    agent.messages.clear()
+    for key in list(agent.state.get() or {}):
+        agent.state.delete(key)
+    agent.event_loop_metrics = EventLoopMetrics()
+    if hasattr(agent.conversation_manager, "removed_message_count"):
+        agent.conversation_manager.removed_message_count = 0
@@ -0,0 +1,322 @@
+"""
+Asynchronous, batched writes of AgentCore Memory events.
+
+`AgentCoreMemorySessionManager` calls `create_event` on the AgentCore data
+plane for every message and agent state update, and waits for it: a turn
+with a tool call pays several service round trips before the agent can go
+on. Its `batch_size` option buffers messages, but the buffer is still sent
+inline, by the turn that fills it or at the end of the invocation.
+
+`AsyncEventWriter` wraps the data plane client of the session manager.
+`create_event` only queues the event and returns; a background thread sends
+the queue:
+
+- consecutive events of the same session, branch and metadata (the
+  messages of a turn, the agent state updates) are merged into one
+  create_event call of up to 100 payload items, in order, with the latest
+  event timestamp (the session manager's timestamps are monotonic, so the
+  order of the restored messages is unchanged)
+- throttling, service and connection errors are retried with exponential
+  backoff and jitter; every merged call carries a clientToken that is kept
+  across its retries, so a retry of a call that did reach the service is
+  not stored twice
+- at most `max_pending` events are queued; when the queue is full,
+  `create_event` blocks until the sender catches up (`overflow="block"`)
+  or raises (`overflow="raise"`), so a slow or unavailable service turns
+  into backpressure instead of unbounded memory
+- list_events, get_event and delete_event first wait until the queued
+  events of their session are sent, so a session restore or redaction sees
+  every write made before it. Only that session's events are waited for,
+  but one thread sends all events in order: while a session's call is
+  retried, events of other sessions queued behind it wait too, and so does
+  a restore of a session that has some of them
+
+Durability guarantees:
+- an event is durable once the create_event call containing it succeeded;
+  `flush()` blocks until everything queued so far was sent or given up on
+- queued events live only in process memory: a crash or kill loses what
+  was not sent yet (at most `max_pending` events); `close()` is called at
+  interpreter exit to send the rest on a normal shutdown
+- events are sent at least once and deduplicated by clientToken, so each
+  is stored exactly once while the service honours the token
+- an event that fails with a non-retryable error, or still fails after
+  `max_attempts`, is dropped, logged, counted in `stats["failed"]` and
+  passed to `on_failure`; it is not retried later
+- created events are returned without an eventId, like the session
+  manager's own buffered mode, so messages are not redacted by id
+
+Usage:
+    writer = AsyncEventWriter(boto3.client("bedrock-agentcore", region_name="eu-central-1"))
+    session_manager = AgentCoreMemorySessionManager(
+        agentcore_memory_config=config, region_name="eu-central-1", boto_session=DataPlaneSession(writer)
+    )
+    agent = Agent(session_manager=session_manager)
+    ...
+    writer.flush()      # Everything so far is stored in AgentCore Memory
+"""
+
+import atexit
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+import weakref
+from collections import deque
+
+import boto3
+from botocore.exceptions import ClientError, ConnectionError, HTTPClientError
+from strands.types.exceptions import SessionException
+
+logger = logging.getLogger(__name__)
+
+MAX_PAYLOAD_ITEMS = 100
+RETRYABLE_ERRORS = {"ThrottledException", "ThrottlingException", "ServiceException", "RetryableConflictException"}
+# Calls that must see the queued writes
+READ_AFTER_WRITE = {"list_events", "get_event", "delete_event"}
+
+
+class AsyncEventWriter:
+    """
+    Proxy of the AgentCore data plane client that sends create_event calls in batches from a background thread.
+    """
+
+    def __init__(self, client, max_pending=1000, linger=0.05, max_attempts=6, backoff=0.2, max_backoff=10.0,
+                 overflow="block", on_failure=None):
+        """
+        Args:
+            client: The boto3 bedrock-agentcore client (or a StubMemoryClient)
+            max_pending: Events queued at most before create_event blocks or raises
+            linger: Seconds the sender waits for more events before sending a batch
+            max_attempts: Attempts of a create_event call before its events are dropped
+            backoff: Seconds before the first retry, doubled on every further retry (with jitter)
+            max_backoff: Upper bound of the wait between retries
+            overflow: "block" or "raise" when the queue is full
+            on_failure: Called with (list of create_event kwargs, exception) for dropped events
+        """
+        if overflow not in ("block", "raise"):
+            raise ValueError(f"overflow must be 'block' or 'raise', not {overflow!r}")
+        self.client = client
+        self.max_pending = max_pending
+        self.linger = linger
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.overflow = overflow
+        self.on_failure = on_failure
+        self.stats = {"events": 0, "calls": 0, "retries": 0, "failed": 0, "blocked_seconds": 0.0, "max_queued": 0}
+
+        self._queue = deque()
+        self._condition = threading.Condition()
+        # (memoryId, actorId, sessionId) -> events queued or being sent
+        self._unsent = {}
+        self._closed = False
+        self._sender = threading.Thread(target=self._send_loop, name="agentcore-memory-writer", daemon=True)
+        self._sender.start()
+        atexit.register(_close_ref, weakref.ref(self))
+
+    def create_event(self, **kwargs):
+        """Queue an event and return the created event without waiting for the service."""
+        if not kwargs.get("payload") or len(kwargs["payload"]) > MAX_PAYLOAD_ITEMS:
+            # Invalid events would only fail in the background, fail them here
+            return self.client.create_event(**kwargs)
+
+        with self._condition:
+            if self._closed:
+                raise SessionException("AgentCore Memory writer is closed")
+            if len(self._queue) >= self.max_pending:
+                if self.overflow == "raise":
+                    raise SessionException(f"AgentCore Memory write queue is full ({self.max_pending} events)")
+                started = time.monotonic()
+                self._condition.wait_for(lambda: len(self._queue) < self.max_pending or self._closed)
+                self.stats["blocked_seconds"] += time.monotonic() - started
+            self._queue.append(kwargs)
+            key = _session_key(kwargs)
+            self._unsent[key] = self._unsent.get(key, 0) + 1
+            self.stats["events"] += 1
+            self.stats["max_queued"] = max(self.stats["max_queued"], len(self._queue))
+            self._condition.notify_all()
+
+        event = {key: kwargs[key] for key in ("memoryId", "actorId", "sessionId", "metadata") if key in kwargs}
+        event.update(eventId=None, eventTimestamp=kwargs["eventTimestamp"], branch=kwargs.get("branch", {"name": "main"}))
+        return {"event": event}
+
+    def pending(self):
+        """Number of events not sent yet."""
+        with self._condition:
+            return sum(self._unsent.values())
+
+    def flush(self, timeout=None, session=None):
+        """
+        Block until every event queued so far was sent or dropped.
+
+        Args:
+            timeout: Seconds to wait at most
+            session: Only wait for the events of this (memoryId, actorId, sessionId)
+
+        Returns:
+            bool: False if the timeout expired first
+        """
+        if session is None:
+            done = lambda: not self._unsent
+        else:
+            done = lambda: session not in self._unsent
+        with self._condition:
+            self._condition.notify_all()
+            return self._condition.wait_for(done, timeout)
+
+    def close(self, timeout=None):
+        """Send the queued events and stop the sender thread."""
+        with self._condition:
+            if self._closed:
+                return
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._sender.join(timeout)
+
+    def __getattr__(self, name):
+        attribute = getattr(self.client, name)
+        if name not in READ_AFTER_WRITE:
+            return attribute
+
+        def after_flush(*args, **kwargs):
+            self.flush(session=_session_key(kwargs))
+            return attribute(*args, **kwargs)
+        return after_flush
+
+    def _send_loop(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+            # Give the rest of the turn a moment to arrive, so its events share a call
+            if self.linger and not self._closed:
+                time.sleep(self.linger)
+            with self._condition:
+                batch = list(self._queue)
+                self._queue.clear()
+                # Room in the queue again
+                self._condition.notify_all()
+
+            unsent = {}
+            for kwargs in batch:
+                unsent[_session_key(kwargs)] = unsent.get(_session_key(kwargs), 0) + 1
+            try:
+                for events, kwargs in _merge(batch):
+                    try:
+                        self._send(events, kwargs)
+                    finally:
+                        unsent[_session_key(kwargs)] -= len(events)
+                        self._release({_session_key(kwargs): len(events)})
+            except Exception:
+                self.stats["failed"] += sum(unsent.values())
+                logger.exception("events=<%d> | sending AgentCore Memory events failed", sum(unsent.values()))
+            finally:
+                # Whatever happened, flush() must not wait for events this batch will never send
+                self._release(unsent)
+
+    def _release(self, counts):
+        with self._condition:
+            for key, count in counts.items():
+                if count:
+                    left = self._unsent[key] - count
+                    if left:
+                        self._unsent[key] = left
+                    else:
+                        del self._unsent[key]
+            self._condition.notify_all()
+
+    def _send(self, events, kwargs):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.client.create_event(**kwargs)
+                self.stats["calls"] += 1
+                return
+            except Exception as e:
+                if attempt == self.max_attempts or not _retryable(e):
+                    self.stats["failed"] += len(events)
+                    logger.error("session_id=<%s>, events=<%d> | dropping AgentCore Memory events after %d attempts: %s",
+                                 kwargs.get("sessionId"), len(events), attempt, e)
+                    if self.on_failure is not None:
+                        try:
+                            self.on_failure(events, e)
+                        except Exception:
+                            logger.exception("session_id=<%s> | on_failure callback failed", kwargs.get("sessionId"))
+                    return
+                self.stats["retries"] += 1
+                delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+
+class DataPlaneSession:
+    """
+    boto3 Session handing out a given client for the AgentCore data plane.
+
+    AgentCoreMemorySessionManager creates its clients from the boto_session it is given and already
+    reads and writes the session in its constructor, so this is how an AsyncEventWriter or a
+    StubMemoryClient is put in place.
+    """
+
+    def __init__(self, data_plane_client, boto_session=None):
+        self.data_plane_client = data_plane_client
+        self.boto_session = boto_session or boto3.Session()
+
+    def client(self, service_name, *args, **kwargs):
+        if service_name == "bedrock-agentcore":
+            return self.data_plane_client
+        return self.boto_session.client(service_name, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.boto_session, name)
+
+
+def _merge(batch):
+    """
+    Merge queued create_event calls into as few calls as possible.
+
+    Events are merged into the latest call of their session when it has the same branch, metadata and
+    other arguments, so the payload order within a session is kept.
+
+    Returns:
+        list: (original kwargs list, merged kwargs) per call to send
+    """
+    calls = []
+    latest = {}
+    for kwargs in batch:
+        session = (kwargs.get("memoryId"), kwargs.get("actorId"), kwargs.get("sessionId"))
+        key = json.dumps(
+            {name: value for name, value in kwargs.items() if name not in ("payload", "eventTimestamp")},
+            sort_keys=True, default=str,
+        )
+        call = latest.get(session)
+        if (call is None or call[2] != key or "clientToken" in kwargs
+                or len(call[1]["payload"]) + len(kwargs["payload"]) > MAX_PAYLOAD_ITEMS):
+            call = ([], dict(kwargs, payload=[]), key)
+            call[1].setdefault("clientToken", str(uuid.uuid4()))
+            calls.append(call)
+            latest[session] = call
+        events, merged, _ = call
+        events.append(kwargs)
+        merged["payload"].extend(kwargs["payload"])
+        merged["eventTimestamp"] = max(merged["eventTimestamp"], kwargs["eventTimestamp"])
+    return [(events, merged) for events, merged, _ in calls]
+
+
+def _session_key(kwargs):
+    return kwargs.get("memoryId"), kwargs.get("actorId"), kwargs.get("sessionId")
+
+
+def _retryable(error):
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code") in RETRYABLE_ERRORS
+    return isinstance(error, (ConnectionError, HTTPClientError))
+
+
+def _close_ref(ref):
+    writer = ref()
+    if writer is not None:
+        writer.close()
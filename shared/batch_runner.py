@@ -0,0 +1,204 @@
+"""
+Batch runner for workshop agents.
+
+Replays a JSONL file of prompts against any script that exposes an
+`initialize_agent()` function (parts 1, 2 and 4) instead of the interactive
+terminal loop. Prompts are fanned out across a pool of independently
+initialized agents, one per concurrency slot, and results are streamed to a
+JSONL file as they complete.
+
+Input lines look like:
+    {"id": "q-1", "prompt": "What is a debit card?"}
+
+`id` is optional and defaults to the line number. Each output line contains
+the id, prompt, response, latency in seconds, token usage and an error
+message if the request failed.
+
+Usage:
+    python shared/batch_runner.py part-2-memory-tools/solution/agent_tools.py prompts.jsonl \\
+        --output results.jsonl --concurrency 8
+"""
+
+import argparse
+import asyncio
+import copy
+import importlib.util
+import json
+import os
+import sys
+import time
+
+from strands import Agent
+from strands.handlers.callback_handler import PrintingCallbackHandler, null_callback_handler
+from strands.telemetry.metrics import EventLoopMetrics
+
+
+def load_agent_factory(script_path, factory_name="initialize_agent"):
+    """
+    Load the agent factory function from a workshop script.
+
+    Works with file names that are not valid module names (e.g. agents-as-tools.py).
+    The script's `main()` is not executed because it is guarded by `__name__`.
+
+    Args:
+        script_path: Path to the workshop script
+        factory_name: Name of the function that builds the agent
+
+    Returns:
+        Callable: A zero-argument function returning a new agent
+    """
+    script_path = os.path.abspath(script_path)
+    module_name = os.path.splitext(os.path.basename(script_path))[0].replace("-", "_")
+
+    # Scripts import their siblings (e.g. `from agent import agent`) relative to their own folder
+    sys.path.insert(0, os.path.dirname(script_path))
+
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return getattr(module, factory_name)
+
+
+def read_prompts(input_path):
+    """
+    Yield (id, prompt) pairs from a JSONL file, skipping blank lines.
+    """
+    with open(input_path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield str(record.get("id", line_number)), record["prompt"]
+
+
+async def run_batch(agent_factory, prompts, output_path, concurrency=4):
+    """
+    Run every prompt through a pool of agents and stream the results to JSONL.
+
+    Each worker owns one agent built by `agent_factory`. Between requests the
+    agent's conversation history and metrics are reset to their initial state,
+    so every prompt is answered independently and token usage is per request.
+
+    Args:
+        agent_factory: Zero-argument function returning a new agent, Graph or Swarm
+        prompts: Iterable of (id, prompt) pairs
+        output_path: Where to write the JSONL results
+        concurrency: Maximum number of requests in flight
+
+    Returns:
+        dict: Summary with request and error counts, wall time and throughput
+    """
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    summary = {"requests": 0, "errors": 0}
+    start = time.perf_counter()
+
+    # Factories are synchronous and may create clients, so build the pool off the event loop
+    agents = await asyncio.gather(*(asyncio.to_thread(agent_factory) for _ in range(concurrency)))
+
+    with open(output_path, "w", encoding="utf-8") as output:
+
+        async def worker(agent):
+            initial_messages = _prepare_for_batch(agent)
+
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+
+                record = await _run_one(agent, *item)
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+
+                summary["requests"] += 1
+                summary["errors"] += record["error"] is not None
+
+                if initial_messages is not None:
+                    agent.messages = copy.deepcopy(initial_messages)
+                    agent.event_loop_metrics = EventLoopMetrics()
+
+        workers = [asyncio.create_task(worker(agent)) for agent in agents]
+
+        # Feed the workers through a bounded queue so large files are never loaded into memory
+        for item in prompts:
+            await queue.put(item)
+        for _ in workers:
+            await queue.put(None)
+
+        await asyncio.gather(*workers)
+
+    summary["wall_time_s"] = round(time.perf_counter() - start, 3)
+    summary["requests_per_s"] = round(summary["requests"] / summary["wall_time_s"], 2) if summary["wall_time_s"] else 0.0
+    return summary
+
+
+def _prepare_for_batch(agent):
+    """
+    Silence per-token printing and snapshot the starting conversation of single agents.
+
+    Returns:
+        list | None: Initial messages to restore between requests, None for Graph/Swarm
+    """
+    if not isinstance(agent, Agent):
+        return None
+
+    if isinstance(agent.callback_handler, PrintingCallbackHandler):
+        agent.callback_handler = null_callback_handler
+
+    return copy.deepcopy(agent.messages)
+
+
+async def _run_one(agent, request_id, prompt):
+    """
+    Invoke the agent once and build the output record.
+    """
+    start = time.perf_counter()
+    response, usage, error = None, None, None
+
+    try:
+        result = await agent.invoke_async(prompt)
+        response = str(result)
+        usage = _usage_of(result)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    return {
+        "id": request_id,
+        "prompt": prompt,
+        "response": response,
+        "latency_s": round(time.perf_counter() - start, 3),
+        "usage": usage,
+        "error": error,
+    }
+
+
+def _usage_of(result):
+    """
+    Extract token usage from an AgentResult or MultiAgentResult.
+    """
+    usage = result.metrics.accumulated_usage if hasattr(result, "metrics") else result.accumulated_usage
+    return {key: usage.get(key, 0) for key in ("inputTokens", "outputTokens", "totalTokens")}
+
+
+def main():
+    """
+    Command line entry point.
+    """
+    parser = argparse.ArgumentParser(description="Replay a JSONL file of prompts against a workshop agent.")
+    parser.add_argument("script", help="Workshop script exposing initialize_agent()")
+    parser.add_argument("prompts", help="JSONL file with one {\"prompt\": ...} object per line")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL file to write results to")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Maximum requests in flight")
+    parser.add_argument("--factory", default="initialize_agent", help="Name of the agent factory function")
+    args = parser.parse_args()
+
+    agent_factory = load_agent_factory(args.script, args.factory)
+    summary = asyncio.run(run_batch(agent_factory, read_prompts(args.prompts), args.output, args.concurrency))
+
+    print(f"Processed {summary['requests']} requests ({summary['errors']} errors) "
+          f"in {summary['wall_time_s']}s — {summary['requests_per_s']} req/s")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
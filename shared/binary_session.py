@@ -0,0 +1,327 @@
+"""
+Session manager storing messages as length-prefixed binary records with an offset index.
+
+`FileSessionManager` keeps one JSON file per message, and restoring a session
+lists the messages directory and parses every file, so a long session takes
+seconds to restore before the first turn. `BinarySessionManager` keeps the
+session and agent files, but stores the messages of an agent in two files:
+
+    messages.bin    header, then one record per message: 4-byte length + encoded message
+    messages.idx    one fixed-size entry per message id: record offset, record length, flags
+
+Restoring memory-maps `messages.bin`, reads the last index entries and
+decodes only the messages the conversation manager keeps: with the default
+`restore_window="auto"` that is the `window_size` of a sliding window
+manager, starting at a user turn so tool use and tool results stay paired.
+Messages are encoded with msgpack when it is installed, JSON otherwise; the
+codec is recorded in the file header.
+
+A message update (redaction) appends a new record and rewrites its index
+entry. A crash can only leave an unreferenced record or a partial index
+entry at the end, which are ignored.
+
+Restoring a session written by FileSessionManager that was not converted
+raises a SessionException instead of silently restoring no messages.
+Convert sessions written by FileSessionManager with:
+    python shared/binary_session.py ./agent-session [--session-id ID] [--remove-json]
+
+Usage:
+    session_manager = BinarySessionManager(session_id="user-1", storage_dir="./agent-session")
+    agent = Agent(session_manager=session_manager)
+"""
+
+import argparse
+import importlib.util
+import json
+import mmap
+import os
+import struct
+import sys
+
+from strands.session import FileSessionManager
+from strands.types.exceptions import SessionException
+from strands.types.session import SessionMessage
+
+MSGPACK_AVAILABLE = importlib.util.find_spec("msgpack") is not None
+DEFAULT_CODEC = b"m" if MSGPACK_AVAILABLE else b"j"
+
+DATA_FILE = "messages.bin"
+INDEX_FILE = "messages.idx"
+MAGIC = b"SMSG\x01"
+# Record offset, record length, flags (padded to 16 bytes)
+INDEX_ENTRY = struct.Struct("<QIB3x")
+RECORD_LENGTH = struct.Struct("<I")
+TURN_START = 0x01
+
+
+class BinarySessionManager(FileSessionManager):
+    """
+    FileSessionManager storing messages in an indexed binary file and restoring only the kept window.
+    """
+
+    def __init__(self, session_id, storage_dir=None, restore_window="auto", **kwargs):
+        """
+        Args:
+            session_id: ID for the session
+            storage_dir: Directory for the session files
+            restore_window: Messages restored at most ("auto" uses the conversation manager's
+                window_size, None restores everything after the removed messages)
+        """
+        self.restore_window = restore_window
+        self._writers = {}
+        self._restoring = {}
+        super().__init__(session_id=session_id, storage_dir=storage_dir, **kwargs)
+
+    def initialize(self, agent, **kwargs):
+        window = self.restore_window
+        if window == "auto":
+            window = getattr(getattr(agent, "conversation_manager", None), "window_size", None)
+        self._restoring[agent.agent_id] = window
+        try:
+            super().initialize(agent, **kwargs)
+        finally:
+            self._restoring.pop(agent.agent_id, None)
+
+    def create_message(self, session_id, agent_id, session_message, **kwargs):
+        self._write_record(self._get_agent_path(session_id, agent_id), session_message)
+
+    def update_message(self, session_id, agent_id, session_message, **kwargs):
+        agent_dir = self._get_agent_path(session_id, agent_id)
+        previous = self.read_message(session_id, agent_id, session_message.message_id)
+        if previous is None:
+            raise SessionException(f"Message {session_message.message_id} does not exist")
+        session_message.created_at = previous.created_at
+        self._write_record(agent_dir, session_message)
+
+    def read_message(self, session_id, agent_id, message_id, **kwargs):
+        with MessageFile(self._get_agent_path(session_id, agent_id)) as messages:
+            if message_id >= len(messages) or not messages.exists(message_id):
+                return None
+            return messages.read(message_id)
+
+    def list_messages(self, session_id, agent_id, limit=None, offset=0, **kwargs):
+        agent_dir = self._get_agent_path(session_id, agent_id)
+        if not os.path.isdir(agent_dir):
+            raise SessionException(f"Agent {agent_id} in session {session_id} does not exist")
+
+        if not os.path.exists(os.path.join(agent_dir, INDEX_FILE)) and _has_json_messages(agent_dir):
+            raise SessionException(
+                f"Agent {agent_id} in session {session_id} has messages written by FileSessionManager, "
+                f"convert them first with: python shared/binary_session.py {self.storage_dir} --session-id {session_id}"
+            )
+
+        with MessageFile(agent_dir) as messages:
+            end = len(messages) if limit is None else min(offset + limit, len(messages))
+            window = self._restoring.get(agent_id)
+            start = offset
+            if window is not None and end - start > window:
+                start = messages.turn_start_from(end - window, end)
+            return [messages.read(message_id) for message_id in range(start, end) if messages.exists(message_id)]
+
+    def close(self):
+        """Close the open message files."""
+        for data, index, _ in self._writers.values():
+            data.close()
+            index.close()
+        self._writers.clear()
+
+    def _write_record(self, agent_dir, session_message):
+        writer = self._writers.get(agent_dir)
+        if writer is None:
+            writer = self._writers[agent_dir] = _open_writer(agent_dir)
+        write_record(*writer, session_message)
+
+
+class MessageFile:
+    """
+    Read-only view of an agent's messages.bin and messages.idx, memory-mapped.
+    """
+
+    def __init__(self, agent_dir):
+        self.agent_dir = agent_dir
+        self._data = None
+        self._index = None
+        self._count = 0
+        self._decode = None
+
+    def __enter__(self):
+        data_path = os.path.join(self.agent_dir, DATA_FILE)
+        index_path = os.path.join(self.agent_dir, INDEX_FILE)
+        if not os.path.exists(data_path) or not os.path.exists(index_path):
+            return self
+
+        with open(data_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size <= len(MAGIC):
+                return self
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._decode = _codec(self._data[len(MAGIC):len(MAGIC) + 1])[1]
+        with open(index_path, "rb") as f:
+            # A partial entry at the end is a write cut short by a crash
+            self._count = os.fstat(f.fileno()).st_size // INDEX_ENTRY.size
+            if self._count:
+                self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def __exit__(self, *exc_info):
+        for mapped in (self._data, self._index):
+            if mapped is not None:
+                mapped.close()
+
+    def __len__(self):
+        return self._count
+
+    def entry(self, message_id):
+        return INDEX_ENTRY.unpack_from(self._index, message_id * INDEX_ENTRY.size)
+
+    def exists(self, message_id):
+        offset, length, _ = self.entry(message_id)
+        return length > 0 and offset + RECORD_LENGTH.size + length <= len(self._data)
+
+    def read(self, message_id):
+        offset, length, _ = self.entry(message_id)
+        start = offset + RECORD_LENGTH.size
+        return SessionMessage.from_dict(self._decode(self._data[start:start + length]))
+
+    def turn_start_from(self, start, end):
+        """First message id in [start, end) starting a user turn, or `start` if there is none."""
+        for message_id in range(start, end):
+            if self.entry(message_id)[2] & TURN_START:
+                return message_id
+        return start
+
+
+def write_record(data, index, codec, session_message):
+    """Append a message record to the open data file and point its index entry at it."""
+    encoded = _codec(codec)[0](session_message.to_dict())
+    offset = data.seek(0, os.SEEK_END)
+    data.write(RECORD_LENGTH.pack(len(encoded)) + encoded)
+    data.flush()
+
+    message = session_message.to_message()
+    turn_start = message["role"] == "user" and not any("toolResult" in block for block in message["content"])
+    position = session_message.message_id * INDEX_ENTRY.size
+    size = index.seek(0, os.SEEK_END)
+    if position > size:
+        # Message ids are contiguous in practice; missing ones get empty entries
+        index.write(b"\x00" * (position - size))
+    index.seek(position)
+    index.write(INDEX_ENTRY.pack(offset, len(encoded), TURN_START if turn_start else 0))
+    index.flush()
+
+
+def _open_writer(agent_dir):
+    os.makedirs(agent_dir, mode=0o700, exist_ok=True)
+    data_path = os.path.join(agent_dir, DATA_FILE)
+    index_path = os.path.join(agent_dir, INDEX_FILE)
+    for path in (data_path, index_path):
+        if os.path.islink(path):
+            raise SessionException(f"Refusing to write to symlink at {path}. This may indicate a symlink attack.")
+
+    data = open(data_path, "a+b")
+    data.seek(0)
+    header = data.read(len(MAGIC) + 1)
+    if not header:
+        header = MAGIC + DEFAULT_CODEC
+        data.write(header)
+        data.flush()
+    elif header[:len(MAGIC)] != MAGIC:
+        raise SessionException(f"{data_path} is not a binary session file")
+
+    index = open(index_path, "r+b" if os.path.exists(index_path) else "w+b")
+    size = index.seek(0, os.SEEK_END)
+    index.truncate(size - size % INDEX_ENTRY.size)
+    return data, index, header[len(MAGIC):]
+
+
+def _has_json_messages(agent_dir):
+    messages_dir = os.path.join(agent_dir, "messages")
+    return os.path.isdir(messages_dir) and any(
+        name.startswith("message_") and name.endswith(".json") for name in os.listdir(messages_dir)
+    )
+
+
+def _codec(name):
+    """(encode, decode) functions for the codec byte of a data file."""
+    if name == b"m":
+        if not MSGPACK_AVAILABLE:
+            raise SessionException("This session was written with msgpack, install it with: pip install msgpack")
+        import msgpack
+        return (lambda value: msgpack.packb(value, use_bin_type=True)), (lambda raw: msgpack.unpackb(raw, raw=False))
+    if name == b"j":
+        return (lambda value: json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")), json.loads
+    raise SessionException(f"Unknown session codec {name!r}")
+
+
+def migrate(storage_dir, session_id=None, remove_json=False):
+    """
+    Convert the message files written by FileSessionManager into messages.bin and messages.idx.
+
+    Args:
+        storage_dir: FileSessionManager storage directory
+        session_id: Only migrate this session (default: all sessions)
+        remove_json: Delete the JSON message files after a successful conversion
+
+    Returns:
+        dict: Number of agents and messages converted
+    """
+    session_dirs = [f"session_{session_id}"] if session_id else [
+        name for name in sorted(os.listdir(storage_dir)) if name.startswith("session_")
+    ]
+
+    converted = {"agents": 0, "messages": 0}
+    for session_dir in session_dirs:
+        agents_dir = os.path.join(storage_dir, session_dir, "agents")
+        if not os.path.isdir(agents_dir):
+            continue
+        for agent_name in sorted(os.listdir(agents_dir)):
+            agent_dir = os.path.join(agents_dir, agent_name)
+            if os.path.exists(os.path.join(agent_dir, INDEX_FILE)):
+                print(f"Skipping {agent_dir}: already converted")
+                continue
+
+            messages_dir = os.path.join(agent_dir, "messages")
+            files = sorted(
+                (int(name[len("message_"):-len(".json")]), name)
+                for name in os.listdir(messages_dir) if name.startswith("message_") and name.endswith(".json")
+            )
+            # Write next to the final files and rename, so an interrupted run leaves no partial conversion
+            data_path, index_path = os.path.join(agent_dir, DATA_FILE), os.path.join(agent_dir, INDEX_FILE)
+            with open(data_path + ".tmp", "w+b") as data, open(index_path + ".tmp", "w+b") as index:
+                data.write(MAGIC + DEFAULT_CODEC)
+                for _, name in files:
+                    with open(os.path.join(messages_dir, name), encoding="utf-8") as f:
+                        write_record(data, index, DEFAULT_CODEC, SessionMessage.from_dict(json.load(f)))
+                os.fsync(data.fileno())
+                os.fsync(index.fileno())
+            os.replace(data_path + ".tmp", data_path)
+            os.replace(index_path + ".tmp", index_path)
+
+            if remove_json:
+                for _, name in files:
+                    os.unlink(os.path.join(messages_dir, name))
+
+            converted["agents"] += 1
+            converted["messages"] += len(files)
+            print(f"Converted {agent_dir}: {len(files)} messages")
+    return converted
+
+
+def main():
+    """
+    Command line entry point.
+    """
+    parser = argparse.ArgumentParser(description="Convert FileSessionManager sessions to the binary message format.")
+    parser.add_argument("storage_dir", help="FileSessionManager storage directory, e.g. ./agent-session")
+    parser.add_argument("--session-id", default=None, help="Only convert this session")
+    parser.add_argument("--remove-json", action="store_true", help="Delete the JSON message files afterwards")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.storage_dir):
+        sys.exit(f"{args.storage_dir} is not a directory")
+    converted = migrate(args.storage_dir, args.session_id, args.remove_json)
+    print(f"Converted {converted['messages']} messages of {converted['agents']} agents "
+          f"({'msgpack' if MSGPACK_AVAILABLE else 'JSON'} records)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Bounded parallel execution and critical-path timing for Strands Graphs.
+
+The Graph runs every ready node of a batch concurrently (in the diamond
+research -> analysis + fact_check -> report, the two middle nodes run side by
+side). `GraphParallelism` is a hook provider that caps how many nodes execute
+at the same time and records when each node ran, so every invocation can be
+summarized as:
+
+    wall time          How long the user waited
+    summed node time   What a sequential execution would have cost
+    critical path      The longest dependency chain, the lower bound for the wall time
+
+Usage:
+    parallelism = GraphParallelism(max_parallelism=4, on_report=print_report)
+    builder.set_hook_providers([parallelism])
+    graph = builder.build()
+    graph("...")
+    print(parallelism.last_report)
+"""
+
+import asyncio
+import time
+
+from strands.hooks import (
+    AfterMultiAgentInvocationEvent,
+    AfterNodeCallEvent,
+    BeforeMultiAgentInvocationEvent,
+    BeforeNodeCallEvent,
+    HookProvider,
+)
+
+
+class GraphParallelism(HookProvider):
+    """
+    Limits concurrently executing graph nodes and reports critical-path vs summed node time.
+    """
+
+    def __init__(self, max_parallelism=None, on_report=None):
+        """
+        Args:
+            max_parallelism: Maximum number of nodes executing at once (None for no limit)
+            on_report: Callable receiving the report dict after every invocation
+        """
+        if max_parallelism is not None and max_parallelism < 1:
+            raise ValueError("max_parallelism must be at least 1")
+
+        self.max_parallelism = max_parallelism
+        self.on_report = on_report
+        self.last_report = None
+
+        self._semaphore = None
+        self._start = 0.0
+        self._node_times = {}
+        self._running = 0
+        self._peak = 0
+
+    def register_hooks(self, registry, **kwargs):
+        registry.add_callback(BeforeMultiAgentInvocationEvent, self._before_invocation)
+        registry.add_callback(BeforeNodeCallEvent, self._before_node)
+        registry.add_callback(AfterNodeCallEvent, self._after_node)
+        registry.add_callback(AfterMultiAgentInvocationEvent, self._after_invocation)
+
+    def _before_invocation(self, event):
+        # A fresh semaphore per invocation binds it to the running event loop
+        self._semaphore = asyncio.Semaphore(self.max_parallelism) if self.max_parallelism else None
+        self._start = time.perf_counter()
+        self._node_times = {}
+        self._running = 0
+        self._peak = 0
+
+    async def _before_node(self, event):
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+
+        # Timing starts once the node holds a slot, so waiting for a slot is not counted as node time
+        self._node_times[event.node_id] = [time.perf_counter(), None]
+        self._running += 1
+        self._peak = max(self._peak, self._running)
+
+    def _after_node(self, event):
+        times = self._node_times.get(event.node_id)
+        if times is None or times[1] is not None:
+            return
+
+        times[1] = time.perf_counter()
+        self._running -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def _after_invocation(self, event):
+        self.last_report = self._build_report(event.source, time.perf_counter() - self._start)
+        if self.on_report is not None:
+            self.on_report(self.last_report)
+
+    def _build_report(self, graph, wall_time):
+        node_times = {node_id: end - start for node_id, (start, end) in self._node_times.items() if end is not None}
+        path, path_time = critical_path(graph, self._node_times)
+        summed = sum(node_times.values())
+
+        return {
+            "wall_time": wall_time,
+            "summed_node_time": summed,
+            "critical_path": path,
+            "critical_path_time": path_time,
+            "speedup": summed / wall_time if wall_time else 0.0,
+            "max_parallelism": self.max_parallelism,
+            "peak_parallelism": self._peak,
+            "node_times": node_times,
+        }
+
+
+def critical_path(graph, node_times):
+    """
+    Find the longest chain of dependent nodes by execution time.
+
+    Only edges whose source finished before the target started are followed,
+    which keeps the chain acyclic even for graphs with loops.
+
+    Args:
+        graph: The Graph that was executed
+        node_times: node_id -> (start, end) from perf_counter
+
+    Returns:
+        tuple: (list of node ids along the path, total seconds)
+    """
+    finished = {node_id: times for node_id, times in node_times.items() if times[1] is not None}
+    predecessors = {node_id: [] for node_id in finished}
+    for edge in graph.edges:
+        source, target = edge.from_node.node_id, edge.to_node.node_id
+        if source in finished and target in finished and finished[source][1] <= finished[target][0]:
+            predecessors[target].append(source)
+
+    best = {}
+    # Visiting nodes in start order guarantees predecessors are resolved first
+    for node_id in sorted(finished, key=lambda n: finished[n][0]):
+        start, end = finished[node_id]
+        previous = max(predecessors[node_id], key=lambda p: best[p][1], default=None)
+        path, total = best[previous] if previous is not None else ([], 0.0)
+        best[node_id] = (path + [node_id], total + end - start)
+
+    if not best:
+        return [], 0.0
+    return max(best.values(), key=lambda item: item[1])
+
+
+def print_report(report):
+    """
+    Print a one-screen summary of a GraphParallelism report.
+    """
+    limit = report["max_parallelism"] or "unlimited"
+    print(f"\n[graph] wall {report['wall_time']:.2f}s | summed nodes {report['summed_node_time']:.2f}s | "
+          f"speedup x{report['speedup']:.2f} | parallelism {report['peak_parallelism']} (max {limit})")
+    print(f"[graph] critical path {' -> '.join(report['critical_path'])} = {report['critical_path_time']:.2f}s")
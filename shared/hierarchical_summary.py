@@ -0,0 +1,275 @@
+"""
+Incremental, hierarchical summarizing conversation manager.
+
+`SummarizingConversationManager` re-summarizes a large part of the history
+in one model call when the context overflows, on the request path.
+`HierarchicalSummaryConversationManager` keeps three levels instead:
+
+    digest          one summary of the oldest part of the conversation
+    chunk summaries one summary per `chunk_turns` older turns, at most `max_chunks`
+    recent turns    the last `recent_turns` turns, verbatim
+
+When a turn leaves the recent window it is folded into the newest (open)
+chunk summary only, and once there are more than `max_chunks` closed chunks
+the oldest is folded into the digest. So each turn costs one small summary
+call, whatever the length of the conversation, and the prompt stays close to
+a constant size.
+
+Summaries are written by a background thread, off the request path. Turns
+stay in the history verbatim until their summary is ready, so nothing is
+lost while the summarizer is running; the summary is swapped in at the next
+turn. Only a context overflow waits for pending summaries.
+
+The summaries are kept at the start of the history as a user message with
+an assistant acknowledgement, so roles keep alternating.
+
+Usage:
+    manager = HierarchicalSummaryConversationManager(model=model, recent_turns=3, chunk_turns=4)
+    agent = Agent(model=model, conversation_manager=manager)
+    ...
+    print(manager.report())
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from strands import Agent
+from strands.agent.conversation_manager import ConversationManager
+from strands.types.exceptions import ContextWindowOverflowException
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_HEADER = "[Summary of the earlier conversation]"
+SUMMARY_ACK = "Understood, I will use this summary of our earlier conversation."
+# Characters of a tool result kept in the transcript given to the summarizer
+_TOOL_RESULT_CHARS = 500
+
+
+class HierarchicalSummaryConversationManager(ConversationManager):
+    """
+    Keeps recent turns verbatim, older turns as chunk summaries and the oldest as one digest.
+    """
+
+    def __init__(self, model=None, recent_turns=3, chunk_turns=4, max_chunks=3, summary_words=150, background=True):
+        """
+        Args:
+            model: Model for the summarizer agent (None for the Strands default)
+            recent_turns: Turns kept verbatim
+            chunk_turns: Turns summarized into one chunk summary
+            max_chunks: Closed chunk summaries kept before the oldest is folded into the digest
+            summary_words: Target length of each summary
+            background: Write summaries in a background thread (False summarizes on the request path)
+        """
+        super().__init__()
+        if recent_turns < 1:
+            raise ValueError("recent_turns must be at least 1")
+
+        self.recent_turns = recent_turns
+        self.chunk_turns = chunk_turns
+        self.max_chunks = max_chunks
+        self.background = background
+        self.summarizer = Agent(
+            model=model,
+            system_prompt=(
+                "You maintain a running summary of a conversation between a user and an assistant. Keep names, "
+                "facts about the user, decisions, open questions and results of tool calls. Answer with the "
+                f"summary only, at most {summary_words} words."
+            ),
+            callback_handler=None,
+        )
+
+        self.digest = ""
+        # Each chunk: {"summary": str, "turns": int}; the last one is open until it holds chunk_turns turns
+        self.chunks = []
+        self.stats = {"summary_calls": 0, "summary_seconds": 0.0, "turns_summarized": 0}
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summarizer")
+        # Submitted batches of turns, oldest first: [first message, message count, future]
+        self._pending = []
+        self._summary_messages = None
+
+    def apply_management(self, agent, **kwargs):
+        self._apply_completed(agent.messages)
+
+        turns = _turn_starts(agent.messages, self._history_start(agent.messages))
+        queued = sum(batch[1] for batch in self._pending)
+        # Turns beyond the recent window that are not queued for summarization yet
+        start = self._history_start(agent.messages) + queued
+        evict = [index for index in turns if index >= start]
+        evict = evict[:max(len(evict) - self.recent_turns, 0)]
+        if not evict:
+            return
+
+        end = turns[turns.index(evict[-1]) + 1]
+        self._submit(agent.messages[start:end])
+        if not self.background:
+            self._apply_completed(agent.messages)
+
+    def reduce_context(self, agent, e=None, **kwargs):
+        # On overflow, wait for pending summaries, then summarize one more turn right away if needed
+        before = len(agent.messages)
+        self.wait()
+        self._apply_completed(agent.messages)
+        if len(agent.messages) < before:
+            return
+
+        history_start = self._history_start(agent.messages)
+        turns = _turn_starts(agent.messages, history_start)
+        if len(turns) < 2:
+            if e is not None:
+                raise ContextWindowOverflowException("Unable to summarize: only the current turn is left") from e
+            return
+
+        self._submit(agent.messages[history_start:turns[1]])
+        self.wait()
+        self._apply_completed(agent.messages)
+
+    def wait(self):
+        """Block until all pending summaries are written."""
+        for batch in list(self._pending):
+            try:
+                batch[2].result()
+            except Exception:
+                logger.exception("background summary failed")
+
+    def get_state(self):
+        state = super().get_state()
+        with self._lock:
+            state["digest"] = self.digest
+            state["chunks"] = [dict(chunk) for chunk in self.chunks]
+        return state
+
+    def restore_from_session(self, state):
+        super().restore_from_session(state)
+        self.digest = state.get("digest", "")
+        self.chunks = state.get("chunks", [])
+        self._pending = []
+        self._summary_messages = self._render() if (self.digest or self.chunks) else None
+        return list(self._summary_messages) if self._summary_messages else None
+
+    def report(self):
+        """Sizes of the summary levels and the time spent summarizing in the background."""
+        with self._lock:
+            return {
+                "digest_chars": len(self.digest),
+                "chunks": [{"turns": chunk["turns"], "chars": len(chunk["summary"])} for chunk in self.chunks],
+                "pending_batches": len(self._pending),
+                **self.stats,
+            }
+
+    def _history_start(self, messages):
+        """Index of the first conversation message after the summary messages."""
+        if self._summary_messages and len(messages) >= 2 and messages[0] is self._summary_messages[0]:
+            return 2
+        return 0
+
+    def _submit(self, turn_messages):
+        transcript = _transcript(turn_messages)
+        turn_count = len(_turn_starts(turn_messages, 0))
+        future = self._executor.submit(self._summarize, transcript, turn_count)
+        self._pending.append([turn_messages[0], len(turn_messages), future])
+        logger.debug("turns=<%s>, messages=<%s> | queued turns for summarization", turn_count, len(turn_messages))
+
+    def _apply_completed(self, messages):
+        """Replace the turns whose summaries are ready with the updated summary messages."""
+        removed = 0
+        start = self._history_start(messages)
+        while self._pending and self._pending[0][2].done():
+            first, count, future = self._pending.pop(0)
+            if future.exception() is not None:
+                logger.warning("error=<%s> | summary failed, keeping the turns verbatim", future.exception())
+                continue
+            if start + removed >= len(messages) or messages[start + removed] is not first:
+                # The history was changed underneath us (cleared or restored); the summary still holds
+                continue
+            removed += count
+
+        if not removed:
+            return
+
+        self._summary_messages = self._render()
+        messages[:start + removed] = list(self._summary_messages)
+        self.removed_message_count += removed
+
+    def _summarize(self, transcript, turn_count):
+        started = time.perf_counter()
+        with self._lock:
+            open_chunk = self.chunks[-1] if self.chunks and self.chunks[-1]["turns"] < self.chunk_turns else None
+            previous = open_chunk["summary"] if open_chunk else ""
+
+        summary = self._call_summarizer(
+            f"Current summary:\n{previous}\n\nNew turns:\n{transcript}\n\nUpdate the summary with the new turns."
+            if previous else f"Summarize these turns:\n{transcript}"
+        )
+
+        with self._lock:
+            if open_chunk is None:
+                self.chunks.append({"summary": summary, "turns": turn_count})
+            else:
+                open_chunk["summary"] = summary
+                open_chunk["turns"] += turn_count
+            fold = self.chunks.pop(0) if len(self._closed_chunks()) > self.max_chunks else None
+            digest = self.digest
+
+        if fold is not None:
+            if digest:
+                digest = self._call_summarizer(
+                    f"Summary of the oldest part of the conversation:\n{digest}\n\n"
+                    f"Summary of the part that followed:\n{fold['summary']}\n\nMerge them into one summary."
+                )
+            else:
+                digest = fold["summary"]
+            with self._lock:
+                self.digest = digest
+
+        with self._lock:
+            self.stats["turns_summarized"] += turn_count
+            self.stats["summary_seconds"] += time.perf_counter() - started
+
+    def _call_summarizer(self, prompt):
+        self.summarizer.messages.clear()
+        self.stats["summary_calls"] += 1
+        return str(self.summarizer(prompt)).strip()
+
+    def _closed_chunks(self):
+        return [chunk for chunk in self.chunks if chunk["turns"] >= self.chunk_turns]
+
+    def _render(self):
+        with self._lock:
+            parts = [SUMMARY_HEADER]
+            if self.digest:
+                parts.append(f"Overview:\n{self.digest}")
+            for index, chunk in enumerate(self.chunks, 1):
+                parts.append(f"Part {index}:\n{chunk['summary']}")
+        return (
+            {"role": "user", "content": [{"text": "\n\n".join(parts)}]},
+            {"role": "assistant", "content": [{"text": SUMMARY_ACK}]},
+        )
+
+
+def _turn_starts(messages, start):
+    """Indexes of the plain user messages (not tool results) from `start`, which begin a turn."""
+    return [
+        index for index in range(start, len(messages))
+        if messages[index]["role"] == "user" and not any("toolResult" in block for block in messages[index]["content"])
+    ]
+
+
+def _transcript(messages):
+    """Render messages as plain text for the summarizer."""
+    lines = []
+    for message in messages:
+        speaker = "User" if message["role"] == "user" else "Assistant"
+        for block in message["content"]:
+            if "text" in block:
+                lines.append(f"{speaker}: {block['text']}")
+            elif "toolUse" in block:
+                lines.append(f"Assistant called {block['toolUse']['name']}({json.dumps(block['toolUse'].get('input', {}), default=str)})")
+            elif "toolResult" in block:
+                texts = [item.get("text") or json.dumps(item.get("json"), default=str) for item in block["toolResult"].get("content", [])]
+                lines.append(f"Tool result: {' '.join(texts)[:_TOOL_RESULT_CHARS]}")
+    return "\n".join(lines)
@@ -0,0 +1,147 @@
+"""
+Lazy loading helpers for heavy optional modules.
+
+Most of a workshop script's cold start is spent importing modules it may not
+need straight away: `strands_tools.calculator` pulls in sympy, and evaluators
+and exporters bring in strands_evals and the OTLP exporters. These helpers
+defer that work until the first time the module, tool or object is used.
+
+Usage:
+    evaluators = lazy_import("strands_evals.evaluators")      # imported on first attribute access
+    calculator = LazyTool("strands_tools.calculator")         # import starts in the background now
+    agent = Agent(tools=[calculator])
+
+Run `python shared/startup_profiler.py <script>` to see where startup time goes.
+"""
+
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import threading
+
+from strands.types.tools import AgentTool
+
+SPEC_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "strands-workshop", "tool_specs.json")
+
+_spec_cache_lock = threading.Lock()
+
+
+def lazy_import(name):
+    """
+    Return a module whose code only runs on first attribute access.
+
+    Args:
+        name: Fully qualified module name
+
+    Returns:
+        module: The (possibly not yet executed) module object
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class LazyTool(AgentTool):
+    """
+    A tool whose module is imported the first time the agent calls it.
+
+    The agent needs the tool spec when it is constructed, so the spec is read
+    from a small on-disk cache (keyed by the module file and its modification
+    time). On a cache miss (the first run, or after the module changed) the
+    spec is computed by importing the module synchronously, so that run starts
+    as slowly as with a plain import.
+
+    With `preload=True` the module import starts on a background thread when
+    the LazyTool is constructed, so it overlaps with the rest of the script's
+    startup and its first model call instead of running before them. The
+    thread still holds the GIL for most of the import, so it does slow the
+    main thread down somewhat while it runs.
+    """
+
+    def __init__(self, module_name, tool_name=None, preload=True):
+        """
+        Args:
+            module_name: Module that defines the tool, e.g. "strands_tools.calculator"
+            tool_name: Attribute holding the tool in that module (defaults to the module's last name segment)
+            preload: Start importing the module in the background immediately
+        """
+        super().__init__()
+        self._module_name = module_name
+        self._attribute = tool_name or module_name.rsplit(".", 1)[-1]
+        self._tool = None
+        self._load_lock = threading.Lock()
+
+        self._cache_key = self._spec_cache_key()
+        self._cached = _read_spec_cache().get(self._cache_key)
+
+        if preload:
+            threading.Thread(target=self._load, daemon=True).start()
+
+    @property
+    def tool_name(self):
+        return self.tool_spec["name"]
+
+    @property
+    def tool_spec(self):
+        return self._cached_spec()["spec"]
+
+    @property
+    def tool_type(self):
+        return self._cached_spec()["type"]
+
+    async def stream(self, tool_use, invocation_state, **kwargs):
+        async for event in self._load().stream(tool_use, invocation_state, **kwargs):
+            yield event
+
+    def _cached_spec(self):
+        """Spec and type of the tool, from the spec cache or by importing the module."""
+        if self._cached is None:
+            tool = self._load()
+            self._cached = {"spec": tool.tool_spec, "type": tool.tool_type}
+            _write_spec_cache(self._cache_key, self._cached)
+        return self._cached
+
+    def _load(self):
+        with self._load_lock:
+            if self._tool is None:
+                module = importlib.import_module(self._module_name)
+                self._tool = getattr(module, self._attribute)
+            return self._tool
+
+    def _spec_cache_key(self):
+        # Locating the module file does not execute it (only its parent packages)
+        origin = importlib.util.find_spec(self._module_name).origin
+        return f"{self._module_name}:{self._attribute}:{origin}:{os.path.getmtime(origin)}"
+
+
+def _read_spec_cache():
+    try:
+        with open(SPEC_CACHE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_spec_cache(key, value):
+    with _spec_cache_lock:
+        cache = _read_spec_cache()
+        cache[key] = value
+        try:
+            os.makedirs(os.path.dirname(SPEC_CACHE_PATH), exist_ok=True)
+            with open(SPEC_CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+        except OSError:
+            # The cache is only an optimisation; a read-only home directory just means no speed-up
+            pass
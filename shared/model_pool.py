@@ -0,0 +1,112 @@
+"""
+Process-wide pool of BedrockModel instances.
+
+`Agent()` without a model, or `BedrockModel(...)` called per agent, creates a
+new boto3 session and bedrock-runtime client every time, so a four-agent Graph
+or Swarm resolves credentials and opens HTTP connections four times.
+`get_bedrock_model()` returns one shared model per (model_id, region, streaming)
+key instead. Models in the same region share a boto3 session (and therefore
+credentials), and each client keeps a bounded keep-alive connection pool.
+
+Limits can be tuned with environment variables:
+    MODEL_POOL_MAX_MODELS       Distinct models kept before the least recently used is dropped (default 8)
+    MODEL_POOL_MAX_CONNECTIONS  HTTP connections per bedrock-runtime client (default 50)
+
+Usage:
+    model = get_bedrock_model()
+    researcher = Agent(name="researcher", model=model, system_prompt="...")
+    print(pool_stats())
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import boto3
+from botocore.config import Config as BotocoreConfig
+from strands.models import BedrockModel
+
+from shared.stub_model import model_from_env
+
+MAX_MODELS = int(os.getenv("MODEL_POOL_MAX_MODELS", "8"))
+MAX_CONNECTIONS = int(os.getenv("MODEL_POOL_MAX_CONNECTIONS", "50"))
+
+_lock = threading.Lock()
+_models = OrderedDict()
+_sessions = {}
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def get_bedrock_model(model_id=None, region_name=None, streaming=True):
+    """
+    Return the shared BedrockModel for this configuration, creating it on first use.
+
+    When STUB_MODEL is set, a StubModel is returned instead (see shared/stub_model.py).
+
+    Args:
+        model_id: Bedrock model id, or None for the Strands default model
+        region_name: AWS region, or None for the session/environment default
+        streaming: Whether the model uses the streaming Converse API
+
+    Returns:
+        BedrockModel: A model instance that is safe to share between agents
+    """
+    stub = model_from_env()
+    if stub is not None:
+        return stub
+
+    key = (model_id, region_name, streaming)
+
+    with _lock:
+        model = _models.get(key)
+        if model is not None:
+            _stats["hits"] += 1
+            _models.move_to_end(key)
+            return model
+
+        _stats["misses"] += 1
+        model = _create_model(model_id, region_name, streaming)
+        _models[key] = model
+
+        if len(_models) > MAX_MODELS:
+            # Agents holding the evicted model keep working; it is just no longer handed out
+            _models.popitem(last=False)
+            _stats["evictions"] += 1
+
+        return model
+
+
+def pool_stats():
+    """
+    Return pool hit/miss counters and the number of cached models.
+    """
+    with _lock:
+        return {**_stats, "models": len(_models), "sessions": len(_sessions)}
+
+
+def clear_pool():
+    """
+    Drop every cached model and session and reset the counters.
+    """
+    with _lock:
+        _models.clear()
+        _sessions.clear()
+        _stats.update(hits=0, misses=0, evictions=0)
+
+
+def _create_model(model_id, region_name, streaming):
+    # One session per region so credentials are resolved once and shared by all clients
+    session = _sessions.get(region_name)
+    if session is None:
+        session = boto3.Session(region_name=region_name)
+        _sessions[region_name] = session
+
+    model_config = {"streaming": streaming}
+    if model_id:
+        model_config["model_id"] = model_id
+
+    return BedrockModel(
+        boto_session=session,
+        boto_client_config=BotocoreConfig(max_pool_connections=MAX_CONNECTIONS, tcp_keepalive=True),
+        **model_config,
+    )
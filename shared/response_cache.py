@@ -0,0 +1,224 @@
+"""
+Record/replay cache of model responses.
+
+`CachedModel` wraps any Strands model and stores the stream events of each
+request on disk, keyed by a hash of the normalized messages, system prompt,
+tool specs, tool choice and model configuration. Re-running an unchanged
+evaluation suite replays every response from disk: it takes milliseconds
+and costs zero tokens.
+
+Modes:
+    record       Serve cached responses, call the model and store the response on a miss
+    replay       Serve cached responses only; a miss raises CacheMissError (strict offline runs)
+    passthrough  Always call the model, never read or write the cache
+
+Entries expire after a TTL and the least recently used entries are evicted
+once the cache holds more than `max_entries`.
+
+Enable it for the workshop scripts with environment variables:
+    RESPONSE_CACHE=record                   Mode (unset means no cache)
+    RESPONSE_CACHE_DIR=.response-cache      Where entries are stored
+    RESPONSE_CACHE_TTL=604800               Entry lifetime in seconds (default 7 days)
+    RESPONSE_CACHE_MAX_ENTRIES=5000         Maximum number of stored responses
+"""
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from strands.models import BedrockModel, Model
+
+MODES = ("record", "replay", "passthrough")
+
+
+class CacheMissError(Exception):
+    """Raised in replay mode when a request has no cached response."""
+
+
+class CachedModel(Model):
+    """
+    A model wrapper that records responses to disk and replays them.
+    """
+
+    def __init__(self, model, mode="record", cache_dir=".response-cache", ttl=7 * 24 * 3600, max_entries=5000):
+        """
+        Args:
+            model: The Strands model to wrap
+            mode: "record", "replay" or "passthrough"
+            cache_dir: Directory holding one JSON file per cached response
+            ttl: Seconds before an entry expires (None keeps entries forever)
+            max_entries: Number of entries kept before the least recently used are evicted
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+
+        self.model = model
+        self.mode = mode
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @property
+    def config(self):
+        return self.model.get_config()
+
+    def update_config(self, **model_config):
+        self.model.update_config(**model_config)
+
+    def get_config(self):
+        return self.model.get_config()
+
+    def __getattr__(self, name):
+        # Anything the wrapper does not define (e.g. client, stateful) comes from the wrapped model
+        model = self.__dict__.get("model")
+        if model is None:
+            raise AttributeError(name)
+        return getattr(model, name)
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, *, tool_choice=None, **kwargs):
+        if self.mode == "passthrough":
+            async for event in self.model.stream(messages, tool_specs, system_prompt, tool_choice=tool_choice, **kwargs):
+                yield event
+            return
+
+        key = self._fingerprint("stream", messages, system_prompt, tool_specs, tool_choice)
+        events = self._read(key)
+
+        if events is None:
+            events = []
+            async for event in self.model.stream(messages, tool_specs, system_prompt, tool_choice=tool_choice, **kwargs):
+                events.append(event)
+                yield event
+            self._write(key, events)
+            return
+
+        for event in events:
+            yield event
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        if self.mode == "passthrough":
+            async for event in self.model.structured_output(output_model, prompt, system_prompt=system_prompt, **kwargs):
+                yield event
+            return
+
+        key = self._fingerprint("structured_output", prompt, system_prompt, output_model.model_json_schema(), None)
+        cached = self._read(key)
+
+        if cached is None:
+            async for event in self.model.structured_output(output_model, prompt, system_prompt=system_prompt, **kwargs):
+                if "output" in event:
+                    self._write(key, event["output"].model_dump(mode="json"))
+                yield event
+            return
+
+        yield {"output": output_model.model_validate(cached)}
+
+    def _fingerprint(self, kind, messages, system_prompt, tool_specs, tool_choice):
+        """
+        Hash everything that determines the response.
+        """
+        request = {
+            "kind": kind,
+            "messages": _normalize_messages(messages),
+            "system_prompt": system_prompt,
+            "tool_specs": tool_specs,
+            "tool_choice": tool_choice,
+            "model": self.model.get_config(),
+        }
+        canonical = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read(self, key):
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+
+        if entry is not None and self.ttl is not None and time.time() - entry["created_at"] > self.ttl:
+            os.remove(path)
+            entry = None
+
+        if entry is None:
+            self.stats["misses"] += 1
+            if self.mode == "replay":
+                raise CacheMissError(f"No cached response for request {key[:12]} in {self.cache_dir}")
+            return None
+
+        self.stats["hits"] += 1
+        # The file's modification time doubles as its last-access time for LRU eviction
+        os.utime(path)
+        return entry["response"]
+
+    def _write(self, key, response):
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Write to a temporary file first so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"created_at": time.time(), "response": response}, f, default=str)
+        os.replace(tmp_path, self._path(key))
+
+        self._evict()
+
+    def _evict(self):
+        entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")]
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+
+        for entry in sorted(entries, key=lambda e: e.stat().st_mtime)[:excess]:
+            try:
+                os.remove(entry.path)
+                self.stats["evictions"] += 1
+            except OSError:
+                pass
+
+
+def cache_from_env(model=None):
+    """
+    Wrap a model in a CachedModel when RESPONSE_CACHE is set, otherwise return it unchanged.
+
+    Usage:
+        agent = Agent(model=cache_from_env(model))
+        evaluator = OutputEvaluator(model=cache_from_env(), rubric="...")
+
+    Args:
+        model: Model to wrap; None means the Strands default BedrockModel
+    """
+    mode = os.getenv("RESPONSE_CACHE", "").strip().lower()
+    if not mode:
+        return model
+
+    return CachedModel(
+        model if model is not None else BedrockModel(),
+        mode=mode,
+        cache_dir=os.getenv("RESPONSE_CACHE_DIR", ".response-cache"),
+        ttl=float(os.getenv("RESPONSE_CACHE_TTL", str(7 * 24 * 3600))),
+        max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000")),
+    )
+
+
+def _normalize_messages(messages):
+    """
+    Replace generated tool use ids with stable positional ids so equal conversations hash equally.
+    """
+    messages = copy.deepcopy(messages)
+    ids = {}
+
+    for message in messages:
+        for block in message.get("content", []):
+            for kind in ("toolUse", "toolResult"):
+                if kind in block and "toolUseId" in block[kind]:
+                    original = block[kind]["toolUseId"]
+                    block[kind]["toolUseId"] = ids.setdefault(original, f"tool-{len(ids)}")
+
+    return messages
@@ -0,0 +1,254 @@
+"""
+Semantic response cache for FAQ-style agents.
+
+Assistants like the N26 agent receive the same few questions over and over
+("What are the benefits of the metal account?", "How much does Smart cost?"),
+phrased slightly differently each time. `SemanticCache` embeds each question
+with a small local embedding (no model call), finds the most similar cached
+question in an in-memory index and reuses its answer when the similarity
+is above a threshold.
+
+Entries expire after a TTL and the least recently used entries are evicted
+once the cache is full. `CachedAgent` puts the cache in front of an Agent;
+only questions without earlier conversation context are served from it.
+
+Usage:
+    agent = CachedAgent(Agent(system_prompt="You are the helpful N26 assistant."), stateless=True)
+    result = agent("What are the benefits of the metal account?")   # model call
+    result = agent("what benefits does the Metal account have")     # served from the cache
+    print(agent.cache.stats())
+
+Tuning with environment variables (used by `semantic_cache_from_env`):
+    SEMANTIC_CACHE=1                     Enable the cache
+    SEMANTIC_CACHE_THRESHOLD=0.8         Minimum cosine similarity for a hit
+    SEMANTIC_CACHE_TTL=3600              Entry lifetime in seconds
+    SEMANTIC_CACHE_MAX_ENTRIES=1000      Entries kept before the least recently used is evicted
+"""
+
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from strands.agent import AgentResult
+from strands.telemetry.metrics import EventLoopMetrics
+
+from shared.agent_pool import reset_agent
+
+# Words that carry no meaning for matching FAQ questions
+STOPWORDS = frozenset(
+    "a an and are can could do does for how i is it me my of on or please the there to what when where which "
+    "who why will with would you your".split()
+)
+
+
+def hashed_embedding(text, dimensions=1024):
+    """
+    Embed text locally as a sparse, L2-normalized bag of words and character trigrams.
+
+    Words and trigrams are hashed into `dimensions` buckets (the hashing trick), so
+    no vocabulary or model is needed. Trigrams make the match tolerant to plurals
+    and small typos ("account" vs "accounts").
+
+    Args:
+        text: Text to embed
+        dimensions: Number of hash buckets
+
+    Returns:
+        dict: Bucket index -> weight, with unit length
+    """
+    vector = {}
+    words = [word for word in re.findall(r"[a-z0-9]+", text.lower()) if word not in STOPWORDS]
+
+    for word in words:
+        features = [(word, 1.0)]
+        padded = f"#{word}#"
+        features += [(padded[i:i + 3], 0.5) for i in range(len(padded) - 2)]
+        for feature, weight in features:
+            # crc32 is stable across processes, unlike hash()
+            bucket = zlib.crc32(feature.encode("utf-8")) % dimensions
+            vector[bucket] = vector.get(bucket, 0.0) + weight
+
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {bucket: weight / norm for bucket, weight in vector.items()} if norm else {}
+
+
+def cosine_similarity(a, b):
+    """Dot product of two unit-length sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(bucket, 0.0) for bucket, weight in a.items())
+
+
+class SemanticCache:
+    """
+    In-memory vector index of question -> answer with TTL and LRU eviction.
+    """
+
+    def __init__(self, embed=hashed_embedding, threshold=0.8, ttl=3600, max_entries=1000):
+        """
+        Args:
+            embed: Function mapping text to a unit-length sparse vector (dict)
+            threshold: Minimum cosine similarity for a lookup to count as a hit
+            ttl: Seconds an entry stays valid (None keeps entries until evicted)
+            max_entries: Entries kept before the least recently used is evicted
+        """
+        self.embed = embed
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def lookup(self, question):
+        """
+        Return the cached answer for the most similar question, or None.
+        """
+        key = _normalize(question)
+        vector = self.embed(question)
+        now = time.monotonic()
+
+        with self._lock:
+            self._expire(now)
+
+            # Exact (normalized) repeats skip the similarity scan
+            entry = self._entries.get(key)
+            score = 1.0 if entry is not None else 0.0
+            if entry is None:
+                for candidate_key, candidate in self._entries.items():
+                    candidate_score = cosine_similarity(vector, candidate["vector"])
+                    if candidate_score > score:
+                        key, entry, score = candidate_key, candidate, candidate_score
+
+            if entry is None or score < self.threshold:
+                self._stats["misses"] += 1
+                return None
+
+            self._stats["hits"] += 1
+            self._entries.move_to_end(key)
+            return entry["answer"]
+
+    def store(self, question, answer):
+        """
+        Cache an answer, evicting the least recently used entry when full.
+        """
+        key = _normalize(question)
+        entry = {
+            "question": question,
+            "vector": self.embed(question),
+            "answer": answer,
+            "expires_at": time.monotonic() + self.ttl if self.ttl is not None else None,
+        }
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Return hit/miss/eviction counters, the hit rate and the number of entries.
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            }
+
+    def _expire(self, now):
+        expired = [key for key, entry in self._entries.items() if entry["expires_at"] is not None and entry["expires_at"] <= now]
+        for key in expired:
+            del self._entries[key]
+        self._stats["expirations"] += len(expired)
+
+
+class CachedAgent:
+    """
+    Serve repeated questions to an Agent from a SemanticCache.
+
+    The cache is only used for questions asked without earlier conversation
+    context: a follow-up ("and how much does it cost?") is neither looked up,
+    so it never gets an unrelated context-free answer, nor stored, so its
+    answer is never reused for another conversation. Cache hits are appended
+    to the agent's history like a model answer.
+
+    A long-lived agent therefore only uses the cache for its first question.
+    For an agent serving independent requests (one question each, as FAQ
+    assistants and single-turn evaluations do) pass `stateless=True`: the
+    wrapper resets the agent's conversation and state before every call, so
+    every request is context-free and can be served from the cache.
+    """
+
+    def __init__(self, agent, cache=None, stateless=False):
+        """
+        Args:
+            agent: The Agent answering cache misses
+            cache: SemanticCache to use (a default one is created if None)
+            stateless: Reset the agent's conversation before every call (one request per call)
+        """
+        self.agent = agent
+        self.cache = cache if cache is not None else SemanticCache()
+        self.stateless = stateless
+
+    def __getattr__(self, name):
+        # messages, tool_names, event_loop_metrics, ... come from the wrapped agent
+        agent = self.__dict__.get("agent")
+        if agent is None:
+            raise AttributeError(name)
+        return getattr(agent, name)
+
+    def __call__(self, prompt, **kwargs):
+        if self.stateless:
+            reset_agent(self.agent)
+        if not isinstance(prompt, str) or self.agent.messages:
+            return self.agent(prompt, **kwargs)
+
+        answer = self.cache.lookup(prompt)
+        if answer is not None:
+            message = {"role": "assistant", "content": [{"text": answer}]}
+            self.agent.messages.append({"role": "user", "content": [{"text": prompt}]})
+            self.agent.messages.append(message)
+            return AgentResult("end_turn", message, EventLoopMetrics(), {})
+
+        result = self.agent(prompt, **kwargs)
+        if result.stop_reason == "end_turn":
+            self.cache.store(prompt, str(result).strip())
+        return result
+
+
+def semantic_cache_from_env(agent, stateless=False):
+    """
+    Wrap an Agent in a CachedAgent when SEMANTIC_CACHE is set, otherwise return it unchanged.
+
+    Args:
+        agent: The Agent to put behind the cache
+        stateless: Every call is an independent request (see CachedAgent)
+    """
+    setting = os.getenv("SEMANTIC_CACHE", "").strip().lower()
+    if not setting or setting in ("0", "false", "no"):
+        return agent
+
+    ttl = float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+    cache = SemanticCache(
+        threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.8")),
+        ttl=ttl if ttl > 0 else None,
+        max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1000")),
+    )
+    return CachedAgent(agent, cache, stateless=stateless)
+
+
+def _normalize(text):
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
@@ -0,0 +1,343 @@
+"""
+In-process LRU cache of hot sessions in front of a session manager.
+
+An API that builds a new Agent for every request restores the session from
+storage every time (files, S3, SQLite or AgentCore Memory), although most
+requests belong to a few active conversations. `SessionCache` keeps the
+session, agent state and messages of recently active sessions in memory:
+
+- `cache.session_manager(session_id, factory)` returns a session manager for
+  the request. On a hit the session is restored from memory without touching
+  storage; on a miss `factory(session_id)` builds the real session manager
+  (e.g. FileSessionManager or AgentCoreMemorySessionManager, which are also
+  session repositories), which is kept with the entry as backing repository
+- every write goes to the backing repository first and then to the cache
+  (write-through), so the cache never holds data that is not stored
+- entries are evicted least recently used first when there are more than
+  `max_sessions` or they take more than `max_bytes`, and when they have been
+  idle for `idle_ttl` seconds
+- with several worker processes, an `invalidator` shared by the processes
+  records a version per session: every write stamps a new version and a hit
+  whose version changed is reloaded. `FileInvalidator` keeps the versions in
+  a directory; anything with touch(session_id) and version(session_id), e.g.
+  backed by Redis, works across hosts
+
+Records are cached as JSON strings, so callers never share (and mutate)
+cached objects and the size of an entry is known.
+
+Only the session repository is cached: hooks a backing manager registers
+beyond persistence (such as AgentCore long-term memory retrieval) are not
+installed on the cached manager.
+
+Usage:
+    session_cache = SessionCache(max_sessions=1000, idle_ttl=900, invalidator=FileInvalidator("/tmp/session-versions"))
+
+    def handle_request(session_id, prompt):
+        session_manager = session_cache.session_manager(
+            session_id, lambda sid: FileSessionManager(session_id=sid, storage_dir="./agent-session")
+        )
+        return Agent(session_manager=session_manager)(prompt)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from strands.session.repository_session_manager import RepositorySessionManager
+from strands.session.session_repository import SessionRepository
+from strands.types.session import Session, SessionAgent, SessionMessage
+
+logger = logging.getLogger(__name__)
+
+
+class SessionCache:
+    """
+    LRU cache of session data, shared by the session managers of all requests in a process.
+    """
+
+    def __init__(self, max_sessions=1000, max_bytes=256 * 1024 * 1024, idle_ttl=1800.0, invalidator=None):
+        """
+        Args:
+            max_sessions: Sessions kept in memory
+            max_bytes: Approximate memory of the cached records
+            idle_ttl: Seconds after which an unused session is evicted
+            invalidator: Shared version store for multi-process setups (None for a single process)
+        """
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self.invalidator = invalidator
+        self.bytes = 0
+        self.counters = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def session_manager(self, session_id, factory, **kwargs):
+        """
+        Session manager for one request, restoring from the cache when the session is in it.
+
+        Args:
+            session_id: ID for the session
+            factory: Callable (session_id) -> SessionRepository of the session, e.g. a FileSessionManager,
+                used on a miss to load the session and to write through
+            **kwargs: Passed to RepositorySessionManager
+
+        Returns:
+            RepositorySessionManager: Manager reading from the cache and writing through it
+        """
+        entry = self._get(session_id)
+        if entry is None:
+            entry = _Entry(session_id, factory(session_id))
+            if self.invalidator is not None:
+                entry.version = self.invalidator.version(session_id)
+            with self._lock:
+                self._entries[session_id] = entry
+                self._evict()
+        return RepositorySessionManager(session_id=session_id, session_repository=CachedSessionRepository(self, entry), **kwargs)
+
+    def invalidate(self, session_id):
+        """Drop a session from this process's cache."""
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is not None:
+                self.bytes -= entry.bytes
+
+    def stats(self):
+        """Hit rate, evictions and memory of the cache."""
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                **self.counters,
+                "hit_rate": self.counters["hits"] / lookups if lookups else 0.0,
+                "sessions": len(self._entries),
+                "bytes": self.bytes,
+            }
+
+    def _get(self, session_id):
+        with self._lock:
+            self._evict()
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+
+        # Outside the lock: with a shared invalidator this reads a file or a remote store
+        if self.invalidator is not None and self.invalidator.version(session_id) != entry.version:
+            logger.debug("session_id=<%s> | session was written by another process, reloading", session_id)
+            with self._lock:
+                self.counters["invalidations"] += 1
+                self.counters["misses"] += 1
+                if self._entries.get(session_id) is entry:
+                    self.invalidate(session_id)
+            return None
+
+        with self._lock:
+            self.counters["hits"] += 1
+            entry.last_used = time.monotonic()
+            if session_id in self._entries:
+                self._entries.move_to_end(session_id)
+        return entry
+
+    def _resize(self, entry, delta):
+        """Account for a change of an entry's size and mark it as recently used."""
+        with self._lock:
+            entry.bytes += delta
+            entry.last_used = time.monotonic()
+            if self._entries.get(entry.session_id) is entry:
+                self.bytes += delta
+                self._entries.move_to_end(entry.session_id)
+                self._evict()
+
+    def _written(self, entry, delta):
+        """Account for a write through an entry, stamping a new version of the session for other processes."""
+        self._resize(entry, delta)
+        if self.invalidator is not None:
+            entry.version = self.invalidator.touch(entry.session_id)
+
+    def _evict(self):
+        idle_before = time.monotonic() - self.idle_ttl
+        while self._entries:
+            session_id, oldest = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_sessions and self.bytes <= self.max_bytes and oldest.last_used >= idle_before:
+                break
+            del self._entries[session_id]
+            self.bytes -= oldest.bytes
+            self.counters["evictions"] += 1
+
+
+class _Entry:
+    """Cached records of one session, as JSON strings, and the repository they are written through to."""
+
+    def __init__(self, session_id, repository):
+        self.session_id = session_id
+        self.repository = repository
+        # "session", ("agent", agent_id) or ("multi_agent", id) -> json
+        self.records = {}
+        # agent_id -> {"offset": first cached message id, "records": [json]}
+        self.messages = {}
+        self.bytes = 0
+        self.version = None
+        self.last_used = time.monotonic()
+
+
+class CachedSessionRepository(SessionRepository):
+    """
+    SessionRepository serving one cached session and writing through to the session's backing repository.
+    """
+
+    def __init__(self, cache, entry):
+        self.cache = cache
+        self.entry = entry
+        self.repository = entry.repository
+
+    def create_session(self, session, **kwargs):
+        session = self.repository.create_session(session, **kwargs)
+        self._set("session", session.to_dict())
+        return session
+
+    def read_session(self, session_id, **kwargs):
+        return self._get("session", lambda: self.repository.read_session(session_id, **kwargs), Session.from_dict)
+
+    def delete_session(self, session_id, **kwargs):
+        self.repository.delete_session(session_id, **kwargs)
+        self.cache.invalidate(session_id)
+        if self.cache.invalidator is not None:
+            self.cache.invalidator.touch(session_id)
+
+    def create_agent(self, session_id, session_agent, **kwargs):
+        self.repository.create_agent(session_id, session_agent, **kwargs)
+        self._set(("agent", session_agent.agent_id), session_agent.to_dict())
+        self._drop_messages(session_agent.agent_id)
+        self.entry.messages[session_agent.agent_id] = {"offset": 0, "records": []}
+
+    def read_agent(self, session_id, agent_id, **kwargs):
+        return self._get(
+            ("agent", agent_id), lambda: self.repository.read_agent(session_id, agent_id, **kwargs), SessionAgent.from_dict
+        )
+
+    def update_agent(self, session_id, session_agent, **kwargs):
+        self.repository.update_agent(session_id, session_agent, **kwargs)
+        self._set(("agent", session_agent.agent_id), session_agent.to_dict())
+
+    def create_message(self, session_id, agent_id, session_message, **kwargs):
+        self.repository.create_message(session_id, agent_id, session_message, **kwargs)
+        cached = self.entry.messages.get(agent_id)
+        if cached is not None and session_message.message_id == cached["offset"] + len(cached["records"]):
+            record = json.dumps(session_message.to_dict())
+            cached["records"].append(record)
+            self.cache._written(self.entry, len(record))
+        else:
+            # Not the next message of the cached list: reload the list on the next read
+            self._drop_messages(agent_id)
+            self.cache._written(self.entry, 0)
+
+    def read_message(self, session_id, agent_id, message_id, **kwargs):
+        cached = self.entry.messages.get(agent_id)
+        if cached is not None and 0 <= message_id - cached["offset"] < len(cached["records"]):
+            return SessionMessage.from_dict(json.loads(cached["records"][message_id - cached["offset"]]))
+        return self.repository.read_message(session_id, agent_id, message_id, **kwargs)
+
+    def update_message(self, session_id, agent_id, session_message, **kwargs):
+        self.repository.update_message(session_id, agent_id, session_message, **kwargs)
+        cached = self.entry.messages.get(agent_id)
+        index = session_message.message_id - cached["offset"] if cached is not None else -1
+        delta = 0
+        if cached is not None and 0 <= index < len(cached["records"]):
+            record = json.dumps(session_message.to_dict())
+            delta = len(record) - len(cached["records"][index])
+            cached["records"][index] = record
+        self.cache._written(self.entry, delta)
+
+    def list_messages(self, session_id, agent_id, limit=None, offset=0, **kwargs):
+        cached = self.entry.messages.get(agent_id)
+        if cached is None or offset < cached["offset"]:
+            session_messages = self.repository.list_messages(session_id, agent_id, offset=offset, **kwargs)
+            self._drop_messages(agent_id)
+            cached = {"offset": offset, "records": [json.dumps(message.to_dict()) for message in session_messages]}
+            self.entry.messages[agent_id] = cached
+            self.cache._resize(self.entry, sum(len(record) for record in cached["records"]))
+            # The loaded objects are not shared with the cache, which holds their JSON
+            return session_messages if limit is None else session_messages[:limit]
+
+        start = offset - cached["offset"]
+        records = cached["records"][start:] if limit is None else cached["records"][start:start + limit]
+        return [SessionMessage.from_dict(json.loads(record)) for record in records]
+
+    def create_multi_agent(self, session_id, multi_agent, **kwargs):
+        self.repository.create_multi_agent(session_id, multi_agent, **kwargs)
+        self._set(("multi_agent", multi_agent.id), multi_agent.serialize_state())
+
+    def read_multi_agent(self, session_id, multi_agent_id, **kwargs):
+        return self._get(
+            ("multi_agent", multi_agent_id),
+            lambda: self.repository.read_multi_agent(session_id, multi_agent_id, **kwargs),
+            lambda record: record,
+        )
+
+    def update_multi_agent(self, session_id, multi_agent, **kwargs):
+        self.repository.update_multi_agent(session_id, multi_agent, **kwargs)
+        self._set(("multi_agent", multi_agent.id), multi_agent.serialize_state())
+
+    def _get(self, key, load, from_dict):
+        """A cached record as a new object, loaded from the backing repository on first use (None if missing)."""
+        record = self.entry.records.get(key)
+        if record is not None:
+            return from_dict(json.loads(record))
+        value = load()
+        if value is not None:
+            self._store(key, value if isinstance(value, dict) else value.to_dict())
+        return value
+
+    def _set(self, key, value):
+        self._store(key, value)
+        self.cache._written(self.entry, 0)
+
+    def _store(self, key, value):
+        record = json.dumps(value)
+        previous = self.entry.records.get(key)
+        self.entry.records[key] = record
+        self.cache._resize(self.entry, len(record) - (len(previous) if previous else 0))
+        return record
+
+    def _drop_messages(self, agent_id):
+        cached = self.entry.messages.pop(agent_id, None)
+        if cached:
+            self.cache._resize(self.entry, -sum(len(record) for record in cached["records"]))
+
+
+class FileInvalidator:
+    """
+    Session versions in a directory shared by the worker processes of one host.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def touch(self, session_id):
+        """Record a new version of a session and return it."""
+        version = uuid.uuid4().hex
+        # Versions have a fixed size and are overwritten in place: a torn read only causes an extra reload
+        fd = os.open(self._path(session_id), os.O_WRONLY | os.O_CREAT, 0o600)
+        try:
+            os.pwrite(fd, version.encode(), 0)
+        finally:
+            os.close(fd)
+        return version
+
+    def version(self, session_id):
+        """Current version of a session, or None if it was never written."""
+        try:
+            with open(self._path(session_id)) as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _path(self, session_id):
+        return os.path.join(self.directory, hashlib.sha1(session_id.encode()).hexdigest())
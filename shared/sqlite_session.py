@@ -0,0 +1,408 @@
+"""
+Session manager storing many sessions in sharded SQLite files.
+
+`FileSessionManager` keeps a directory per session and a file per message in
+one flat storage directory. With tens of thousands of sessions every restore
+lists a directory, every turn creates files, and expiring old sessions means
+walking the whole tree. `SQLiteSessionManager` keeps sessions, agents and
+messages as rows instead:
+
+- sessions are spread over `shards` SQLite files by a hash of the session id,
+  so writers from several worker processes contend on different files (each
+  SQLite file has a single writer at a time); with shards=1 it is one file
+- files use WAL mode, so readers never wait for writers, and a busy timeout
+  so concurrent writers from other processes queue instead of failing
+- `lock()` is a per-session lease stored in the database, so two workers
+  (processes or threads) never run the same session at once; a heartbeat
+  thread renews it every ttl/3 seconds while it is held, so a crashed
+  worker's lease expires after `ttl` seconds but a slow or idle one keeps
+  it, and writes made while holding it fail if another worker took it over
+- `expire_sessions()` deletes sessions idle for longer than a cutoff in
+  batches, skipping locked sessions, which is one indexed query per shard
+
+Usage:
+    session_manager = SQLiteSessionManager(session_id="user-1", db_path="./agent-sessions", shards=8)
+    with session_manager.lock():
+        agent = Agent(session_manager=session_manager)
+        agent("...")
+
+    # Bulk expiry, e.g. from cron
+    python shared/sqlite_session.py ./agent-sessions --shards 8 --max-idle-days 30
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+
+from strands.session.repository_session_manager import RepositorySessionManager
+from strands.session.session_repository import SessionRepository
+from strands.types.exceptions import SessionException
+from strands.types.session import Session, SessionAgent, SessionMessage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+CREATE TABLE IF NOT EXISTS agents (
+    session_id TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, agent_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    message_id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, agent_id, message_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS multi_agents (
+    session_id TEXT NOT NULL,
+    multi_agent_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, multi_agent_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS locks (
+    session_id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Connections are per thread and per process (a connection must not cross a fork)
+_local = threading.local()
+
+
+def shard_path(db_path, shards, session_id):
+    """SQLite file holding a session: db_path itself, or one of the shard files in the db_path directory."""
+    if shards <= 1:
+        return db_path
+    return os.path.join(db_path, f"shard-{zlib.crc32(session_id.encode()) % shards:03d}.db")
+
+
+def connect(path, busy_timeout=30.0):
+    """Open (or reuse) this thread's connection to a session database, creating the schema."""
+    if getattr(_local, "pid", None) != os.getpid():
+        _local.pid = os.getpid()
+        _local.connections = {}
+    db = _local.connections.get(path)
+    if db is None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        db = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(SCHEMA)
+        _local.connections[path] = db
+    return db
+
+
+class SQLiteSessionManager(RepositorySessionManager, SessionRepository):
+    """
+    Session manager and repository keeping sessions in sharded SQLite files.
+    """
+
+    def __init__(self, session_id, db_path="./agent-sessions.db", shards=1, busy_timeout=30.0, **kwargs):
+        """
+        Args:
+            session_id: ID for the session
+            db_path: SQLite file, or directory of shard files when shards > 1
+            shards: Number of SQLite files sessions are spread over
+            busy_timeout: Seconds a write waits for another process's write transaction
+        """
+        self.db_path = db_path
+        self.shards = shards
+        self.busy_timeout = busy_timeout
+        self._batch = None
+        # (owner, ttl) while lock() holds this session's lease
+        self._lease = None
+        super().__init__(session_id=session_id, session_repository=self, **kwargs)
+
+    @contextmanager
+    def lock(self, timeout=30.0, ttl=300.0):
+        """
+        Hold the lease of this session, waiting up to `timeout` seconds for another worker to release it.
+
+        The lease is renewed in the background while the block runs, and by every write to the session.
+
+        Args:
+            timeout: Seconds to wait for the lease
+            ttl: Seconds after which a lease that was not renewed (crashed worker) can be taken over
+
+        Raises:
+            SessionException: If the lease is still held by another worker after `timeout`; writes in
+                the block raise it if the lease was lost to another worker
+        """
+        owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        db = self._db(self.session_id)
+        deadline = time.monotonic() + timeout
+        delay = 0.005
+        while True:
+            now = time.time()
+            cursor = db.execute(
+                "INSERT INTO locks (session_id, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE locks.expires_at < ?",
+                (self.session_id, owner, now + ttl, now),
+            )
+            if cursor.rowcount == 1:
+                break
+            if time.monotonic() >= deadline:
+                raise SessionException(f"Session {self.session_id} is locked by another worker")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+
+        self._lease = (owner, ttl)
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._renew_lease, args=(owner, ttl, stop), name=f"session-lease-{self.session_id}", daemon=True
+        )
+        heartbeat.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            heartbeat.join()
+            self._lease = None
+            db.execute("DELETE FROM locks WHERE session_id = ? AND owner = ?", (self.session_id, owner))
+
+    @contextmanager
+    def batch(self, session_id=None):
+        """Group the writes to the shard of session_id into a single transaction, e.g. for bulk imports."""
+        path = shard_path(self.db_path, self.shards, session_id or self.session_id)
+        db = connect(path, self.busy_timeout)
+        db.execute("BEGIN IMMEDIATE")
+        self._batch = (path, db)
+        try:
+            yield
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            self._batch = None
+
+    def create_session(self, session, **kwargs):
+        # OR IGNORE: another worker may have created the session between our read and this write
+        with self._write(session.session_id) as db:
+            db.execute(
+                "INSERT OR IGNORE INTO sessions (session_id, data, updated_at) VALUES (?, ?, ?)",
+                (session.session_id, json.dumps(session.to_dict()), time.time()),
+            )
+        return session
+
+    def read_session(self, session_id, **kwargs):
+        row = self._db(session_id).execute("SELECT data FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return Session.from_dict(json.loads(row[0])) if row else None
+
+    def delete_session(self, session_id, **kwargs):
+        with self._write(session_id) as db:
+            if db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount == 0:
+                raise SessionException(f"Session {session_id} does not exist")
+            _delete_session_rows(db, [session_id])
+
+    def create_agent(self, session_id, session_agent, **kwargs):
+        # OR IGNORE: two workers starting the same new session both find no agent and create it
+        with self._write(session_id) as db:
+            db.execute(
+                "INSERT OR IGNORE INTO agents (session_id, agent_id, data) VALUES (?, ?, ?)",
+                (session_id, session_agent.agent_id, json.dumps(session_agent.to_dict())),
+            )
+            _touch(db, session_id)
+
+    def read_agent(self, session_id, agent_id, **kwargs):
+        row = self._db(session_id).execute(
+            "SELECT data FROM agents WHERE session_id = ? AND agent_id = ?", (session_id, agent_id)
+        ).fetchone()
+        return SessionAgent.from_dict(json.loads(row[0])) if row else None
+
+    def update_agent(self, session_id, session_agent, **kwargs):
+        previous = self.read_agent(session_id, session_agent.agent_id)
+        if previous is None:
+            raise SessionException(f"Agent {session_agent.agent_id} in session {session_id} does not exist")
+        session_agent.created_at = previous.created_at
+        with self._write(session_id) as db:
+            db.execute(
+                "UPDATE agents SET data = ? WHERE session_id = ? AND agent_id = ?",
+                (json.dumps(session_agent.to_dict()), session_id, session_agent.agent_id),
+            )
+            _touch(db, session_id)
+
+    def create_message(self, session_id, agent_id, session_message, **kwargs):
+        with self._write(session_id) as db:
+            db.execute(
+                "INSERT OR REPLACE INTO messages (session_id, agent_id, message_id, data) VALUES (?, ?, ?, ?)",
+                (session_id, agent_id, session_message.message_id, json.dumps(session_message.to_dict())),
+            )
+            _touch(db, session_id)
+
+    def read_message(self, session_id, agent_id, message_id, **kwargs):
+        row = self._db(session_id).execute(
+            "SELECT data FROM messages WHERE session_id = ? AND agent_id = ? AND message_id = ?",
+            (session_id, agent_id, message_id),
+        ).fetchone()
+        return SessionMessage.from_dict(json.loads(row[0])) if row else None
+
+    def update_message(self, session_id, agent_id, session_message, **kwargs):
+        previous = self.read_message(session_id, agent_id, session_message.message_id)
+        if previous is None:
+            raise SessionException(f"Message {session_message.message_id} does not exist")
+        session_message.created_at = previous.created_at
+        self.create_message(session_id, agent_id, session_message)
+
+    def list_messages(self, session_id, agent_id, limit=None, offset=0, **kwargs):
+        rows = self._db(session_id).execute(
+            "SELECT data FROM messages WHERE session_id = ? AND agent_id = ? ORDER BY message_id LIMIT ? OFFSET ?",
+            (session_id, agent_id, -1 if limit is None else limit, offset),
+        ).fetchall()
+        return [SessionMessage.from_dict(json.loads(row[0])) for row in rows]
+
+    def create_multi_agent(self, session_id, multi_agent, **kwargs):
+        with self._write(session_id) as db:
+            db.execute(
+                "INSERT INTO multi_agents (session_id, multi_agent_id, data) VALUES (?, ?, ?)",
+                (session_id, multi_agent.id, json.dumps(multi_agent.serialize_state())),
+            )
+            _touch(db, session_id)
+
+    def read_multi_agent(self, session_id, multi_agent_id, **kwargs):
+        row = self._db(session_id).execute(
+            "SELECT data FROM multi_agents WHERE session_id = ? AND multi_agent_id = ?", (session_id, multi_agent_id)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update_multi_agent(self, session_id, multi_agent, **kwargs):
+        with self._write(session_id) as db:
+            cursor = db.execute(
+                "UPDATE multi_agents SET data = ? WHERE session_id = ? AND multi_agent_id = ?",
+                (json.dumps(multi_agent.serialize_state()), session_id, multi_agent.id),
+            )
+            if cursor.rowcount == 0:
+                raise SessionException(f"MultiAgent state {multi_agent.id} in session {session_id} does not exist")
+            _touch(db, session_id)
+
+    def _renew_lease(self, owner, ttl, stop):
+        # Runs on its own thread, so it uses its own connection
+        while not stop.wait(ttl / 3):
+            try:
+                cursor = self._db(self.session_id).execute(
+                    "UPDATE locks SET expires_at = ? WHERE session_id = ? AND owner = ?",
+                    (time.time() + ttl, self.session_id, owner),
+                )
+            except sqlite3.OperationalError:
+                # Database busy for longer than busy_timeout; try again on the next beat
+                continue
+            if cursor.rowcount == 0:
+                # Taken over by another worker; the next write notices and raises
+                return
+
+    def _check_lease(self, db, session_id):
+        """Renew the lease inside a write transaction, or fail the write if another worker took it over."""
+        lease = self._lease
+        if lease is None or session_id != self.session_id:
+            return
+        owner, ttl = lease
+        cursor = db.execute(
+            "UPDATE locks SET expires_at = ? WHERE session_id = ? AND owner = ?",
+            (time.time() + ttl, session_id, owner),
+        )
+        if cursor.rowcount == 0:
+            raise SessionException(f"Session {session_id} lock was taken over by another worker")
+
+    def _db(self, session_id):
+        return connect(shard_path(self.db_path, self.shards, session_id), self.busy_timeout)
+
+    @contextmanager
+    def _write(self, session_id):
+        path = shard_path(self.db_path, self.shards, session_id)
+        if self._batch is not None and self._batch[0] == path:
+            self._check_lease(self._batch[1], session_id)
+            yield self._batch[1]
+            return
+        db = connect(path, self.busy_timeout)
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            self._check_lease(db, session_id)
+            yield db
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+
+def _touch(db, session_id):
+    db.execute("UPDATE sessions SET updated_at = ? WHERE session_id = ?", (time.time(), session_id))
+
+
+def _delete_session_rows(db, session_ids):
+    marks = ",".join("?" * len(session_ids))
+    for table in ("agents", "messages", "multi_agents", "locks"):
+        db.execute(f"DELETE FROM {table} WHERE session_id IN ({marks})", session_ids)
+
+
+def expire_sessions(db_path, max_idle_seconds, shards=1, batch_size=500, busy_timeout=30.0):
+    """
+    Delete the sessions not written for `max_idle_seconds`, skipping sessions currently locked.
+
+    Deletes in batches of `batch_size` sessions per transaction, so live writers are only held up briefly.
+
+    Returns:
+        int: Number of sessions deleted
+    """
+    paths = [db_path] if shards <= 1 else [os.path.join(db_path, f"shard-{shard:03d}.db") for shard in range(shards)]
+    cutoff = time.time() - max_idle_seconds
+    deleted = 0
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        db = connect(path, busy_timeout)
+        while True:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                session_ids = [row[0] for row in db.execute(
+                    "SELECT session_id FROM sessions WHERE updated_at < ? AND session_id NOT IN "
+                    "(SELECT session_id FROM locks WHERE expires_at >= ?) LIMIT ?",
+                    (cutoff, time.time(), batch_size),
+                )]
+                if session_ids:
+                    db.execute(f"DELETE FROM sessions WHERE session_id IN ({','.join('?' * len(session_ids))})", session_ids)
+                    _delete_session_rows(db, session_ids)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            deleted += len(session_ids)
+            if len(session_ids) < batch_size:
+                break
+    return deleted
+
+
+def main():
+    """
+    Command line entry point: expire idle sessions.
+    """
+    parser = argparse.ArgumentParser(description="Delete sessions idle for longer than a cutoff.")
+    parser.add_argument("db_path", help="SQLite file, or directory of shard files")
+    parser.add_argument("--shards", type=int, default=1, help="Number of shard files")
+    parser.add_argument("--max-idle-days", type=float, required=True, help="Delete sessions idle for longer than this")
+    parser.add_argument("--batch-size", type=int, default=500, help="Sessions deleted per transaction")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    deleted = expire_sessions(args.db_path, args.max_idle_days * 86400, args.shards, args.batch_size)
+    print(f"Deleted {deleted} sessions in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Cold-start profiler for workshop scripts.
+
+Runs a script in a fresh interpreter with `python -X importtime` and breaks
+the startup time down per top-level package and per module. The cumulative
+time of a module includes running its top-level code, so it also covers
+module-level initialization (clients, telemetry providers, evaluators).
+
+By default only the script's top-level import statements are executed, so
+nothing calls a model. With --run the whole script is executed and the report
+also shows how much of the wall time was spent outside imports.
+
+Usage:
+    python shared/startup_profiler.py part-5-observability/solution/traces.py
+    python shared/startup_profiler.py part-6-simulators/solution/simulator_with_evaluators.py --top 25
+    python shared/startup_profiler.py part-5-observability/solution/traces.py --run
+"""
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def profile_startup(script_path, run=False):
+    """
+    Profile the startup of a script in a fresh interpreter.
+
+    Args:
+        script_path: Path to the workshop script
+        run: Execute the whole script instead of only its top-level imports
+
+    Returns:
+        dict: wall_time_s, import_time_s, per-package self times and per-module
+            (self, cumulative) times, all in seconds
+    """
+    script_path = os.path.abspath(script_path)
+    script_dir = os.path.dirname(script_path)
+
+    if run:
+        code = f"import runpy; runpy.run_path({script_path!r}, run_name='__main__')"
+    else:
+        code = _top_level_imports(script_path)
+
+    # Scripts add the repo root to sys.path themselves before importing `shared`
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, script_dir, env.get("PYTHONPATH")]))
+
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=script_dir,
+        env=env,
+        stdout=None if run else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    wall_time = time.perf_counter() - start
+
+    modules, errors = _parse_importtime(completed.stderr)
+    packages = defaultdict(float)
+    for name, (self_time, _) in modules.items():
+        packages[name.split(".")[0]] += self_time
+
+    return {
+        "wall_time_s": wall_time,
+        "import_time_s": sum(self_time for self_time, _ in modules.values()),
+        "packages": dict(packages),
+        "modules": modules,
+        "returncode": completed.returncode,
+        "stderr": errors,
+    }
+
+
+def print_report(profile, top=15):
+    """
+    Print the slowest packages and modules of a profile.
+    """
+    wall, imports = profile["wall_time_s"], profile["import_time_s"]
+
+    print("=" * 60)
+    print(f"Wall time:          {wall:8.3f}s")
+    print(f"Imports:            {imports:8.3f}s")
+    print(f"Everything else:    {max(wall - imports, 0.0):8.3f}s  (interpreter start, initialization, run)")
+    print("=" * 60)
+
+    print(f"\nTop {top} packages by import time (self time of all their modules):")
+    for name, seconds in sorted(profile["packages"].items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {seconds:8.3f}s  {100 * seconds / imports if imports else 0:5.1f}%  {name}")
+
+    print(f"\nTop {top} modules by cumulative import time (includes module-level initialization):")
+    ranked = sorted(profile["modules"].items(), key=lambda item: item[1][1], reverse=True)[:top]
+    for name, (self_time, cumulative) in ranked:
+        print(f"  {cumulative:8.3f}s  (self {self_time:.3f}s)  {name}")
+
+    if profile["returncode"]:
+        print(f"\nScript exited with code {profile['returncode']}:")
+        print(profile["stderr"])
+
+
+def _top_level_imports(script_path):
+    """
+    Return the source of the script's module-level import statements.
+    """
+    with open(script_path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=script_path)
+
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(node) for node in imports) or "pass"
+
+
+def _parse_importtime(stderr):
+    """
+    Parse `-X importtime` output into {module: (self_s, cumulative_s)}.
+
+    Lines that are not import timings are returned separately so script errors stay visible.
+    """
+    modules, other = {}, []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            other.append(line)
+            continue
+
+        fields = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdigit():
+            continue  # header line
+
+        # Times are reported in microseconds
+        modules[fields[2].strip()] = (int(fields[0]) / 1e6, int(fields[1]) / 1e6)
+
+    return modules, "\n".join(other)
+
+
+def main():
+    """
+    Command line entry point.
+    """
+    parser = argparse.ArgumentParser(description="Break down the cold start of a workshop script.")
+    parser.add_argument("script", help="Workshop script to profile")
+    parser.add_argument("--run", action="store_true", help="Execute the whole script, not only its imports")
+    parser.add_argument("--top", type=int, default=15, help="Number of packages/modules to show")
+    args = parser.parse_args()
+
+    print_report(profile_startup(args.script, run=args.run), top=args.top)
+
+
+if __name__ == "__main__":
+    main()
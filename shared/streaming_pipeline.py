@@ -0,0 +1,259 @@
+"""
+Streaming, pipelined execution of sequential agent workflows.
+
+A sequential workflow (researcher -> analyst -> writer) normally waits for
+each stage to finish and hands the whole response string to the next one.
+Here every stage streams its tokens into a bounded asyncio queue that the
+next stage reads incrementally:
+
+- A stage with `segment_chars` starts working as soon as that much upstream
+  text has arrived (cut at a paragraph or sentence boundary) and feeds the
+  remainder to the same agent as follow-up turns. Without it the stage starts
+  the moment the upstream stream ends, with no extra handoff.
+- Each stage has its own workers (one agent each), so across many topics the
+  researcher works on topic 3 while the analyst handles topic 2 and the
+  writer topic 1. A three-stage workflow then completes close to three
+  topics in the time one takes sequentially.
+- Queues are bounded, so a slow stage applies back-pressure upstream instead
+  of buffering without limit.
+
+Every result carries per-stage timings (queue wait, time to first token,
+latency) and token usage.
+
+Usage:
+    stages = [
+        Stage("researcher", lambda: Agent(system_prompt="Find key info."), "Research: {input}"),
+        Stage("analyst", lambda: Agent(system_prompt="Extract insights."), "Analyze: {input}", segment_chars=2000),
+        Stage("writer", lambda: Agent(system_prompt="Write a report."), "Write report from: {input}"),
+    ]
+    results = asyncio.run(run_pipeline(stages, ["topic 1", "topic 2"]))
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+
+from strands.handlers.callback_handler import PrintingCallbackHandler, null_callback_handler
+
+from shared.agent_pool import reset_agent
+
+# Marks the end of a token stream in a stage queue
+_END = object()
+
+
+@dataclass
+class Stage:
+    """
+    One step of a pipeline.
+
+    Attributes:
+        name: Stage name used in the timing report
+        agent_factory: Zero-argument callable returning a new Agent (called once per worker)
+        prompt: Template for the stage input, `{input}` is replaced with the upstream text
+        continuation: Template for follow-up segments when `segment_chars` is set
+        segment_chars: Start on partial upstream text once this many characters arrived (None waits for all of it)
+        concurrency: Number of workers, i.e. topics this stage processes at the same time
+    """
+
+    name: str
+    agent_factory: object
+    prompt: str = "{input}"
+    continuation: str = "Continue with this additional input:\n{input}"
+    segment_chars: int = None
+    concurrency: int = 1
+
+
+@dataclass
+class PipelineResult:
+    """
+    Output of one topic run through the pipeline.
+    """
+
+    topic: str
+    output: str = ""
+    error: str = None
+    latency_s: float = 0.0
+    stages: dict = field(default_factory=dict)
+    submitted_at: float = field(default=0.0, repr=False)
+
+
+async def run_pipeline(stages, topics, queue_size=256, on_token=None):
+    """
+    Stream many topics through the stages with stage-level concurrency.
+
+    Args:
+        stages: List of Stage, in order
+        topics: Iterable of topic strings (the input of the first stage)
+        queue_size: Maximum number of buffered chunks between two stages (per topic) and of waiting topics per stage
+        on_token: Optional callable(topic, text) receiving the last stage's tokens as they are generated
+
+    Returns:
+        list[PipelineResult]: One result per topic, in input order
+    """
+    jobs = [asyncio.Queue(maxsize=queue_size) for _ in stages]
+    agents = await asyncio.gather(*(
+        asyncio.to_thread(_build_agent, stage.agent_factory) for stage in stages for _ in range(stage.concurrency)
+    ))
+
+    workers = []
+    agent_iter = iter(agents)
+    for index, stage in enumerate(stages):
+        downstream = jobs[index + 1] if index + 1 < len(stages) else None
+        for _ in range(stage.concurrency):
+            worker = _stage_worker(stage, next(agent_iter), jobs[index], downstream, queue_size, on_token)
+            workers.append(asyncio.create_task(worker))
+
+    results = []
+    finals = []
+    try:
+        for topic in topics:
+            result = PipelineResult(topic=topic, submitted_at=time.perf_counter())
+            source = asyncio.Queue()
+            source.put_nowait(topic)
+            source.put_nowait(_END)
+            output = asyncio.get_running_loop().create_future()
+            results.append(result)
+            finals.append(output)
+            await jobs[0].put((result, source, output, result.submitted_at))
+
+        await asyncio.gather(*finals)
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    return results
+
+
+async def stream_pipeline(stages, topic, queue_size=256, on_token=None):
+    """
+    Run a single topic through the pipeline, streaming between stages.
+
+    Returns:
+        PipelineResult: The final output and per-stage timings
+    """
+    results = await run_pipeline(stages, [topic], queue_size=queue_size, on_token=on_token)
+    return results[0]
+
+
+def format_timings(result):
+    """
+    Render the per-stage timings of a PipelineResult as one line per stage.
+    """
+    lines = [f"[{result.topic}] total {result.latency_s:.2f}s" + (f" | error: {result.error}" if result.error else "")]
+    for name, timing in result.stages.items():
+        ttft = f"{timing['ttft_s']:.2f}s" if timing["ttft_s"] is not None else "-"
+        lines.append(
+            f"  {name:<12} queued {timing['wait_s']:.2f}s | input wait {timing['input_wait_s']:.2f}s"
+            f" | ttft {ttft} | latency {timing['latency_s']:.2f}s"
+            f" | segments {timing['segments']} | tokens {timing['usage'].get('totalTokens', 0)}"
+        )
+    return "\n".join(lines)
+
+
+def _build_agent(agent_factory):
+    agent = agent_factory()
+    # Stages stream tokens into queues; the default handler would print every stage interleaved
+    if isinstance(agent.callback_handler, PrintingCallbackHandler):
+        agent.callback_handler = null_callback_handler
+    return agent
+
+
+async def _stage_worker(stage, agent, jobs, downstream, queue_size, on_token):
+    while True:
+        result, upstream, output, queued_at = await jobs.get()
+        picked_up = time.perf_counter()
+        timing = {
+            "wait_s": picked_up - queued_at,
+            "input_wait_s": 0.0,
+            "ttft_s": None,
+            "latency_s": 0.0,
+            "segments": 0,
+            "usage": {},
+        }
+        result.stages[stage.name] = timing
+
+        if downstream is not None:
+            tokens = asyncio.Queue(maxsize=queue_size)
+            # Hand the job over before producing anything, so the next stage can consume while this one generates
+            await downstream.put((result, tokens, output, time.perf_counter()))
+        else:
+            tokens = None
+
+        text = []
+        started = None
+        try:
+            async for segment in _segments(upstream, stage.segment_chars):
+                if started is None:
+                    # Stage latency is measured from its first model call, not from waiting on upstream text
+                    started = time.perf_counter()
+                    timing["input_wait_s"] = started - picked_up
+                template = stage.prompt if timing["segments"] == 0 else stage.continuation
+                timing["segments"] += 1
+                async for chunk in _stream_agent(agent, template.format(input=segment), timing, started):
+                    text.append(chunk)
+                    if tokens is not None:
+                        await tokens.put(chunk)
+                    elif on_token is not None:
+                        on_token(result.topic, chunk)
+        except Exception as e:
+            result.error = result.error or f"{stage.name}: {e}"
+            if tokens is not None:
+                await tokens.put(e)
+        finally:
+            timing["latency_s"] = time.perf_counter() - started if started is not None else 0.0
+            reset_agent(agent)
+            if tokens is not None:
+                await tokens.put(_END)
+
+        if downstream is None and not output.done():
+            result.output = "".join(text)
+            result.latency_s = time.perf_counter() - result.submitted_at
+            output.set_result(result)
+
+
+async def _stream_agent(agent, prompt, timing, started):
+    async for event in agent.stream_async(prompt):
+        if "data" in event and event["data"]:
+            if timing["ttft_s"] is None:
+                timing["ttft_s"] = time.perf_counter() - started
+            yield event["data"]
+        elif "event" in event and "metadata" in event["event"]:
+            for key, value in event["event"]["metadata"].get("usage", {}).items():
+                timing["usage"][key] = timing["usage"].get(key, 0) + value
+
+
+async def _segments(upstream, segment_chars):
+    """
+    Group upstream chunks into segments at paragraph or sentence boundaries.
+
+    Yields everything at once when segment_chars is None.
+    """
+    buffer = ""
+    while True:
+        chunk = await upstream.get()
+        if chunk is _END:
+            break
+        if isinstance(chunk, Exception):
+            raise RuntimeError("upstream stage failed") from chunk
+
+        buffer += chunk
+        if segment_chars and len(buffer) >= segment_chars:
+            cut = _boundary(buffer, segment_chars)
+            if cut:
+                yield buffer[:cut]
+                buffer = buffer[cut:]
+
+    if buffer.strip():
+        yield buffer
+
+
+def _boundary(text, minimum):
+    """Return the index just after the last paragraph (or else sentence) break past `minimum`, or 0."""
+    for pattern in (r"\n\s*\n", r"[.!?]\s"):
+        matches = [m.end() for m in re.finditer(pattern, text) if m.end() >= minimum]
+        if matches:
+            return matches[-1]
+    return 0
+
@@ -0,0 +1,216 @@
+"""
+In-process stand-in for the AgentCore Memory data plane API.
+
+`StubMemoryClient` implements the short-term memory calls of the boto3
+`bedrock-agentcore` client that `AgentCoreMemorySessionManager` and
+`MemoryClient` use (create_event, list_events, get_event, delete_event,
+retrieve_memory_records), keeping the events in memory. Plugged in as the
+data plane client of a session manager, agents with AgentCore Memory run
+offline, and the latency and throttling of the service can be simulated to
+measure what remote memory adds to a turn and how writes are batched.
+
+Behaves like the service where the session manager depends on it:
+- list_events returns the newest events first, at most 100 per page,
+  with a nextToken, and filters on branch name and event metadata
+- create_event with a clientToken that was already used returns the
+  original event instead of storing a duplicate
+- errors are botocore ClientErrors with the service's error codes
+  (ThrottledException for injected failures, ValidationException,
+  ResourceNotFoundException), so retries and error handling run unchanged
+
+Long-term memory is not simulated: retrieve_memory_records finds nothing.
+
+Usage:
+    session_manager = AgentCoreMemorySessionManager(
+        agentcore_memory_config=config,
+        region_name="eu-central-1",
+        boto_session=DataPlaneSession(StubMemoryClient(latency=0.05)),    # from shared/async_memory_writer.py
+    )
+
+Switch the AgentCore Memory agent to the stub with environment variables:
+    STUB_MEMORY=1                       Keep AgentCore Memory events in process
+    STUB_MEMORY_LATENCY=0.05            Seconds added to every call
+    STUB_MEMORY_FAILURE_RATE=0.1        Fraction of calls that fail with ThrottledException
+    STUB_MEMORY_SEED=0                  Seed for failure injection
+"""
+
+import copy
+import os
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from botocore.exceptions import ClientError
+
+MAX_PAYLOAD_ITEMS = 100
+MAX_RESULTS = 100
+
+
+class StubMemoryClient:
+    """
+    Thread-safe in-memory implementation of the AgentCore Memory event API.
+    """
+
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=0):
+        """
+        Args:
+            latency: Seconds every call takes
+            failure_rate: Fraction of calls failing with ThrottledException before doing anything
+            seed: Seed for failure injection
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.stats = {"calls": {}, "failures": 0, "events": 0, "payload_items": 0}
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # (memory_id, actor_id, session_id) -> list of events, in the order they were stored
+        self._sessions = {}
+        self._client_tokens = {}
+        self._sequence = 0
+
+    def create_event(self, memoryId, actorId, eventTimestamp, payload, sessionId=None, branch=None,
+                     clientToken=None, metadata=None, **kwargs):
+        self._call("CreateEvent")
+        if not payload or len(payload) > MAX_PAYLOAD_ITEMS:
+            raise _error("ValidationException", f"payload must have 1 to {MAX_PAYLOAD_ITEMS} items", "CreateEvent")
+
+        with self._lock:
+            if clientToken is not None and clientToken in self._client_tokens:
+                return {"event": copy.deepcopy(self._client_tokens[clientToken])}
+
+            self._sequence += 1
+            timestamp = _as_datetime(eventTimestamp)
+            event = {
+                "memoryId": memoryId,
+                "actorId": actorId,
+                "sessionId": sessionId,
+                "eventId": f"{int(timestamp.timestamp() * 1000):019d}#{uuid.uuid4().hex[:8]}",
+                "eventTimestamp": timestamp,
+                "payload": copy.deepcopy(payload),
+                "branch": copy.deepcopy(branch) if branch else {"name": "main"},
+                "_sequence": self._sequence,
+            }
+            if metadata:
+                event["metadata"] = copy.deepcopy(metadata)
+            self._sessions.setdefault((memoryId, actorId, sessionId), []).append(event)
+            if clientToken is not None:
+                self._client_tokens[clientToken] = event
+            self.stats["events"] += 1
+            self.stats["payload_items"] += len(payload)
+            return {"event": _public(event)}
+
+    def list_events(self, memoryId, actorId, sessionId, includePayloads=True, filter=None, maxResults=MAX_RESULTS,
+                    nextToken=None, **kwargs):
+        self._call("ListEvents")
+        start = int(nextToken) if nextToken else 0
+        page_size = min(maxResults, MAX_RESULTS)
+
+        with self._lock:
+            events = [event for event in self._sessions.get((memoryId, actorId, sessionId), [])
+                      if _matches(event, filter or {})]
+            # Newest first, like the service
+            events.sort(key=lambda event: (event["eventTimestamp"], event["_sequence"]), reverse=True)
+            page = [_public(event, includePayloads) for event in events[start:start + page_size]]
+
+        response = {"events": page}
+        if start + page_size < len(events):
+            response["nextToken"] = str(start + page_size)
+        return response
+
+    def get_event(self, memoryId, actorId, sessionId, eventId, **kwargs):
+        self._call("GetEvent")
+        with self._lock:
+            for event in self._sessions.get((memoryId, actorId, sessionId), []):
+                if event["eventId"] == eventId:
+                    return {"event": _public(event)}
+        raise _error("ResourceNotFoundException", f"Event {eventId} not found", "GetEvent")
+
+    def delete_event(self, memoryId, actorId, sessionId, eventId, **kwargs):
+        self._call("DeleteEvent")
+        with self._lock:
+            events = self._sessions.get((memoryId, actorId, sessionId), [])
+            for index, event in enumerate(events):
+                if event["eventId"] == eventId:
+                    del events[index]
+                    return {"eventId": eventId}
+        raise _error("ResourceNotFoundException", f"Event {eventId} not found", "DeleteEvent")
+
+    def retrieve_memory_records(self, memoryId, searchCriteria, **kwargs):
+        self._call("RetrieveMemoryRecords")
+        return {"memoryRecordSummaries": []}
+
+    def event_count(self, memory_id=None, actor_id=None, session_id=None):
+        """Number of stored events, optionally only those of one memory, actor or session."""
+        with self._lock:
+            return sum(
+                len(events) for (memory, actor, session), events in self._sessions.items()
+                if memory_id in (None, memory) and actor_id in (None, actor) and session_id in (None, session)
+            )
+
+    def _call(self, operation):
+        """Count the call, wait the simulated latency and inject failures."""
+        with self._lock:
+            self.stats["calls"][operation] = self.stats["calls"].get(operation, 0) + 1
+            fail = self._random.random() < self.failure_rate
+            if fail:
+                self.stats["failures"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise _error("ThrottledException", "Stub memory injected throttling", operation)
+
+
+def memory_client_from_env():
+    """
+    Return a StubMemoryClient when STUB_MEMORY is set, otherwise None (use AgentCore Memory).
+
+    Usage:
+        stub = memory_client_from_env()
+        boto_session = DataPlaneSession(stub) if stub is not None else None
+    """
+    setting = os.getenv("STUB_MEMORY", "").strip().lower()
+    if setting in ("", "0", "false", "no"):
+        return None
+    return StubMemoryClient(
+        latency=float(os.getenv("STUB_MEMORY_LATENCY", "0")),
+        failure_rate=float(os.getenv("STUB_MEMORY_FAILURE_RATE", "0")),
+        seed=int(os.getenv("STUB_MEMORY_SEED", "0")),
+    )
+
+
+def _matches(event, event_filter):
+    branch = event_filter.get("branch")
+    if branch and event["branch"].get("name") != branch.get("name"):
+        return False
+    metadata = event.get("metadata", {})
+    for expression in event_filter.get("eventMetadata", []):
+        key = expression["left"]["metadataKey"]
+        operator = expression["operator"]
+        if operator == "EXISTS" and key not in metadata:
+            return False
+        if operator == "NOT_EXISTS" and key in metadata:
+            return False
+        if operator == "EQUALS_TO" and metadata.get(key) != expression["right"]["metadataValue"]:
+            return False
+    return True
+
+
+def _public(event, include_payload=True):
+    """Copy of a stored event as the API returns it."""
+    result = {key: copy.deepcopy(value) for key, value in event.items() if not key.startswith("_")}
+    if not include_payload:
+        result.pop("payload")
+    return result
+
+
+def _as_datetime(value):
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+def _error(code, message, operation):
+    return ClientError({"Error": {"Code": code, "Message": message}}, operation)
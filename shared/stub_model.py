@@ -0,0 +1,236 @@
+"""
+Deterministic offline stand-in for BedrockModel.
+
+`StubModel` implements the Strands `Model` interface without any network
+access, so agents, tools, graphs and evaluators can be run and benchmarked in
+CI. Responses are scripted (or loaded from a recorded JSON/JSONL file) and the
+model can simulate time-to-first-token, a token rate and throttling/errors.
+
+A response entry looks like:
+    {"match": "debit card", "text": "A debit card draws money directly from your account."}
+    {"text": "Let me calculate that.", "tool_calls": [{"name": "sum_calculator", "input": {"a": 1, "b": 2}}]}
+
+Entries with `match` are used when that text appears in the latest user
+message; the others are served in order and repeat when exhausted. When a
+tool result comes back, the stub answers with the tool output. Forced tool
+calls (structured output) are answered with an input generated from the
+tool's JSON schema. Without a script the stub echoes the prompt.
+
+Switch any workshop agent to the stub with environment variables:
+    STUB_MODEL=1                        Use the stub with echo responses
+    STUB_MODEL=responses.jsonl          Use the stub with scripted/recorded responses
+    STUB_MODEL_LATENCY=0.4              Seconds before the first token
+    STUB_MODEL_TOKENS_PER_SECOND=50     Output token rate (unlimited if unset)
+    STUB_MODEL_FAILURE_RATE=0.1         Fraction of calls that fail
+    STUB_MODEL_FAILURE_MODE=throttle    "throttle" (retried by Strands) or "error"
+    STUB_MODEL_SEED=0                   Seed for failure injection
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import uuid
+
+from strands.models import Model
+from strands.types.exceptions import ModelThrottledException
+
+
+class StubModel(Model):
+    """
+    A scripted, network-free model with configurable latency and failures.
+    """
+
+    def __init__(self, responses=None, **model_config):
+        """
+        Args:
+            responses: List of response entries (see module docstring)
+            **model_config: latency, tokens_per_second, failure_rate, failure_mode, seed, model_id
+        """
+        self.responses = list(responses or [])
+        self.config = {
+            "model_id": "stub",
+            "latency": 0.0,
+            "tokens_per_second": None,
+            "failure_rate": 0.0,
+            "failure_mode": "throttle",
+            "seed": 0,
+        }
+        self.update_config(**model_config)
+        self._cursor = 0
+
+    @classmethod
+    def from_file(cls, path, **model_config):
+        """
+        Load response entries from a JSON list or a JSONL file.
+        """
+        with open(path, encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                responses = [json.loads(line) for line in f if line.strip()]
+            else:
+                responses = json.load(f)
+        return cls(responses, **model_config)
+
+    def update_config(self, **model_config):
+        self.config.update(model_config)
+        self._random = random.Random(self.config["seed"])
+
+    def get_config(self):
+        return self.config
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, *, tool_choice=None, **kwargs):
+        await self._before_response()
+
+        text, tool_calls = self._respond(messages, tool_specs or [], tool_choice)
+        output_tokens = 0
+
+        yield {"messageStart": {"role": "assistant"}}
+
+        if text:
+            yield {"contentBlockStart": {"start": {}}}
+            for chunk in _tokenize(text):
+                await self._pace()
+                output_tokens += 1
+                yield {"contentBlockDelta": {"delta": {"text": chunk}}}
+            yield {"contentBlockStop": {}}
+
+        for call in tool_calls:
+            tool_input = json.dumps(call.get("input", {}))
+            output_tokens += len(_tokenize(tool_input))
+            yield {"contentBlockStart": {"start": {"toolUse": {"toolUseId": f"tooluse_{uuid.uuid4().hex[:12]}", "name": call["name"]}}}}
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": tool_input}}}}
+            yield {"contentBlockStop": {}}
+
+        yield {"messageStop": {"stopReason": "tool_use" if tool_calls else "end_turn"}}
+
+        input_tokens = len(_tokenize(system_prompt or "")) + sum(len(_tokenize(_message_text(m))) for m in messages)
+        yield {
+            "metadata": {
+                "usage": {"inputTokens": input_tokens, "outputTokens": output_tokens, "totalTokens": input_tokens + output_tokens},
+                "metrics": {"latencyMs": int(self.config["latency"] * 1000)},
+            }
+        }
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        await self._before_response()
+        yield {"output": output_model.model_validate(_example_from_schema(output_model.model_json_schema()))}
+
+    async def _before_response(self):
+        if self._random.random() < self.config["failure_rate"]:
+            if self.config["failure_mode"] == "throttle":
+                raise ModelThrottledException("Stub model injected throttling")
+            raise RuntimeError("Stub model injected failure")
+
+        if self.config["latency"]:
+            await asyncio.sleep(self.config["latency"])
+
+    async def _pace(self):
+        if self.config["tokens_per_second"]:
+            await asyncio.sleep(1 / self.config["tokens_per_second"])
+
+    def _respond(self, messages, tool_specs, tool_choice):
+        """
+        Pick the text and tool calls for this turn.
+        """
+        tool_choice = tool_choice or {}
+        if "tool" in tool_choice or "any" in tool_choice:
+            # Forced tool call, e.g. structured output: answer with a schema-valid input
+            name = tool_choice.get("tool", {}).get("name") or tool_specs[0]["name"]
+            spec = next(spec for spec in tool_specs if spec["name"] == name)
+            return "", [{"name": name, "input": _example_from_schema(spec["inputSchema"]["json"])}]
+
+        last = messages[-1] if messages else {"content": []}
+        tool_results = [block["toolResult"] for block in last["content"] if "toolResult" in block]
+        if tool_results:
+            outputs = " ".join(_message_text({"content": result["content"]}) for result in tool_results)
+            return f"Here is what I found: {outputs}", []
+
+        prompt = _message_text(last)
+        entry = self._next_entry(prompt)
+        if entry is None:
+            return f"This is a stub response to: {prompt}", []
+
+        return entry.get("text", ""), entry.get("tool_calls", [])
+
+    def _next_entry(self, prompt):
+        lowered = prompt.lower()
+        for entry in self.responses:
+            if "match" in entry and entry["match"].lower() in lowered:
+                return entry
+
+        sequence = [entry for entry in self.responses if "match" not in entry]
+        if not sequence:
+            return None
+
+        entry = sequence[self._cursor % len(sequence)]
+        self._cursor += 1
+        return entry
+
+
+def model_from_env(model=None):
+    """
+    Return a StubModel when STUB_MODEL is set, otherwise the given model.
+
+    Usage:
+        agent = Agent(model=model_from_env(bedrock_model))   # or model_from_env() for the default model
+
+    Args:
+        model: The model to use when the stub is not enabled (None means the Strands default)
+    """
+    setting = os.getenv("STUB_MODEL", "").strip()
+    if not setting or setting.lower() in ("0", "false", "no"):
+        return model
+
+    model_config = {
+        "latency": float(os.getenv("STUB_MODEL_LATENCY", "0")),
+        "tokens_per_second": float(os.getenv("STUB_MODEL_TOKENS_PER_SECOND", "0")) or None,
+        "failure_rate": float(os.getenv("STUB_MODEL_FAILURE_RATE", "0")),
+        "failure_mode": os.getenv("STUB_MODEL_FAILURE_MODE", "throttle"),
+        "seed": int(os.getenv("STUB_MODEL_SEED", "0")),
+    }
+
+    if setting.lower() in ("1", "true", "yes"):
+        return StubModel(**model_config)
+    return StubModel.from_file(setting, **model_config)
+
+
+def _tokenize(text):
+    """Split text into word-sized chunks, keeping whitespace so the chunks join back losslessly."""
+    return re.findall(r"\s*\S+\s*", text)
+
+
+def _message_text(message):
+    return " ".join(block["text"] for block in message.get("content", []) if "text" in block)
+
+
+def _example_from_schema(schema, definitions=None):
+    """
+    Build a minimal value that satisfies a JSON schema (required fields only, defaults, first enum value, zeros).
+    """
+    definitions = definitions or schema.get("$defs") or schema.get("definitions") or {}
+
+    if "$ref" in schema:
+        return _example_from_schema(definitions[schema["$ref"].rsplit("/", 1)[-1]], definitions)
+    if "default" in schema:
+        return schema["default"]
+    if "enum" in schema:
+        return schema["enum"][0]
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [option for option in schema[key] if option.get("type") != "null"] or schema[key]
+            # Prefer a plain string when a field accepts several shapes, it is the least likely to be rejected
+            option = next((option for option in options if option.get("type") == "string"), options[0])
+            return _example_from_schema(option, definitions)
+
+    schema_type = schema.get("type", "object")
+    if isinstance(schema_type, list):
+        schema_type = next((t for t in schema_type if t != "null"), "null")
+
+    if schema_type == "object":
+        properties = schema.get("properties", {})
+        required = schema.get("required", list(properties))
+        return {name: _example_from_schema(properties[name], definitions) for name in required if name in properties}
+    if schema_type == "array":
+        return []
+    return {"string": "stub", "integer": 0, "number": 0.0, "boolean": False, "null": None}[schema_type]
@@ -0,0 +1,196 @@
+"""
+Shared-context compaction between Swarm handoffs.
+
+Every Swarm node receives the whole shared context (everything each agent
+passed along in `handoff_to_agent(..., context=...)`) as part of its input.
+Over a long run the context keeps growing, so every handoff pays again for
+all earlier contributions. `ContextCompactor` is a hook provider that
+compacts the shared context before each node runs with a pluggable strategy:
+
+    TruncateStrategy(max_chars)     Cut every contribution to at most max_chars characters
+    KeepLastStrategy(n)             Keep only the last n contributions (keys) of each agent
+    SummaryStrategy(model, ...)     Replace an agent's contributions with a model-written summary
+                                    once they exceed max_chars
+
+A strategy is any callable taking and returning the context dict
+({agent name: {key: value}}), so custom strategies plug in the same way.
+Strategies that call a model should be coroutine functions (like
+SummaryStrategy): the hook runs on the swarm's event loop, and a blocking
+model call there would stall the swarm and delay cancellation (Ctrl-C).
+Tokens saved per handoff are estimated from the serialized size.
+
+Usage:
+    compactor = ContextCompactor(KeepLastStrategy(2))
+    swarm = Swarm([...], hooks=[compactor])
+    swarm("...")
+    print(compactor.report())
+"""
+
+import inspect
+import json
+
+from strands import Agent
+from strands.hooks import BeforeMultiAgentInvocationEvent, BeforeNodeCallEvent, HookProvider
+
+_MISSING = object()
+
+# Rough characters per token for English text and JSON, used to estimate savings without a tokenizer
+CHARS_PER_TOKEN = 4
+
+
+class ContextCompactor(HookProvider):
+    """
+    Compacts the Swarm shared context before every node and tracks the tokens saved.
+    """
+
+    def __init__(self, strategy):
+        """
+        Args:
+            strategy: Callable mapping the shared context dict to a smaller one
+        """
+        self.strategy = strategy
+        self.handoffs = []
+        self._raw = {}
+        self._last = {}
+
+    def register_hooks(self, registry, **kwargs):
+        registry.add_callback(BeforeMultiAgentInvocationEvent, self._before_invocation)
+        registry.add_callback(BeforeNodeCallEvent, self._before_node)
+
+    def _before_invocation(self, event):
+        self.handoffs = []
+        self._raw = {}
+        self._last = {}
+
+    async def _before_node(self, event):
+        shared_context = event.source.shared_context
+
+        # Track what the context would hold without compaction: everything added since the last compaction
+        for node, values in shared_context.context.items():
+            for key, value in values.items():
+                if self._last.get(node, {}).get(key, _MISSING) != value:
+                    self._raw.setdefault(node, {})[key] = value
+
+        if shared_context.context:
+            compacted = self.strategy(shared_context.context)
+            if inspect.isawaitable(compacted):
+                compacted = await compacted
+            shared_context.context = compacted
+        self._last = {node: dict(values) for node, values in shared_context.context.items()}
+
+        before = estimate_tokens(self._raw)
+        after = estimate_tokens(shared_context.context)
+        self.handoffs.append({"node": event.node_id, "tokens_before": before, "tokens_after": after, "tokens_saved": before - after})
+
+    def report(self):
+        """
+        Return per-handoff savings and the total for the last invocation.
+
+        The total counts every node input, since each one would have carried the uncompacted context.
+        """
+        return {
+            "strategy": type(self.strategy).__name__,
+            "handoffs": self.handoffs,
+            "tokens_saved": sum(handoff["tokens_saved"] for handoff in self.handoffs),
+        }
+
+
+class TruncateStrategy:
+    """
+    Cut every contribution to at most `max_chars` characters of JSON.
+    """
+
+    def __init__(self, max_chars=500):
+        self.max_chars = max_chars
+
+    def __call__(self, context):
+        compacted = {}
+        for node, values in context.items():
+            compacted[node] = {}
+            for key, value in values.items():
+                text = value if isinstance(value, str) else json.dumps(value, default=str)
+                compacted[node][key] = value if len(text) <= self.max_chars else text[:self.max_chars] + " [truncated]"
+        return compacted
+
+
+class KeepLastStrategy:
+    """
+    Keep only the `n` most recently added contributions of each agent.
+    """
+
+    def __init__(self, n=2):
+        self.n = n
+
+    def __call__(self, context):
+        # Dicts keep insertion order, so the last keys are the most recent contributions
+        return {node: dict(list(values.items())[-self.n:]) for node, values in context.items()}
+
+
+class SummaryStrategy:
+    """
+    Replace an agent's contributions with a short model-written summary once they exceed `max_chars`.
+
+    Summaries are cached by content, so an agent's context is only summarized again after it changed.
+    Calling the strategy returns a coroutine: the summarizer runs with invoke_async, so the swarm's
+    event loop is not blocked while it waits for the model.
+    """
+
+    def __init__(self, model=None, max_chars=1500, summary_words=120):
+        """
+        Args:
+            model: Model for the summarizer agent (None for the Strands default)
+            max_chars: Serialized size of an agent's contributions above which they are summarized
+            summary_words: Target length of each summary
+        """
+        self.max_chars = max_chars
+        self.summarizer = Agent(
+            model=model,
+            system_prompt=(
+                "You compress notes that agents share while collaborating on a task. Keep decisions, facts, "
+                f"open questions and file or API names. Answer with the summary only, at most {summary_words} words."
+            ),
+            callback_handler=None,
+        )
+        self._cache = {}
+
+    async def __call__(self, context):
+        compacted = {}
+        for node, values in context.items():
+            text = json.dumps(values, default=str)
+            if len(text) <= self.max_chars:
+                compacted[node] = values
+                continue
+
+            if text not in self._cache:
+                self.summarizer.messages.clear()
+                result = await self.summarizer.invoke_async(f"Summarize the notes of the {node} agent:\n{text}")
+                summary = str(result).strip()
+                # A summary that is not shorter than the notes saves nothing, keep the original then
+                self._cache[text] = {"summary": summary} if len(summary) < len(text) else values
+            compacted[node] = self._cache[text]
+        return compacted
+
+
+def estimate_tokens(context):
+    """Estimate the tokens the shared context adds to a node input."""
+    if not context:
+        return 0
+    return len(json.dumps(context, default=str)) // CHARS_PER_TOKEN
+
+
+def strategy_from_name(name, limit=None, model=None):
+    """
+    Build a strategy from its name ("truncate", "keep_last" or "summary"), as used by SWARM_COMPACTION.
+
+    Args:
+        name: Strategy name
+        limit: max_chars for truncate/summary, n for keep_last (None for the defaults)
+        model: Model used by the summary strategy
+    """
+    if name == "truncate":
+        return TruncateStrategy(limit or 500)
+    if name == "keep_last":
+        return KeepLastStrategy(limit or 2)
+    if name == "summary":
+        return SummaryStrategy(model=model, max_chars=limit or 1500)
+    raise ValueError(f"Unknown compaction strategy {name!r}, expected truncate, keep_last or summary")
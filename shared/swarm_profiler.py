@@ -0,0 +1,232 @@
+"""
+Handoff profiler and ping-pong detector for Strands Swarms.
+
+`SwarmProfiler` is a hook provider that records every node turn of a Swarm:
+when it started and ended, which agent handed off to it, the handoff message,
+its token usage and how large the shared context was when it started. It
+also watches the sequence of agents for cycles such as
+coder -> reviewer -> coder -> reviewer and, depending on the policy, stops
+the swarm once a cycle has repeated too often, instead of letting it
+oscillate until `max_handoffs` or `execution_timeout`.
+
+After each invocation the turns can be exported as a timeline in the Chrome
+trace event format, which chrome://tracing, https://ui.perfetto.dev and
+https://www.speedscope.app render as a flame chart.
+
+Usage:
+    profiler = SwarmProfiler(max_cycles=3)
+    swarm = Swarm([...], hooks=[profiler])
+    swarm("...")
+    print_handoff_report(profiler.report())
+    profiler.export_timeline("swarm-timeline.json")
+"""
+
+import json
+import time
+
+from strands.hooks import (
+    AfterMultiAgentInvocationEvent,
+    AfterNodeCallEvent,
+    BeforeMultiAgentInvocationEvent,
+    BeforeNodeCallEvent,
+    HookProvider,
+)
+
+
+class SwarmProfiler(HookProvider):
+    """
+    Records swarm handoffs and stops ping-pong cycles.
+    """
+
+    def __init__(self, max_cycles=None, max_period=3, on_report=None):
+        """
+        Args:
+            max_cycles: Stop the swarm when the same cycle of agents repeats this many times in a row
+                (None only records the cycles)
+            max_period: Longest cycle to look for, 2 catches A -> B -> A -> B, 3 catches A -> B -> C -> A -> B -> C
+            on_report: Callable receiving the report dict after every invocation
+        """
+        if max_cycles is not None and max_cycles < 2:
+            raise ValueError("max_cycles must be at least 2")
+
+        self.max_cycles = max_cycles
+        self.max_period = max_period
+        self.on_report = on_report
+
+        self.turns = []
+        self.cycles = []
+        self.stopped = None
+        self._start = 0.0
+        self._wall_start = 0.0
+
+    def register_hooks(self, registry, **kwargs):
+        registry.add_callback(BeforeMultiAgentInvocationEvent, self._before_invocation)
+        registry.add_callback(BeforeNodeCallEvent, self._before_node)
+        registry.add_callback(AfterNodeCallEvent, self._after_node)
+        registry.add_callback(AfterMultiAgentInvocationEvent, self._after_invocation)
+
+    def _before_invocation(self, event):
+        self.turns = []
+        self.cycles = []
+        self.stopped = None
+        self._start = time.perf_counter()
+        self._wall_start = time.time()
+
+    def _before_node(self, event):
+        swarm = event.source
+        sequence = [turn["node"] for turn in self.turns] + [event.node_id]
+
+        cycle = find_cycle(sequence, self.max_period)
+        if cycle is not None:
+            pattern, repeats = cycle
+            self.cycles.append({"pattern": pattern, "repeats": repeats, "turn": len(self.turns)})
+
+            if self.max_cycles is not None and repeats >= self.max_cycles:
+                self.stopped = f"Ping-pong stopped: {' -> '.join(pattern)} repeated {repeats} times"
+                event.cancel_node = self.stopped
+
+        shared_context = json.dumps(swarm.shared_context.context, default=str)
+        handoff_message = swarm.state.handoff_message or ""
+        self.turns.append({
+            "node": event.node_id,
+            "from": self.turns[-1]["node"] if self.turns else None,
+            "handoff_message": handoff_message,
+            "context_chars": len(shared_context) + len(handoff_message),
+            "start": time.perf_counter() - self._start,
+            "end": None,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "status": "cancelled" if event.cancel_node else "running",
+        })
+
+    def _after_node(self, event):
+        if not self.turns or self.turns[-1]["node"] != event.node_id:
+            return
+
+        turn = self.turns[-1]
+        turn["end"] = time.perf_counter() - self._start
+        if turn["status"] == "cancelled":
+            return
+
+        result = event.source.state.results.get(event.node_id)
+        if result is not None:
+            turn["input_tokens"] = result.accumulated_usage.get("inputTokens", 0)
+            turn["output_tokens"] = result.accumulated_usage.get("outputTokens", 0)
+            turn["status"] = result.status.value
+        else:
+            turn["status"] = "failed"
+
+    def _after_invocation(self, event):
+        if self.on_report is not None:
+            self.on_report(self.report())
+
+    def report(self):
+        """
+        Summarize the last invocation: turns, time and tokens per agent, and detected cycles.
+        """
+        per_node = {}
+        for turn in self.turns:
+            if turn["end"] is None or turn["status"] == "cancelled":
+                continue
+            stats = per_node.setdefault(turn["node"], {"turns": 0, "seconds": 0.0, "input_tokens": 0, "output_tokens": 0})
+            stats["turns"] += 1
+            stats["seconds"] += turn["end"] - turn["start"]
+            stats["input_tokens"] += turn["input_tokens"]
+            stats["output_tokens"] += turn["output_tokens"]
+
+        return {
+            "turns": self.turns,
+            "handoffs": max(len(self.turns) - 1, 0),
+            "wall_time": max((turn["end"] or 0.0 for turn in self.turns), default=0.0),
+            "per_node": per_node,
+            "cycles": self.cycles,
+            "stopped": self.stopped,
+        }
+
+    def export_timeline(self, path):
+        """
+        Write the turns of the last invocation as a Chrome trace event JSON file.
+
+        Each agent gets its own row; handoffs are drawn as flow arrows between turns.
+        """
+        events = []
+        rows = {}
+        for index, turn in enumerate(self.turns):
+            if turn["end"] is None:
+                continue
+            row = rows.setdefault(turn["node"], len(rows) + 1)
+            start_us = int((self._wall_start + turn["start"]) * 1_000_000)
+            events.append({
+                "name": turn["node"],
+                "cat": "swarm",
+                "ph": "X",
+                "ts": start_us,
+                "dur": int((turn["end"] - turn["start"]) * 1_000_000),
+                "pid": 1,
+                "tid": row,
+                "args": {key: turn[key] for key in ("from", "handoff_message", "context_chars", "input_tokens", "output_tokens", "status")},
+            })
+            if turn["from"] is not None:
+                events.append({"name": "handoff", "cat": "handoff", "ph": "f", "bp": "e", "id": index, "ts": start_us, "pid": 1, "tid": row})
+            if index + 1 < len(self.turns):
+                end_us = int((self._wall_start + turn["end"]) * 1_000_000)
+                events.append({"name": "handoff", "cat": "handoff", "ph": "s", "id": index + 1, "ts": end_us - 1, "pid": 1, "tid": row})
+
+        for node, row in rows.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": row, "args": {"name": node}})
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, indent=2)
+
+
+def find_cycle(sequence, max_period=3):
+    """
+    Find the shortest cycle of distinct agents repeating at the end of a sequence.
+
+    Args:
+        sequence: Node ids in execution order
+        max_period: Longest cycle length to check
+
+    Returns:
+        tuple | None: (pattern as a list of node ids, number of consecutive repeats) for cycles repeated at least twice
+    """
+    for period in range(2, max_period + 1):
+        pattern = sequence[-period:]
+        if len(pattern) < period or len(set(pattern)) != period:
+            continue
+
+        repeats = 1
+        while sequence[-period * (repeats + 1):len(sequence) - period * repeats] == pattern:
+            repeats += 1
+
+        if repeats >= 2:
+            return pattern, repeats
+    return None
+
+
+def print_handoff_report(report):
+    """
+    Print the turns of a swarm run as a text timeline, followed by per-agent totals and cycles.
+    """
+    wall_time = report["wall_time"] or 1.0
+    width = 40
+
+    print(f"\n[swarm] {len(report['turns'])} turns, {report['handoffs']} handoffs, {report['wall_time']:.2f}s")
+    for turn in report["turns"]:
+        if turn["end"] is None:
+            continue
+        offset = int(turn["start"] / wall_time * width)
+        length = max(int((turn["end"] - turn["start"]) / wall_time * width), 1)
+        bar = " " * offset + "#" * length
+        print(f"  {turn['node']:<12} |{bar:<{width}}| {turn['end'] - turn['start']:6.2f}s "
+              f"in {turn['input_tokens']:>6} out {turn['output_tokens']:>5} ctx {turn['context_chars']:>6} chars")
+
+    for node, stats in report["per_node"].items():
+        print(f"  {node:<12} {stats['turns']} turns, {stats['seconds']:.2f}s, "
+              f"{stats['input_tokens']} in / {stats['output_tokens']} out tokens")
+
+    if report["cycles"]:
+        worst = max(report["cycles"], key=lambda cycle: cycle["repeats"])
+        print(f"  cycle detected: {' -> '.join(worst['pattern'])} x{worst['repeats']}")
+    if report["stopped"]:
+        print(f"  {report['stopped']}")
@@ -1,11 +1,28 @@
+import asyncio
+import copy
+import signal
+import threading
+import time
 
-def terminal_loop(agent):
+from strands import Agent
+from strands.handlers.callback_handler import PrintingCallbackHandler, null_callback_handler
+
+
+def terminal_loop(agent, stream=True):
     """
     Run an interactive terminal loop for the agent.
 
     Args:
         agent: Initialized Strands agent instance
+        stream: Print tokens as they arrive and report time-to-first-token and
+            tokens/sec per turn. Objects that do not stream token by token
+            (Graph, Swarm) always use the blocking path.
     """
+    stream = stream and _supports_streaming(agent)
+
+    if stream and isinstance(agent.callback_handler, PrintingCallbackHandler):
+        # The default handler already echoes tokens; when streaming, the loop prints them itself.
+        agent.callback_handler = null_callback_handler
 
     while True:
         try:
@@ -21,6 +38,11 @@ def terminal_loop(agent):
             if not user_input:
                 continue
 
+            if stream:
+                # Process the query and display tokens as they are generated
+                asyncio.run(_stream_response(agent, user_input))
+                continue
+
             # Process the query with the agent
             response = agent(user_input)
 
@@ -33,3 +55,168 @@ def terminal_loop(agent):
         except Exception as e:
             print(f"\nError processing request: {e}\n")
             continue
+
+
+async def async_terminal_loop(agent, stream=True):
+    """
+    Run an interactive terminal loop where Ctrl-C cancels only the running turn.
+
+    Input is read on a background thread and each agent invocation runs in its
+    own asyncio task. Pressing Ctrl-C while the agent is working cancels the
+    in-flight model call and tool executions and returns to the prompt; pressing
+    it at the prompt ends the loop. Tools that block in a worker thread finish in
+    the background, but their results are discarded.
+
+    Usage:
+        asyncio.run(async_terminal_loop(agent))
+
+    Args:
+        agent: Initialized Strands agent, Graph or Swarm instance
+        stream: Print tokens as they arrive (single agents only, see terminal_loop)
+    """
+    stream = stream and _supports_streaming(agent)
+
+    if stream and isinstance(agent.callback_handler, PrintingCallbackHandler):
+        agent.callback_handler = null_callback_handler
+
+    loop = asyncio.get_running_loop()
+    pending_input = None
+    turn = None
+
+    def interrupt():
+        if turn is not None and not turn.done():
+            turn.cancel()
+        elif pending_input is not None:
+            pending_input.cancel()
+
+    loop.add_signal_handler(signal.SIGINT, interrupt)
+
+    try:
+        while True:
+            # Get user input without blocking the event loop
+            pending_input = _read_input(loop, "You: ")
+            try:
+                user_input = (await pending_input).strip()
+            except (asyncio.CancelledError, EOFError):
+                print("\n\nInterrupted by user...")
+                break
+
+            # Check for exit commands
+            if user_input.lower() in ["exit", "quit", "bye"]:
+                print("\nAgent: Goodbye! Thanks for chatting!")
+                break
+
+            # Skip empty inputs
+            if not user_input:
+                continue
+
+            # Process the query in its own task so it can be cancelled on its own
+            turn = asyncio.create_task(_run_turn(agent, user_input, stream))
+            try:
+                await turn
+            except asyncio.CancelledError:
+                print("\n\nTurn cancelled. Ask something else or type 'exit' to quit.\n")
+            except Exception as e:
+                print(f"\nError processing request: {e}\n")
+            finally:
+                turn = None
+    finally:
+        loop.remove_signal_handler(signal.SIGINT)
+
+
+def _read_input(loop, prompt):
+    """
+    Read one line from stdin on a daemon thread.
+
+    A daemon thread is used instead of the default executor so that a pending
+    input() call never keeps the process alive after the loop has exited.
+
+    Returns:
+        asyncio.Future: Resolves to the line read, or raises EOFError
+    """
+    future = loop.create_future()
+
+    def resolve(setter, value):
+        if not future.done():
+            setter(value)
+
+    def read():
+        try:
+            line = input(prompt)
+        except EOFError as e:
+            loop.call_soon_threadsafe(resolve, future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(resolve, future.set_result, line)
+
+    threading.Thread(target=read, daemon=True).start()
+    return future
+
+
+async def _run_turn(agent, user_input, stream):
+    """
+    Run one turn, rolling the conversation back if the turn is cancelled.
+
+    Args:
+        agent: Strands agent, Graph or Swarm instance
+        user_input: The user's message for this turn
+        stream: Whether to stream tokens to the terminal
+    """
+    snapshot = None
+    if isinstance(agent, Agent):
+        # The conversation manager may trim, summarize or truncate messages in place during the turn,
+        # so a cancelled turn is undone by restoring a copy, not by cutting at the old length
+        snapshot = (copy.deepcopy(agent.messages), copy.deepcopy(agent.conversation_manager.get_state()))
+
+    try:
+        if stream:
+            await _stream_response(agent, user_input)
+        else:
+            response = await agent.invoke_async(user_input)
+            print(f"\nAgent: {response}\n")
+    except asyncio.CancelledError:
+        if snapshot is not None:
+            # Drop the half-finished turn so the next request starts from a consistent history
+            messages, manager_state = snapshot
+            agent.messages[:] = messages
+            agent.conversation_manager.restore_from_session(manager_state)
+        raise
+
+
+def _supports_streaming(agent):
+    """Only single agents emit text deltas; multi-agent objects fall back to the blocking call."""
+    return isinstance(agent, Agent)
+
+
+async def _stream_response(agent, user_input):
+    """
+    Stream one turn to the terminal and print its latency figures.
+
+    Args:
+        agent: Strands agent instance
+        user_input: The user's message for this turn
+    """
+    start = time.perf_counter()
+    first_token_at = None
+    output_tokens = 0
+
+    print("\nAgent: ", end="", flush=True)
+
+    async for event in agent.stream_async(user_input):
+        if "data" in event:
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            print(event["data"], end="", flush=True)
+        elif "metadata" in event.get("event", {}):
+            # One metadata event is emitted per model call, so this sums over tool cycles too
+            output_tokens += event["event"]["metadata"].get("usage", {}).get("outputTokens", 0)
+
+    end = time.perf_counter()
+    print("\n")
+
+    if first_token_at is None:
+        print(f"[no text streamed | total {end - start:.2f}s]\n")
+        return
+
+    generation_time = end - first_token_at
+    tokens_per_second = output_tokens / generation_time if output_tokens and generation_time > 0 else 0.0
+    print(f"[ttft {first_token_at - start:.2f}s | {tokens_per_second:.1f} tokens/s | total {end - start:.2f}s]\n")
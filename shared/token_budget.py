@@ -0,0 +1,216 @@
+"""
+Token-budgeted sliding window conversation manager.
+
+`SlidingWindowConversationManager(window_size=N)` keeps the last N messages
+whatever their size, so a single large tool result can still fill the
+context window, and the cost of a turn depends on what happened to be said
+before. `TokenBudgetConversationManager` keeps the history under a token
+budget instead:
+
+- every message's token estimate is computed once, when it is added, and
+  kept in a deque next to a running total, so checking the budget is O(1)
+  and evicting from the front is O(evicted messages)
+- the oldest turns are evicted first, always cutting just before a plain
+  user message, so a toolUse is never separated from its toolResult and the
+  history always starts with a user message
+- tool results larger than `max_tool_result_tokens` are cut down (head and
+  tail kept) when they enter the history, since a tool result of the
+  current turn cannot be evicted
+- management runs before every model call, so the budget also holds inside
+  long tool loops, and every call records the messages and tokens evicted
+
+Token counts are estimated from the text size (CHARS_PER_TOKEN), which is
+enough to bound prompt size; `estimate` accepts any other estimator.
+
+Usage:
+    manager = TokenBudgetConversationManager(max_tokens=4000)
+    agent = Agent(conversation_manager=manager)
+    agent("...")
+    print(manager.evictions[-1])    # {"evicted_messages": 2, "evicted_tokens": 812, "window_tokens": 3650}
+"""
+
+import json
+import logging
+from collections import deque
+
+from strands.agent.conversation_manager import ConversationManager
+from strands.hooks import BeforeModelCallEvent
+from strands.types.exceptions import ContextWindowOverflowException
+
+logger = logging.getLogger(__name__)
+
+# Rough characters per token for English text and JSON
+CHARS_PER_TOKEN = 4
+# Flat estimate for an image or document block
+MEDIA_TOKENS = 1600
+# Characters kept at each end of a cut tool result
+_PRESERVE_CHARS = 200
+
+
+class TokenBudgetConversationManager(ConversationManager):
+    """
+    Keeps the conversation under a token budget by evicting the oldest turns.
+    """
+
+    def __init__(self, max_tokens=8000, max_tool_result_tokens=None, per_turn=True, estimate=None, max_evictions=100):
+        """
+        Args:
+            max_tokens: Token budget of the conversation history
+            max_tool_result_tokens: Cut tool results above this size (defaults to half the budget, None keeps them)
+            per_turn: Apply the budget before every model call, not only after the invocation
+            estimate: Callable(message) -> estimated tokens (defaults to estimate_message_tokens)
+            max_evictions: Number of per-call eviction records kept in `evictions`
+        """
+        super().__init__()
+        self.max_tokens = max_tokens
+        self.max_tool_result_tokens = max_tool_result_tokens if max_tool_result_tokens is not None else max_tokens // 2
+        self.per_turn = per_turn
+        self.estimate = estimate or estimate_message_tokens
+        self.evictions = deque(maxlen=max_evictions)
+        self.window_tokens = 0
+
+        # Token estimate per message, aligned with the front of agent.messages
+        self._counts = deque()
+        self._first = None
+        self._last = None
+
+    def register_hooks(self, registry, **kwargs):
+        super().register_hooks(registry, **kwargs)
+        registry.add_callback(BeforeModelCallEvent, self._before_model_call)
+
+    def _before_model_call(self, event):
+        if self.per_turn:
+            self.apply_management(event.agent)
+
+    def apply_management(self, agent, **kwargs):
+        self._sync(agent.messages)
+        if self.window_tokens > self.max_tokens:
+            self.reduce_context(agent)
+
+    def reduce_context(self, agent, e=None, **kwargs):
+        messages = agent.messages
+        self._sync(messages)
+
+        # Trim to the budget, or by at least one turn when the model reported an overflow
+        target = self.max_tokens if e is None else min(self.max_tokens, self.window_tokens - 1)
+        cut = 0
+        cut_tokens = 0
+        total = self.window_tokens
+        while total > target:
+            # Evict whole turns: only cut before a plain user message, which keeps toolUse/toolResult
+            # pairs together and starts the history with a user message
+            end = cut + 1
+            while end < len(messages) and not _is_turn_start(messages[end]):
+                end += 1
+            if end >= len(messages):
+                break
+            turn_tokens = sum(self._counts[index] for index in range(cut, end))
+            total -= turn_tokens
+            cut_tokens += turn_tokens
+            cut = end
+
+        if cut == 0:
+            if e is not None:
+                raise ContextWindowOverflowException("Unable to trim conversation context within the token budget") from e
+            logger.warning(
+                "window_tokens=<%s>, max_tokens=<%s> | the current turn alone exceeds the token budget",
+                self.window_tokens,
+                self.max_tokens,
+            )
+            return
+
+        for _ in range(cut):
+            self._counts.popleft()
+        del messages[:cut]
+        self._first = messages[0]
+        self.window_tokens -= cut_tokens
+        self.removed_message_count += cut
+        self.evictions.append({"evicted_messages": cut, "evicted_tokens": cut_tokens, "window_tokens": self.window_tokens})
+        logger.debug(
+            "evicted_messages=<%s>, evicted_tokens=<%s>, window_tokens=<%s> | trimmed conversation to the token budget",
+            cut,
+            cut_tokens,
+            self.window_tokens,
+        )
+
+    def get_state(self):
+        state = super().get_state()
+        state["window_tokens"] = self.window_tokens
+        return state
+
+    def restore_from_session(self, state):
+        result = super().restore_from_session(state)
+        # Counts are rebuilt from the restored messages on the next call
+        self._counts.clear()
+        self._first = self._last = None
+        return result
+
+    def _sync(self, messages):
+        """Count messages added since the last call; rebuild if the history was replaced or edited at the front."""
+        counted = len(self._counts)
+        if counted and (
+            len(messages) < counted or messages[0] is not self._first or messages[counted - 1] is not self._last
+        ):
+            self._counts.clear()
+            self.window_tokens = 0
+            counted = 0
+
+        for message in messages[counted:]:
+            if self.max_tool_result_tokens:
+                _cut_tool_results(message, self.max_tool_result_tokens * CHARS_PER_TOKEN)
+            tokens = self.estimate(message)
+            self._counts.append(tokens)
+            self.window_tokens += tokens
+
+        if messages:
+            self._first, self._last = messages[0], messages[-1]
+
+    def report(self):
+        """Summarize the evictions recorded so far."""
+        return {
+            "window_tokens": self.window_tokens,
+            "max_tokens": self.max_tokens,
+            "removed_messages": self.removed_message_count,
+            "evicted_tokens": sum(eviction["evicted_tokens"] for eviction in self.evictions),
+            "evictions": list(self.evictions),
+        }
+
+
+def estimate_message_tokens(message):
+    """Estimate the tokens of a message from the size of its text, tool inputs and tool results."""
+    chars = 0
+    media = 0
+    for block in message.get("content", []):
+        if "text" in block:
+            chars += len(block["text"])
+        elif "toolUse" in block:
+            chars += len(json.dumps(block["toolUse"].get("input", {}), default=str)) + len(block["toolUse"].get("name", ""))
+        elif "toolResult" in block:
+            for item in block["toolResult"].get("content", []):
+                if "text" in item:
+                    chars += len(item["text"])
+                elif "json" in item:
+                    chars += len(json.dumps(item["json"], default=str))
+                else:
+                    media += 1
+        elif "reasoningContent" in block:
+            chars += len(block["reasoningContent"].get("reasoningText", {}).get("text", ""))
+        elif "image" in block or "document" in block or "video" in block:
+            media += 1
+    return chars // CHARS_PER_TOKEN + media * MEDIA_TOKENS + 1
+
+
+def _is_turn_start(message):
+    return message["role"] == "user" and not any("toolResult" in block for block in message["content"])
+
+
+def _cut_tool_results(message, max_chars):
+    """Cut text tool results above max_chars in place, keeping their start and end."""
+    for block in message.get("content", []):
+        if "toolResult" not in block:
+            continue
+        for item in block["toolResult"].get("content", []):
+            text = item.get("text")
+            if text is not None and len(text) > max(max_chars, 4 * _PRESERVE_CHARS):
+                removed = len(text) - 2 * _PRESERVE_CHARS
+                item["text"] = f"{text[:_PRESERVE_CHARS]}...\n\n... [truncated: {removed} chars removed] ...\n\n...{text[-_PRESERVE_CHARS:]}"
@@ -0,0 +1,358 @@
+"""
+Write-behind session manager with a per-agent append-only log.
+
+`FileSessionManager` writes one JSON file (temp file + rename) for every
+message and agent update, on the request path, so every turn waits for the
+filesystem several times. `WriteBehindSessionManager` keeps the same session
+API and instead:
+
+- turns message and agent writes into records that are queued in memory;
+  the agent never waits for the disk
+- appends the records in batches from a background thread to
+  `agents/agent_<id>/log.jsonl`, one line per record
+- fsyncs the log every `fsync_interval` seconds (0 fsyncs every batch)
+- compacts the log into `snapshot.json` once it holds `compact_every`
+  records, so restoring a session reads one snapshot plus a short log
+
+Durability: a record is durable once the fsync after it returned. On a crash
+the queued records and, depending on the OS, the records written since the
+last fsync are lost; everything up to the last durable point is restored by
+replaying the log over the snapshot, and a torn last line is ignored.
+Records are fsynced on the cadence even when no further writes arrive.
+`flush()` blocks until everything queued so far is durable, and is called at
+interpreter exit. Compaction fsyncs the new snapshot (file and directory)
+before it empties the log, and records are idempotent (last write wins per
+message id), so a crash during compaction only replays records that are
+already in the snapshot.
+
+Usage:
+    session_manager = WriteBehindSessionManager(session_id="user-1", storage_dir="./agent-session-log", fsync_interval=1.0)
+    agent = Agent(session_manager=session_manager)
+    ...
+    session_manager.flush()     # Everything so far is on disk
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+import weakref
+
+from strands.session import FileSessionManager
+from strands.types.exceptions import SessionException
+from strands.types.session import SessionAgent, SessionMessage
+
+logger = logging.getLogger(__name__)
+
+LOG_FILE = "log.jsonl"
+SNAPSHOT_FILE = "snapshot.json"
+
+# Marks a flush request in the write queue
+_FLUSH = object()
+
+
+class WriteBehindSessionManager(FileSessionManager):
+    """
+    FileSessionManager whose message and agent writes go to a batched, append-only log.
+    """
+
+    def __init__(self, session_id, storage_dir=None, fsync_interval=1.0, batch_interval=0.01, compact_every=200, **kwargs):
+        """
+        Args:
+            session_id: ID for the session
+            storage_dir: Directory for the session files
+            fsync_interval: Seconds between fsyncs of the log (0 fsyncs after every batch)
+            batch_interval: Seconds the writer waits to collect more records into a batch
+            compact_every: Log records after which the log is compacted into the snapshot
+        """
+        self.fsync_interval = fsync_interval
+        self.batch_interval = batch_interval
+        self.compact_every = compact_every
+        self.stats = {"records": 0, "batches": 0, "fsyncs": 0, "compactions": 0, "bytes": 0, "errors": 0}
+
+        self._queue = queue.Queue()
+        self._io_lock = threading.RLock()
+        self._logs = {}
+        self._log_records = {}
+        self._dirty = set()
+        self._last_fsync = time.monotonic()
+        self._created_at = {}
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="session-writer", daemon=True)
+        self._writer.start()
+        # Make queued records durable when the interpreter exits, without keeping the manager alive
+        atexit.register(_close_ref, weakref.ref(self))
+
+        super().__init__(session_id=session_id, storage_dir=storage_dir, **kwargs)
+
+    def create_agent(self, session_id, session_agent, **kwargs):
+        agent_dir = self._get_agent_path(session_id, session_agent.agent_id)
+        os.makedirs(agent_dir, mode=0o700, exist_ok=True)
+        self._created_at[agent_dir] = session_agent.created_at
+        with self._io_lock:
+            self._write_file(os.path.join(agent_dir, SNAPSHOT_FILE), {"agent": session_agent.to_dict(), "messages": []})
+
+    def update_agent(self, session_id, session_agent, **kwargs):
+        agent_dir = self._get_agent_path(session_id, session_agent.agent_id)
+        if agent_dir not in self._created_at:
+            previous = self.read_agent(session_id, session_agent.agent_id)
+            if previous is None:
+                raise SessionException(f"Agent {session_agent.agent_id} in session {session_id} does not exist")
+            self._created_at[agent_dir] = previous.created_at
+        session_agent.created_at = self._created_at[agent_dir]
+        self._enqueue(agent_dir, {"type": "agent", "data": session_agent.to_dict()})
+
+    def create_message(self, session_id, agent_id, session_message, **kwargs):
+        self._enqueue(self._get_agent_path(session_id, agent_id), {"type": "message", "data": session_message.to_dict()})
+
+    def update_message(self, session_id, agent_id, session_message, **kwargs):
+        # Appending the new version is enough: on replay the last record of a message id wins
+        self._enqueue(self._get_agent_path(session_id, agent_id), {"type": "message", "data": session_message.to_dict()})
+
+    def read_agent(self, session_id, agent_id, **kwargs):
+        agent, _ = self._load(self._get_agent_path(session_id, agent_id))
+        return SessionAgent.from_dict(agent) if agent is not None else None
+
+    def read_message(self, session_id, agent_id, message_id, **kwargs):
+        _, messages = self._load(self._get_agent_path(session_id, agent_id))
+        message = messages.get(message_id)
+        return SessionMessage.from_dict(message) if message is not None else None
+
+    def list_messages(self, session_id, agent_id, limit=None, offset=0, **kwargs):
+        agent_dir = self._get_agent_path(session_id, agent_id)
+        agent, messages = self._load(agent_dir)
+        if agent is None:
+            raise SessionException(f"Agent {agent_id} in session {session_id} does not exist")
+
+        ordered = [messages[message_id] for message_id in sorted(messages)]
+        ordered = ordered[offset:offset + limit] if limit is not None else ordered[offset:]
+        return [SessionMessage.from_dict(message) for message in ordered]
+
+    def flush(self, timeout=None):
+        """
+        Block until every record queued so far is written and fsynced.
+
+        Returns:
+            bool: False if the timeout expired first
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self):
+        """Flush and stop the background writer."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        with self._io_lock:
+            for handle in self._logs.values():
+                handle.close()
+            self._logs.clear()
+
+    def _enqueue(self, agent_dir, record):
+        if self._closed:
+            raise SessionException("Session manager is closed")
+        # Serialize now: the message dicts may still be changed in place after this call
+        self._queue.put((agent_dir, json.dumps(record, ensure_ascii=False) + "\n"))
+
+    def _load(self, agent_dir):
+        """Replay the log over the snapshot. Returns (agent dict or None, {message_id: message dict})."""
+        self.flush()
+        with self._io_lock:
+            snapshot_path = os.path.join(agent_dir, SNAPSHOT_FILE)
+            if not os.path.exists(snapshot_path):
+                return None, {}
+            snapshot = self._read_file(snapshot_path)
+            agent = snapshot["agent"]
+            messages = {message["message_id"]: message for message in snapshot["messages"]}
+            for record in _read_log(os.path.join(agent_dir, LOG_FILE)):
+                if record["type"] == "agent":
+                    agent = record["data"]
+                else:
+                    messages[record["data"]["message_id"]] = record["data"]
+        return agent, messages
+
+    def _write_loop(self):
+        while True:
+            if self._dirty:
+                # Wake up when the next fsync is due, even if no more records arrive
+                try:
+                    item = self._queue.get(timeout=max(self._last_fsync + self.fsync_interval - time.monotonic(), 0))
+                except queue.Empty:
+                    try:
+                        with self._io_lock:
+                            self._fsync_dirty()
+                    except Exception:
+                        self.stats["errors"] += 1
+                        logger.exception("session_id=<%s> | fsyncing the session log failed", self.session_id)
+                    continue
+            else:
+                item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            # Collect what else arrives shortly, so one write and at most one fsync cover many records
+            deadline = time.monotonic() + self.batch_interval
+            while True:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+                if batch[-1] is None or batch[-1][0] is _FLUSH:
+                    break
+
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+            try:
+                self._write_batch(batch)
+            except Exception:
+                self.stats["errors"] += 1
+                logger.exception("session_id=<%s> | writing the session log failed", self.session_id)
+            finally:
+                for entry in batch:
+                    if entry[0] is _FLUSH:
+                        entry[1].set()
+            if stop:
+                return
+
+    def _write_batch(self, batch):
+        lines = {}
+        flush_requested = False
+        for agent_dir, payload in batch:
+            if agent_dir is _FLUSH:
+                flush_requested = True
+            else:
+                lines.setdefault(agent_dir, []).append(payload)
+
+        with self._io_lock:
+            for agent_dir, records in lines.items():
+                data = "".join(records).encode("utf-8")
+                handle = self._open_log(agent_dir)
+                handle.write(data)
+                handle.flush()
+                self._log_records[agent_dir] += len(records)
+                self._dirty.add(agent_dir)
+                self.stats["records"] += len(records)
+                self.stats["bytes"] += len(data)
+            if lines:
+                self.stats["batches"] += 1
+
+            if self._dirty and (flush_requested or time.monotonic() - self._last_fsync >= self.fsync_interval):
+                self._fsync_dirty()
+
+            for agent_dir in lines:
+                if self._log_records[agent_dir] >= self.compact_every:
+                    self._compact(agent_dir)
+
+    def _fsync_dirty(self):
+        for agent_dir in self._dirty:
+            os.fsync(self._logs[agent_dir].fileno())
+            self.stats["fsyncs"] += 1
+        self._dirty.clear()
+        self._last_fsync = time.monotonic()
+
+    def _open_log(self, agent_dir):
+        handle = self._logs.get(agent_dir)
+        if handle is None:
+            path = os.path.join(agent_dir, LOG_FILE)
+            _truncate_torn_tail(path)
+            handle = open(path, "ab")
+            self._log_records[agent_dir] = sum(1 for _ in _read_log(path))
+            self._logs[agent_dir] = handle
+        return handle
+
+    def _write_file(self, path, data):
+        """FileSessionManager._write_file, with the file and the rename fsynced before it returns."""
+        dir_path = os.path.dirname(path)
+        os.makedirs(dir_path, mode=0o700, exist_ok=True)
+        if os.path.islink(path):
+            raise SessionException(f"Refusing to write to symlink at {path}. This may indicate a symlink attack.")
+
+        fd, tmp_path = tempfile.mkstemp(dir=dir_path, prefix=".strands_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        _fsync_directory(dir_path)
+
+    def _compact(self, agent_dir):
+        """Fold the log into the snapshot and start an empty log."""
+        snapshot_path = os.path.join(agent_dir, SNAPSHOT_FILE)
+        snapshot = self._read_file(snapshot_path)
+        agent = snapshot["agent"]
+        messages = {message["message_id"]: message for message in snapshot["messages"]}
+        for record in _read_log(os.path.join(agent_dir, LOG_FILE)):
+            if record["type"] == "agent":
+                agent = record["data"]
+            else:
+                messages[record["data"]["message_id"]] = record["data"]
+
+        # The snapshot is durably replaced before the log is emptied; records replayed twice are harmless
+        self._write_file(snapshot_path, {"agent": agent, "messages": [messages[key] for key in sorted(messages)]})
+        handle = self._logs.pop(agent_dir)
+        del self._log_records[agent_dir]
+        handle.truncate(0)
+        os.fsync(handle.fileno())
+        handle.close()
+        self._dirty.discard(agent_dir)
+        self.stats["compactions"] += 1
+
+
+def _read_log(path):
+    """Yield the records of a log, stopping at a torn or corrupt line."""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                return
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("path=<%s> | corrupt session log record, ignoring the rest of the log", path)
+                return
+
+
+def _truncate_torn_tail(path):
+    """Cut a partially written last line left by a crash, so new records start on a clean line."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+
+
+def _fsync_directory(path):
+    """Make a rename in the directory durable."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _close_ref(ref):
+    manager = ref()
+    if manager is not None:
+        manager.close()
@@ -0,0 +1,45 @@
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import MagicMock
+
+from a2a.server.events import EventQueue
+from a2a.server.tasks import TaskUpdater
+from strands import Agent
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from shared.a2a_server import PooledA2AExecutor
+from shared.stub_model import StubModel
+
+
+def test_cancel_stops_the_pooled_agent_of_a_running_request():
+    long_answer = " ".join(["word"] * 500)
+    executor = PooledA2AExecutor(
+        lambda context_id: Agent(model=StubModel([{"text": long_answer}], tokens_per_second=100), callback_handler=None),
+        pool_size=1,
+    )
+
+    async def scenario():
+        request = asyncio.create_task(executor._run_with_context_agent(
+            "ctx", "Hello", {}, TaskUpdater(EventQueue(), "task-1", "ctx"), None
+        ))
+        while "ctx" not in executor._contexts or executor._contexts["ctx"].agent is None:
+            await asyncio.sleep(0.01)
+        running_agent = executor._contexts["ctx"].agent
+        await asyncio.sleep(0.2)
+
+        context = MagicMock(context_id="ctx")
+        context.current_task = MagicMock(id="task-1", context_id="ctx")
+        started = time.perf_counter()
+        await executor.cancel(context, EventQueue())
+        await asyncio.wait_for(request, timeout=2)
+        return running_agent, time.perf_counter() - started
+
+    running_agent, elapsed = asyncio.run(scenario())
+
+    # The 500-token answer streams for 5 seconds unless the cancel reached the agent
+    assert elapsed < 2
+    assert executor._contexts["ctx"].agent is None
+    assert executor._idle == [running_agent]
+    assert not running_agent.cancel_signal.is_set()